@@ -0,0 +1,58 @@
+"""
+Measure how long a fresh worker process takes to import the numeric core.
+
+Each run starts a new interpreter, imports the subdivision drivers and reports the wall time and the
+heavy optional modules that were loaded along the way. The script exits with an error if the core
+pulls in sympy.
+
+Usage: python benchmarks/benchmark_import_time.py [--runs N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("sympy", "numpy", "numba", "mpmath")
+CORE_IMPORT = """
+import json, sys, time
+start = time.perf_counter()
+import simultaneous_approximation
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": [name for name in %r if name in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def measure():
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", CORE_IMPORT], cwd=REPOSITORY, check=True,
+                            capture_output=True, text=True).stdout
+    process_time = time.perf_counter() - start
+    report = json.loads(output)
+    return process_time, report["elapsed"], report["loaded"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="number of fresh interpreters to start")
+    arguments = parser.parse_args()
+
+    process_times, import_times, loaded = [], [], set()
+    for _ in range(arguments.runs):
+        process_time, import_time, modules = measure()
+        process_times.append(process_time)
+        import_times.append(import_time)
+        loaded.update(modules)
+
+    print(f"process start + import: {1e3 * statistics.median(process_times):7.1f} ms (median)")
+    print(f"core import:            {1e3 * statistics.median(import_times):7.1f} ms (median)")
+    print(f"optional modules loaded: {', '.join(sorted(loaded)) or 'none'}")
+    if "sympy" in loaded:
+        raise SystemExit("The numeric core imports sympy.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Time the basic operations of the Interval class.
+
+Each operation is timed on the same pairs of random intervals; the script reports the time per operation
+and, for squaring, the mean width of the result of each way to square an interval.
+
+Usage: python benchmarks/benchmark_interval_arithmetic.py [--pairs N] [--repeat R]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interval_arithmetic_library import Interval, dot, sum_of_products
+
+
+def random_intervals(count, seed=0):
+    generator = random.Random(seed)
+    intervals = []
+    for _ in range(count):
+        lower = generator.uniform(-1, 1)
+        intervals.append(Interval(lower, lower + generator.uniform(0, 1)))
+    return intervals
+
+
+def time_per_operation(operation, arguments, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for argument in arguments:
+            operation(*argument)
+        best = min(best, time.perf_counter() - start)
+    return best / len(arguments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=20000, help="number of interval pairs")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions; the best is reported")
+    arguments = parser.parse_args()
+    first = random_intervals(arguments.pairs, seed=0)
+    second = random_intervals(arguments.pairs, seed=1)
+    pairs = list(zip(first, second))
+    bounds = [(interval.lower_bound, interval.upper_bound) for interval in first]
+    quadruples = [(a, b, c, d) for (a, b), (c, d) in zip(pairs[0::2], pairs[1::2])]
+
+    operations = {
+        "Interval(lower, upper)": (lambda lower, upper: Interval(lower, upper), bounds),
+        "Interval._from_ordered": (Interval._from_ordered, bounds),
+        "x + y": (lambda x, y: x + y, pairs),
+        "x - y": (lambda x, y: x - y, pairs),
+        "x * y": (lambda x, y: x * y, pairs),
+        "x * 3.0": (lambda x, _: x * 3.0, pairs),
+        "x * x": (lambda x, _: x * x, pairs),
+        "x ** 2": (lambda x, _: x ** 2, pairs),
+        "x.sqr()": (lambda x, _: x.sqr(), pairs),
+        "a * b + c * d": (lambda a, b, c, d: a * b + c * d, quadruples),
+        "sum_of_products": (lambda a, b, c, d: sum_of_products(((a, b), (c, d))), quadruples),
+        "a * a + c * c": (lambda a, b, c, d: a * a + c * c, quadruples),
+        "dot([a, c], [a, c])": (lambda a, b, c, d: dot([a, c], [a, c]), quadruples),
+    }
+    for name, (operation, operation_arguments) in operations.items():
+        elapsed = time_per_operation(operation, operation_arguments, arguments.repeat)
+        print(f"{name:>24}: {1e9 * elapsed:8.1f} ns")
+
+    for name, square in (("x * x", lambda x: x * x), ("x.sqr()", Interval.sqr)):
+        mean_width = sum(square(x).width() for x in first) / len(first)
+        print(f"{name:>24}: mean width {mean_width:.4f}")
+
+
+if __name__ == "__main__":
+    main()
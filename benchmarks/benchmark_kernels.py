@@ -0,0 +1,70 @@
+"""
+Compare the enclosure kernel backends on standard curve families.
+
+Every available backend encloses the same polynomials over the same boxes; the script checks that the
+backends agree bit for bit and reports the time per enclosure.
+
+Usage: python benchmarks/benchmark_kernels.py [--boxes N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+from simultaneous_approximation_kernels import KERNEL_BACKENDS, compiled_polynomial, kernels
+
+CURVE_FAMILIES = {
+    "circle": BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5}),
+    "cubic": BivariatePolynomial({(3, 0): 1, (0, 1): -1, (1, 0): -0.3}),
+    "quartic": BivariatePolynomial({(4, 0): 1, (0, 4): 1, (2, 2): -3, (0, 0): -0.2}),
+    "degree 8": BivariatePolynomial({(i, j): (-1) ** (i + j) / (1 + i + j)
+                                     for i in range(9) for j in range(9 - i)}),
+}
+
+
+def random_boxes(count, seed=0):
+    generator = random.Random(seed)
+    boxes = []
+    for _ in range(count):
+        width = 2.0 ** -generator.randint(1, 12)
+        x_lower = generator.uniform(-1, 1 - width)
+        y_lower = generator.uniform(-1, 1 - width)
+        boxes.append((x_lower, x_lower + width, y_lower, y_lower + width))
+    return boxes
+
+
+def run(function, backend, boxes):
+    compiled = compiled_polynomial(function, backend)
+    enclosure = kernels(backend).polynomial_enclosure
+    # One call outside the timing compiles the Numba kernels
+    enclosure(compiled.coefficients, compiled.degree, *boxes[0])
+    start = time.perf_counter()
+    results = [enclosure(compiled.coefficients, compiled.degree, *box) for box in boxes]
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--boxes", type=int, default=20000, help="number of boxes per curve family")
+    arguments = parser.parse_args()
+    boxes = random_boxes(arguments.boxes)
+
+    print(f"backends: {', '.join(KERNEL_BACKENDS)}")
+    for name, function in CURVE_FAMILIES.items():
+        reference = None
+        for backend in KERNEL_BACKENDS:
+            results, elapsed = run(function, backend, boxes)
+            results = [(float(lower), float(upper)) for lower, upper in results]
+            if reference is None:
+                reference = results
+            elif results != reference:
+                raise SystemExit(f"{name}: backend {backend} disagrees with {KERNEL_BACKENDS[0]}")
+            print(f"{name:>10} {backend:>7}: {1e6 * elapsed / len(boxes):8.2f} us per enclosure")
+
+
+if __name__ == "__main__":
+    main()
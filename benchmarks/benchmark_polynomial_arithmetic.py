@@ -0,0 +1,118 @@
+"""
+Micro-benchmark of BivariatePolynomial arithmetic against the previous implementation.
+
+The previous algorithms are reproduced below as functions on coefficient dictionaries: addition copied
+the whole dictionary, subtraction added -1 * other, multiplication built tuple keys in a double loop, and
+every result was reduced again. Both implementations are run on dense random polynomials, and their
+results are checked to agree.
+
+Usage: python benchmarks/benchmark_polynomial_arithmetic.py [--degrees 5 10 20 50] [--repeat N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+
+
+def legacy_add(coefficients1, coefficients2):
+    polynomial_sum = coefficients1.copy()
+    for term, coefficient in coefficients2.items():
+        polynomial_sum[term] = polynomial_sum.get(term, 0) + coefficient
+        if polynomial_sum[term] == 0:
+            del polynomial_sum[term]
+    return BivariatePolynomial(polynomial_sum).coefficients
+
+
+def legacy_scale(coefficients, scalar):
+    return BivariatePolynomial({term: coefficient * scalar for term, coefficient in coefficients.items()}).coefficients
+
+
+def legacy_sub(coefficients1, coefficients2):
+    return legacy_add(coefficients1, legacy_scale(coefficients2, -1))
+
+
+def legacy_mul(coefficients1, coefficients2):
+    polynomial_product = {}
+    for (x1, y1), coefficient1 in coefficients1.items():
+        for (x2, y2), coefficient2 in coefficients2.items():
+            new_term = (x1 + x2, y1 + y2)
+            polynomial_product[new_term] = polynomial_product.get(new_term, 0) + coefficient1 * coefficient2
+    return BivariatePolynomial(polynomial_product).coefficients
+
+
+def legacy_cross_product(f_x, f_y, g_x, g_y):
+    return legacy_sub(legacy_mul(f_x, g_y), legacy_mul(f_y, g_x))
+
+
+def legacy_squared_gradient(f_x, f_y):
+    return legacy_add(legacy_mul(f_x, f_x), legacy_mul(f_y, f_y))
+
+
+def legacy_power(coefficients, exponent):
+    result = {(0, 0): 1}
+    for _ in range(exponent):
+        result = legacy_mul(result, coefficients)
+    return result
+
+
+def random_polynomial(degree, generator):
+    return BivariatePolynomial({(i, j): generator.uniform(-1, 1)
+                                for i in range(degree + 1) for j in range(degree + 1 - i)})
+
+
+def best_time(function, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def agree(coefficients1, coefficients2):
+    if coefficients1.keys() != coefficients2.keys():
+        return False
+    return all(abs(coefficients1[term] - coefficients2[term]) <= 1e-9 * (1 + abs(coefficients1[term]))
+               for term in coefficients1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--degrees", type=int, nargs="+", default=[5, 10, 20, 50])
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+    generator = random.Random(0)
+
+    print(f"{'degree':>6} {'operation':>17} {'previous':>11} {'current':>11} {'speedup':>8}")
+    for degree in arguments.degrees:
+        f, g = random_polynomial(degree, generator), random_polynomial(degree, generator)
+        f_x, f_y = f.gradient()
+        g_x, g_y = g.gradient()
+        small = random_polynomial(max(degree // 10, 1), generator)
+        operations = [
+            ("add", lambda: legacy_add(f.coefficients, g.coefficients), lambda: f + g),
+            ("sub", lambda: legacy_sub(f.coefficients, g.coefficients), lambda: f - g),
+            ("mul", lambda: legacy_mul(f.coefficients, g.coefficients), lambda: f * g),
+            ("cross product",
+             lambda: legacy_cross_product(f_x.coefficients, f_y.coefficients, g_x.coefficients, g_y.coefficients),
+             lambda: (f_x * g_y).fma(f_y, g_x, -1)),
+            ("squared gradient", lambda: legacy_squared_gradient(f_x.coefficients, f_y.coefficients),
+             lambda: (f_x * f_x).fma(f_y, f_y)),
+            ("power 10 (small)", lambda: legacy_power(small.coefficients, 10), lambda: small ** 10),
+        ]
+        for name, previous, current in operations:
+            previous_time, previous_result = best_time(previous, arguments.repeat)
+            current_time, current_result = best_time(current, arguments.repeat)
+            if not agree(previous_result, current_result.coefficients):
+                raise SystemExit(f"degree {degree} {name}: results differ")
+            print(f"{degree:>6} {name:>17} {1e3 * previous_time:9.3f}ms {1e3 * current_time:9.3f}ms "
+                  f"{previous_time / current_time:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
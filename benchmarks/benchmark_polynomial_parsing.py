@@ -0,0 +1,79 @@
+"""
+Benchmark the native polynomial parser and the bulk system loader, against sympy when it is installed.
+
+A file of random systems is generated in which every polynomial is drawn from a smaller set of distinct
+polynomials, as happens when the same curves are paired with one another. The file is parsed string by
+string, loaded in one pass with deduplication, and parsed with sympy when it is available.
+
+Usage: python benchmarks/benchmark_polynomial_parsing.py [--systems N] [--distinct N] [--degree D]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polynomial_library.polynomial_parser import parse_polynomial
+from polynomial_library.system_loader import PolynomialPool, load_systems
+
+
+def random_polynomial_string(degree, generator):
+    terms = []
+    for i in range(degree + 1):
+        for j in range(degree + 1 - i):
+            terms.append(f"{generator.randint(-9, 9)}*x^{i}*y^{j}")
+    return " + ".join(terms).replace("+ -", "- ")
+
+
+def sympy_parse(lines):
+    import sympy
+    x, y = sympy.symbols("x y")
+    from polynomial_library.sympy_bridge import sympy_to_bivariate_polynomial
+    return [[sympy_to_bivariate_polynomial(sympy.Poly(sympy.sympify(text), x, y)) for text in line.split(";")]
+            for line in lines]
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--systems", type=int, default=2000)
+    parser.add_argument("--distinct", type=int, default=200)
+    parser.add_argument("--degree", type=int, default=6)
+    arguments = parser.parse_args()
+    generator = random.Random(0)
+
+    strings = [random_polynomial_string(arguments.degree, generator) for _ in range(arguments.distinct)]
+    lines = [f"{generator.choice(strings)}; {generator.choice(strings)}" for _ in range(arguments.systems)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "systems.txt")
+        with open(path, "w") as file:
+            file.write("\n".join(lines))
+
+        parse_time, parsed = timed(lambda: [[parse_polynomial(text) for text in line.split(";")] for line in lines])
+        pool = PolynomialPool()
+        load_time, loaded = timed(lambda: load_systems(path, pool))
+        if parsed != loaded:
+            raise SystemExit("The loader and the parser disagree")
+        print(f"{arguments.systems} systems of degree {arguments.degree}, {len(pool)} distinct polynomials")
+        print(f"{'parse each string':>20} {1e3 * parse_time:10.1f}ms")
+        print(f"{'bulk load':>20} {1e3 * load_time:10.1f}ms {parse_time / load_time:7.2f}x")
+        try:
+            sympy_time, sympy_systems = timed(lambda: sympy_parse(lines))
+        except ImportError:
+            print(f"{'sympy':>20} {'not installed':>12}")
+        else:
+            if sympy_systems != parsed:
+                raise SystemExit("sympy and the parser disagree")
+            print(f"{'sympy':>20} {1e3 * sympy_time:10.1f}ms {sympy_time / parse_time:7.2f}x slower than parsing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare plain and preconditioned subdivision runs on domains away from the origin.
+
+The same system, a sextic with two loops and a cubic crossing them, is translated to every center and
+subdivided on the square of half-width 2 around it, with and without mapping the domain onto [-1, 1]^2
+first. The polynomials have integer coefficients, so the translated systems are represented exactly and
+every run targets the same curves. The script reports the total number of boxes classified, the number of
+leaves, the boxes left undecided by the depth limit, and the running time.
+
+Usage: python benchmarks/benchmark_preconditioning.py [--centers 0 30 100 300 1000] [--max-depth D]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from polynomial_library.polynomial_parser import parse_polynomial
+from simultaneous_approximation import SubdivisionBudget, subdivision_with_c1_cross, subdivision_without_c1_cross
+from simultaneous_approximation_tools import PVBox
+
+DRIVERS = {
+    "with_c1_cross": subdivision_with_c1_cross,
+    "without_c1_cross": subdivision_without_c1_cross,
+}
+
+
+def translated_system(center):
+    x, y = f"(x - {center})", f"(y - {center})"
+    return [parse_polynomial(f"8({x}^2 + {y}^2)^3 - 8{x}^2 + 1"), parse_polynomial(f"{x}^3 - {y} + {x}{y}^4")]
+
+
+def run(driver, center, max_depth, precondition):
+    budget = SubdivisionBudget(max_depth=max_depth)
+    initial_box = PVBox(Interval(center - 2, center + 2), Interval(center - 2, center + 2))
+    start = time.perf_counter()
+    c0_boxes, c1_boxes, undecided_boxes = driver(translated_system(center), initial_box, budget=budget,
+                                                 precondition=precondition)
+    return (budget.box_count, len(c0_boxes) + len(c1_boxes), len(undecided_boxes),
+            time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--centers", type=float, nargs="+", default=[0, 30, 100, 300, 1000])
+    parser.add_argument("--max-depth", type=int, default=12)
+    parser.add_argument("--driver", choices=sorted(DRIVERS), default="with_c1_cross",
+                        help="subdivision driver to run")
+    arguments = parser.parse_args()
+    driver = DRIVERS[arguments.driver]
+
+    for center in arguments.centers:
+        center = int(center) if center == int(center) else center
+        for precondition in (False, True):
+            boxes, leaves, undecided, elapsed = run(driver, center, arguments.max_depth, precondition)
+            mode = "preconditioned" if precondition else "plain"
+            print(f"center {center:>8} {mode:>14}: {boxes:7d} boxes, {leaves:6d} leaves, {undecided:5d} undecided, "
+                  f"{1e3 * elapsed:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare quadtree and binary splitting on curves nearly parallel to an axis and on elongated domains.
+
+Both split modes subdivide the same systems with the same driver; the script reports the total number
+of boxes each mode classifies, the number of leaves and the running time.
+
+Usage: python benchmarks/benchmark_splitting.py [--driver {with_c1_cross,without_c1_cross}]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+from simultaneous_approximation import SubdivisionBudget, subdivision_with_c1_cross, subdivision_without_c1_cross
+from simultaneous_approximation_splitting import SPLIT_MODES
+from simultaneous_approximation_tools import PVBox
+
+SYSTEMS = {
+    "near-horizontal cubics": ([BivariatePolynomial({(0, 1): 1, (3, 0): -0.2, (0, 0): 0.1}),
+                                BivariatePolynomial({(0, 1): 1, (3, 0): 0.1, (1, 0): -0.1, (0, 0): -0.1})],
+                               (-1, 1, -1, 1)),
+    "flat parabolas": ([BivariatePolynomial({(0, 1): 1, (2, 0): -0.1, (0, 0): 0.3}),
+                        BivariatePolynomial({(0, 1): 1, (2, 0): 0.1, (0, 0): -0.4})],
+                       (-1, 1, -1, 1)),
+    "flat ellipse": ([BivariatePolynomial({(2, 0): 1, (0, 2): 16, (0, 0): -4})],
+                     (-4, 4, -0.5, 0.5)),
+    "circle and line": ([BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5}),
+                         BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.1})],
+                        (-1, 1, -1, 1)),
+}
+
+DRIVERS = {
+    "with_c1_cross": subdivision_with_c1_cross,
+    "without_c1_cross": subdivision_without_c1_cross,
+}
+
+
+def run(driver, function_list, bounds, split):
+    budget = SubdivisionBudget()
+    initial_box = PVBox(Interval(bounds[0], bounds[1]), Interval(bounds[2], bounds[3]))
+    start = time.perf_counter()
+    c0_boxes, c1_boxes, _ = driver(function_list, initial_box, budget=budget, split=split)
+    return budget.box_count, len(c0_boxes) + len(c1_boxes), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--driver", choices=sorted(DRIVERS), default="with_c1_cross",
+                        help="subdivision driver to run")
+    arguments = parser.parse_args()
+    driver = DRIVERS[arguments.driver]
+
+    for name, (function_list, bounds) in SYSTEMS.items():
+        for split in SPLIT_MODES:
+            boxes, leaves, elapsed = run(driver, function_list, bounds, split)
+            print(f"{name:>22} {split:>8}: {boxes:6d} boxes, {leaves:6d} leaves, {1e3 * elapsed:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,3 @@
-# __init__.py
\ No newline at end of file
+# __init__.py
+from interval_arithmetic_library.interval_arithmetic import Interval, dot, sum_of_products
+from interval_arithmetic_library.box_arithmetic import Box
@@ -10,6 +10,7 @@ class Box:
         self.vertex = []
         self.mark = False
         self.parent = None
+        self.depth = 0  # Number of subdivisions between the initial box and this box.
         self.balanced = False  # Mark True if box was subdivided for balancing.
         self.children = []
 
@@ -193,8 +194,8 @@ class Box:
         x and y intervals in half. The resulting boxes inherit the class type of the
         current box (i.e., if called from a `PVBox`, it returns `PVBox` instances).
 
-        Each new box is assigned the current box as its parent, and the current box
-        will have a `children` attribute that stores the four sub-boxes.
+        Each new box is assigned the current box as its parent and is one level deeper,
+        and the current box will have a `children` attribute that stores the four sub-boxes.
 
         Returns:
             list[Box]: A list of four sub-boxes, each of the same type as the calling class
@@ -217,8 +218,41 @@ class Box:
         box2.parent = self
         box3.parent = self
         box4.parent = self
+        box1.depth = box2.depth = box3.depth = box4.depth = self.depth + 1
 
         # Set children for the current box
         self.children = [box1, box2, box3, box4]
 
         return [box1, box2, box3, box4]
+
+    def bisect(self, axis):
+        """
+        Split the current box into two halves across one axis.
+
+        Like `subdivide`, the halves are of the same type as the current box, are one level deeper and
+        have the current box as their parent, and are stored in its `children` attribute. The upper half
+        comes first, as in the quadrant order of `subdivide`.
+
+        :param axis: "x" to cut the x interval in half, "y" to cut the y interval in half.
+        :return: A list of two sub-boxes: the east and west halves for "x", the north and south halves for "y".
+        """
+        if axis == "x":
+            middle = (self.x_interval.lower_bound + self.x_interval.upper_bound) / 2
+            y_interval = self.y_interval
+            upper = type(self)(Interval(middle, self.x_interval.upper_bound),
+                               Interval(y_interval.lower_bound, y_interval.upper_bound))
+            lower = type(self)(Interval(self.x_interval.lower_bound, middle),
+                               Interval(y_interval.lower_bound, y_interval.upper_bound))
+        elif axis == "y":
+            middle = (self.y_interval.lower_bound + self.y_interval.upper_bound) / 2
+            x_interval = self.x_interval
+            upper = type(self)(Interval(x_interval.lower_bound, x_interval.upper_bound),
+                               Interval(middle, self.y_interval.upper_bound))
+            lower = type(self)(Interval(x_interval.lower_bound, x_interval.upper_bound),
+                               Interval(self.y_interval.lower_bound, middle))
+        else:
+            raise ValueError(f"Unknown axis: {axis!r}")
+        upper.parent = lower.parent = self
+        upper.depth = lower.depth = self.depth + 1
+        self.children = [upper, lower]
+        return [upper, lower]
@@ -19,6 +19,19 @@ class Interval:
         self.lower_bound = -abs(lower) if upper is None else min(lower, upper)
         self.upper_bound = abs(lower) if upper is None else max(lower, upper)
 
+    @classmethod
+    def _from_ordered(cls, lower, upper):
+        """
+        Builds an interval from bounds known to be ordered, skipping the normalization of `__init__`.
+        :param lower: The lower bound, at most the upper bound
+        :param upper: The upper bound
+        :return: A new Interval object
+        """
+        interval = cls.__new__(cls)
+        interval.lower_bound = lower
+        interval.upper_bound = upper
+        return interval
+
     def __str__(self):
         """ Return a string representation of the interval. """
         return f"[{self.lower_bound}, {self.upper_bound}]"
@@ -35,9 +48,9 @@ class Interval:
         """
 
         if isinstance(other, Interval):
-            return Interval(self.lower_bound + other.lower_bound, self.upper_bound + other.upper_bound)
+            return Interval._from_ordered(self.lower_bound + other.lower_bound, self.upper_bound + other.upper_bound)
         else:
-            return Interval(self.lower_bound + other, self.upper_bound + other)
+            return Interval._from_ordered(self.lower_bound + other, self.upper_bound + other)
 
     def __radd__(self, other):
         """ Add two intervals together or add an interval and a number.
@@ -47,9 +60,9 @@ class Interval:
         """
 
         if isinstance(other, Interval):
-            return Interval(other.lower_bound + self.lower_bound, other.upper_bound + self.upper_bound)
+            return Interval._from_ordered(other.lower_bound + self.lower_bound, other.upper_bound + self.upper_bound)
         else:
-            return Interval(other + self.lower_bound, other + self.upper_bound)
+            return Interval._from_ordered(other + self.lower_bound, other + self.upper_bound)
 
     def __sub__(self, other):
         """ Subtract two intervals or subtract an interval and a number.
@@ -59,9 +72,9 @@ class Interval:
         """
 
         if isinstance(other, Interval):
-            return Interval(self.lower_bound - other.upper_bound, self.upper_bound - other.lower_bound)
+            return Interval._from_ordered(self.lower_bound - other.upper_bound, self.upper_bound - other.lower_bound)
         else:
-            return Interval(self.lower_bound - other, self.upper_bound - other)
+            return Interval._from_ordered(self.lower_bound - other, self.upper_bound - other)
 
     def __rsub__(self, other):
         """ Subtract two intervals or subtract an interval and a number.
@@ -71,9 +84,9 @@ class Interval:
         """
 
         if isinstance(other, Interval):
-            return Interval(other.lower_bound - self.upper_bound, other.upper_bound - self.lower_bound)
+            return Interval._from_ordered(other.lower_bound - self.upper_bound, other.upper_bound - self.lower_bound)
         else:
-            return Interval(other - self.upper_bound, other - self.lower_bound)
+            return Interval._from_ordered(other - self.upper_bound, other - self.lower_bound)
 
     def __mul__(self, other):
         """ Multiply two intervals together or multiply an interval and a number.
@@ -83,19 +96,13 @@ class Interval:
         """
 
         if isinstance(other, Interval):
-            # Calculate all possible products of the bounds from both intervals
-            products = [
-                self.lower_bound * other.lower_bound,
-                self.lower_bound * other.upper_bound,
-                self.upper_bound * other.lower_bound,
-                self.upper_bound * other.upper_bound
-            ]
-            # Return a new Interval with the minimum and maximum of the products
-            return Interval(min(products), max(products))
+            # Return a new Interval with the minimum and maximum of all products of the bounds
+            return Interval._from_ordered(*product_bounds(self.lower_bound, self.upper_bound,
+                                                           other.lower_bound, other.upper_bound))
         else:
-            low = min(self.lower_bound * other, self.upper_bound * other)
-            up = max(self.lower_bound * other, self.upper_bound * other)
-            return Interval(low, up)
+            low = self.lower_bound * other
+            up = self.upper_bound * other
+            return Interval._from_ordered(low, up) if low <= up else Interval._from_ordered(up, low)
 
     __rmul__ = __mul__
 
@@ -125,6 +132,16 @@ class Interval:
     def __rtruediv__(self, other):
         return "TODO: Not yet implemented"
 
+    def sqr(self):
+        """
+        Square the interval.
+
+        Unlike `self * self`, which treats the two factors as independent, the square of an interval
+        containing zero has zero as its lower bound.
+        :return: A new Interval representing the square of the interval.
+        """
+        return Interval._from_ordered(*square_bounds(self.lower_bound, self.upper_bound))
+
     def contains_zero(self):
         """
         Check if the interval contains zero.
@@ -188,10 +205,12 @@ class Interval:
             raise NotImplementedError("Exponentiation with an interval as the exponent is not supported.")
         if not isinstance(other, int):
             raise NotImplementedError("Exponentiation with a non-integer exponent is not supported.")
-        absolute_interval = abs(self)
         if other == 0:
-            return Interval(1)  # Check this
-        elif other > 0:
+            return Interval._from_ordered(1, 1)
+        if other == 2:
+            return self.sqr()
+        absolute_interval = abs(self)
+        if other > 0:
             if other % 2 == 0:
                 return Interval(absolute_interval.lower_bound ** other, absolute_interval.upper_bound ** other)
             else:
@@ -231,3 +250,71 @@ class Interval:
         else:
             return Interval(max(self.lower_bound, other.lower_bound), min(self.upper_bound, other.upper_bound))
 
+
+def product_bounds(lower1, upper1, lower2, upper2):
+    """
+    Return the bounds of the product of two intervals given by their bounds, as `Interval.__mul__` does.
+
+    Only plain arithmetic and comparisons are used, so the screening kernels also compile it with Numba.
+    """
+    p1 = lower1 * lower2
+    p2 = lower1 * upper2
+    p3 = upper1 * lower2
+    p4 = upper1 * upper2
+    return min(p1, p2, p3, p4), max(p1, p2, p3, p4)
+
+
+def square_bounds(lower, upper):
+    """
+    Return the bounds of the square of an interval given by its bounds, as `Interval.sqr` does: the lower
+    bound is zero if the interval contains zero. Like `product_bounds`, it also compiles with Numba.
+    """
+    if lower >= 0:
+        return lower * lower, upper * upper
+    if upper <= 0:
+        return upper * upper, lower * lower
+    return lower - lower, max(lower * lower, upper * upper)
+
+
+def sum_of_products(pairs):
+    """
+    Compute the sum of the products of pairs of intervals or numbers, accumulating the bounds without
+    building an Interval for every product and partial sum.
+
+    A pair whose two factors are the same Interval object is squared with `Interval.sqr`, so a sum of
+    squares such as f_x^2 + f_y^2 has a tight lower bound.
+    :param pairs: An iterable of (factor, factor) pairs, each factor an Interval or a number.
+    :return: An Interval enclosing the sum of the products.
+    """
+    lower = upper = 0
+    for first, second in pairs:
+        first_interval = isinstance(first, Interval)
+        second_interval = isinstance(second, Interval)
+        if first_interval and second_interval:
+            if first is second:
+                product_lower, product_upper = square_bounds(first.lower_bound, first.upper_bound)
+            else:
+                product_lower, product_upper = product_bounds(first.lower_bound, first.upper_bound,
+                                                               second.lower_bound, second.upper_bound)
+        elif first_interval or second_interval:
+            interval, number = (first, second) if first_interval else (second, first)
+            product_lower, product_upper = interval.lower_bound * number, interval.upper_bound * number
+            if product_lower > product_upper:
+                product_lower, product_upper = product_upper, product_lower
+        else:
+            product_lower = product_upper = first * second
+        lower += product_lower
+        upper += product_upper
+    return Interval._from_ordered(lower, upper)
+
+
+def dot(first, second):
+    """
+    Compute the dot product of two sequences of intervals or numbers, see `sum_of_products`.
+    :param first: The first sequence.
+    :param second: The second sequence, of the same length.
+    :return: An Interval enclosing the dot product.
+    """
+    if len(first) != len(second):
+        raise ValueError("The sequences of a dot product must have the same length.")
+    return sum_of_products(zip(first, second))
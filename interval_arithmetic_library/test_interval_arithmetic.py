@@ -1,5 +1,5 @@
 import unittest
-from interval_arithmetic_library import Interval
+from interval_arithmetic_library import Interval, dot, sum_of_products
 
 class TestIntervalArithmetic(unittest.TestCase):
 
@@ -164,5 +164,30 @@ class TestIntervalArithmetic(unittest.TestCase):
         with self.assertRaises(NotImplementedError):
             interval1 ** Interval(2, 3)
 
+    def test_zero_power(self):
+        self.assertEqual(Interval(-2, 3) ** 0, Interval(1, 1))
 
+    def test_square(self):
+        self.assertEqual(Interval(2, 3).sqr(), Interval(4, 9))
+        self.assertEqual(Interval(-3, -2).sqr(), Interval(4, 9))
+        # The square of an interval containing zero never goes below zero, unlike the product x * x
+        interval = Interval(-2, 3)
+        self.assertEqual(interval.sqr(), Interval(0, 9))
+        self.assertEqual(interval * interval, Interval(-6, 9))
+        self.assertEqual(interval ** 2, Interval(0, 9))
 
+    def test_trusted_constructor(self):
+        interval = Interval._from_ordered(1, 2)
+        self.assertIsInstance(interval, Interval)
+        self.assertEqual(interval, Interval(2, 1))
+
+    def test_sum_of_products(self):
+        interval1 = Interval(1, 2)
+        interval2 = Interval(-1, 3)
+        self.assertEqual(sum_of_products([(interval1, interval2), (interval2, 2), (3, 4)]),
+                         interval1 * interval2 + interval2 * 2 + 12)
+        self.assertEqual(sum_of_products([(-2, interval1)]), Interval(-4, -2))
+        # Pairs of the same interval are squared tightly
+        self.assertEqual(dot([interval1, interval2], [interval1, interval2]), Interval(1, 13))
+        with self.assertRaises(ValueError):
+            dot([interval1], [interval1, interval2])
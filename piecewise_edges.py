@@ -0,0 +1,152 @@
+from collections import defaultdict
+
+from simultaneous_approximation_edges import EdgeRestrictions
+from simultaneous_approximation_index import LeafIndex
+
+
+class VertexSigns:
+    """
+    Signs of the functions of a system at box vertices, evaluated once per vertex and shared by all
+    boxes meeting there.
+
+    As in `detect_sign_change`, a zero value counts as positive.
+    """
+
+    def __init__(self, function_list):
+        self.function_list = function_list
+        self._values = {}
+        self.evaluations = 0
+
+    def values(self, point):
+        """
+        Evaluate every function of the system at a point.
+
+        :param point: A tuple (x, y).
+        :return: A tuple with the value of each function at the point.
+        """
+        values = self._values.get(point)
+        if values is None:
+            values = tuple(function.evaluate(point) for function in self.function_list)
+            self._values[point] = values
+            self.evaluations += 1
+        return values
+
+
+def _crossing_point(point1, value1, point2, value2):
+    """ Locate the zero of the linear interpolant of the values along an edge. """
+    t = value1 / (value1 - value2)
+    return point1[0] + t * (point2[0] - point1[0]), point1[1] + t * (point2[1] - point1[1])
+
+
+def box_crossings(index, vertex_signs, box, edge_restrictions=None):
+    """
+    Find where the curves of a system cross the boundary of a box.
+
+    The boundary is split at every corner of a neighboring box, so that both boxes sharing a segment
+    of their boundary see the same crossings.
+
+    Parameters:
+        index (LeafIndex): The adjacency index of the subdivision.
+        vertex_signs (VertexSigns): The shared vertex evaluations of the system.
+        box (Box): The box to inspect.
+        edge_restrictions (EdgeRestrictions): Optional restrictions of the system to the edge lines. With
+                                              them, every crossing of a boundary segment is found exactly
+                                              and located on the curve; without them, a segment is
+                                              crossed once when the signs at its end points differ, at
+                                              the zero of the linear interpolant.
+
+    Returns:
+        dict[int, list[tuple]]: For each function index, the crossings in counter-clockwise boundary
+        order. A crossing is a pair (key, point), where the key identifies the boundary segment and the
+        position of the crossing along it.
+    """
+    vertices = index.boundary_vertices(box)
+    vertex_values = [vertex_signs.values(vertex) for vertex in vertices]
+    crossings = defaultdict(list)
+    for k in range(len(vertices)):
+        point1, point2 = vertices[k], vertices[(k + 1) % len(vertices)]
+        values1, values2 = vertex_values[k], vertex_values[(k + 1) % len(vertices)]
+        for i, (value1, value2) in enumerate(zip(values1, values2)):
+            segment = (i, min(point1, point2), max(point1, point2))
+            if edge_restrictions is not None and value1 != 0 and value2 != 0:
+                points = edge_restrictions.segment_crossings(i, point1, point2)
+                # Number the crossings from the lower end, the same for both boxes sharing the segment
+                positions = range(len(points)) if point1 <= point2 else reversed(range(len(points)))
+                crossings[i].extend((segment + (position,), point) for position, point in zip(positions, points))
+            # A zero value counts as positive, as in detect_sign_change
+            elif (value1 < 0) != (value2 < 0):
+                crossings[i].append((segment + (0,), _crossing_point(point1, value1, point2, value2)))
+    return crossings
+
+
+def _chain_polylines(adjacency, points):
+    """ Walk a graph whose nodes have degree at most two into maximal paths and cycles. """
+    polylines = []
+    visited = set()
+    # Open curves start at a node of degree one, i.e. on the boundary of the subdivided region
+    starts = [node for node, neighbors in adjacency.items() if len(neighbors) == 1]
+    starts.extend(node for node, neighbors in adjacency.items() if len(neighbors) != 1)
+    for start in starts:
+        if start in visited:
+            continue
+        path = [start]
+        visited.add(start)
+        previous, current = None, start
+        while True:
+            next_nodes = [node for node in adjacency[current] if node != previous]
+            if not next_nodes:
+                break
+            following = next_nodes[0]
+            if following in visited:
+                # The walk returned to its start, so the polyline is closed
+                if following == start:
+                    path.append(start)
+                break
+            path.append(following)
+            visited.add(following)
+            previous, current = current, following
+        polylines.append([points[node] for node in path])
+    return polylines
+
+
+def piecewise_linear_curves(function_list, c0_boxes, c1_boxes, exact_crossings=True):
+    """
+    Build a piecewise-linear approximation of every curve of a system from the output of a
+    subdivision driver.
+
+    Each curve crossing the boundary of a c1 box is approximated inside the box by segments joining its
+    boundary crossings, taken in pairs in counter-clockwise order. Crossings on a boundary segment shared
+    by two boxes coincide, so the segments of neighboring boxes join into polylines. Every vertex is
+    evaluated once for the whole subdivision, and neighbors are found through a `LeafIndex`, so the cost
+    grows with the number of boxes rather than its square.
+
+    With exact crossings, each function is restricted once to every line carrying box edges, and the
+    crossings of each boundary segment are counted and located on that univariate restriction, see
+    `EdgeRestrictions`. A curve crossing a segment twice, which leaves the same sign at both of its
+    ends, is then found as well.
+
+    Parameters:
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        c0_boxes (list[Box]): The c0 boxes of the subdivision.
+        c1_boxes (list[Box]): The c1 boxes of the subdivision.
+        exact_crossings (bool): Find the crossings of every boundary segment exactly; if False, a segment
+                                is crossed once when the signs at its end points differ.
+
+    Returns:
+        dict[int, list[list[tuple]]]: For each function index, the polylines approximating its curve, as
+        lists of (x, y) points. A closed polyline ends with its first point.
+    """
+    index = LeafIndex(list(c0_boxes) + list(c1_boxes))
+    vertex_signs = VertexSigns(function_list)
+    edge_restrictions = EdgeRestrictions(function_list) if exact_crossings else None
+
+    adjacency = [defaultdict(list) for _ in function_list]
+    points = {}
+    for box in c1_boxes:
+        for i, crossings in box_crossings(index, vertex_signs, box, edge_restrictions).items():
+            for (key1, point1), (key2, point2) in zip(crossings[0::2], crossings[1::2]):
+                points[key1], points[key2] = point1, point2
+                adjacency[i][key1].append(key2)
+                adjacency[i][key2].append(key1)
+
+    return {i: _chain_polylines(adjacency[i], points) for i in range(len(function_list))}
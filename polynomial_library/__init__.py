@@ -1 +1,2 @@
-# __init__.py
\ No newline at end of file
+# __init__.py
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
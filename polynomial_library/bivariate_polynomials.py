@@ -2,9 +2,57 @@
 # Date: 2024
 
 from typing import Union, List, Dict, Tuple
-from sympy import *
+from itertools import repeat
+from operator import add, mul
 import math
 
+# Exponent pairs (i, j) are packed as i * 2^32 + j inside the multiplication kernel
+_PACK_SHIFT = 32
+_PACK_MASK = (1 << _PACK_SHIFT) - 1
+# Products of two polynomials with at least this many terms, filling at least half of the monomials up to
+# their degree, are computed on dense rows of coefficients instead of dictionaries
+DENSE_PRODUCT_MIN_TERMS = 150
+
+
+def _is_dense(polynomial):
+    terms = len(polynomial.coefficients)
+    return terms >= DENSE_PRODUCT_MIN_TERMS and 4 * terms >= (polynomial.deg + 1) * (polynomial.deg + 2)
+
+
+def _coefficient_rows(polynomial):
+    """ Returns the coefficients as a list of rows, the coefficient of x^i * y^j at rows[i][j]. """
+    rows = [[] for _ in range(polynomial.deg + 1)]
+    for (x_power, y_power), coefficient in polynomial.coefficients.items():
+        row = rows[x_power]
+        if len(row) <= y_power:
+            row.extend(repeat(0, y_power + 1 - len(row)))
+        row[y_power] = coefficient
+    return rows
+
+
+def _dense_product(factor1, factor2, scale):
+    """
+    Multiplies two dense polynomials row by row: every term of the first factor adds a scaled row of the
+    second factor into a row of the result, one slice operation per row.
+    :return: The coefficient dictionary of scale * factor1 * factor2, without zero coefficients
+    """
+    rows1, rows2 = _coefficient_rows(factor1), _coefficient_rows(factor2)
+    width = max(map(len, rows1)) + max(map(len, rows2)) - 1
+    result = [[0] * width for _ in range(len(rows1) + len(rows2) - 1)]
+    for x_power1, row1 in enumerate(rows1):
+        for y_power1, coefficient1 in enumerate(row1):
+            if coefficient1 == 0:
+                continue
+            coefficient1 = coefficient1 * scale
+            for x_power2, row2 in enumerate(rows2):
+                if not row2:
+                    continue
+                target = result[x_power1 + x_power2]
+                end = y_power1 + len(row2)
+                target[y_power1:end] = map(add, target[y_power1:end], map(mul, repeat(coefficient1), row2))
+    return {(x_power, y_power): coefficient for x_power, row in enumerate(result)
+            for y_power, coefficient in enumerate(row) if coefficient != 0}
+
 
 class BivariatePolynomial:
     """
@@ -163,45 +211,112 @@ class BivariatePolynomial:
             derivative_poly = derivative_poly._derivative(variable)
         return derivative_poly
 
+    @classmethod
+    def _from_reduced(cls, coefficients, degree=None):
+        """
+        Builds a polynomial from a dictionary without zero coefficients, skipping `reduce()`.
+        :param coefficients: A dictionary of nonzero coefficients, owned by the new polynomial
+        :param degree: The degree of the polynomial, if already known
+        :return: A new BivariatePolynomial object
+        """
+        polynomial = cls.__new__(cls)
+        polynomial.coefficients = coefficients
+        if degree is None:
+            polynomial.calculate_degree()
+        else:
+            polynomial.deg = degree
+        return polynomial
+
+    def copy(self):
+        """
+        Returns a copy of the polynomial that can be modified in place independently.
+        :return: A new BivariatePolynomial object with the same coefficients
+        """
+        return BivariatePolynomial._from_reduced(self.coefficients.copy(), self.deg)
+
+    def _accumulate(self, other, scale=1):
+        """
+        Adds scale * other to the polynomial in place.
+        :param other: The polynomial to add
+        :param scale: The scalar multiplying the other polynomial
+        """
+        coefficients = self.coefficients
+        cancelled = False
+        # Adding a polynomial to itself must not iterate over the dictionary being updated
+        terms = list(other.coefficients.items()) if other is self else other.coefficients.items()
+        for term, coefficient in terms:
+            value = coefficients.get(term, 0) + scale * coefficient
+            if value == 0:
+                if term in coefficients:
+                    del coefficients[term]
+                    cancelled = True
+            else:
+                coefficients[term] = value
+        if cancelled:
+            self.calculate_degree()
+        elif other.coefficients:
+            self.deg = max(self.deg, other.deg)
+
+    def __iadd__(self, other):
+        """
+        Adds another polynomial to this polynomial in place.
+        :param other: The polynomial to add
+        :return: This polynomial
+        """
+        self._accumulate(other)
+        return self
+
+    def __isub__(self, other):
+        """
+        Subtracts another polynomial from this polynomial in place.
+        :param other: The polynomial to subtract
+        :return: This polynomial
+        """
+        self._accumulate(other, -1)
+        return self
+
     def __add__(self, other):
         """
         Adds two bivariate polynomials.
         :param other: The other polynomial to add
         :return: A new BivariatePolynomial object representing the sum of the two polynomials
         """
-        # Create a new dictionary to store the result without altering the original polynomials
-        polynomial_sum = self.coefficients.copy()
-
-        # Add terms from the other polynomial
-        for term, coefficient in other.coefficients.items():
-            polynomial_sum[term] = polynomial_sum.get(term, 0) + coefficient
-
-            # Optionally remove terms with zero coefficients (clean up zero terms)
-            if polynomial_sum[term] == 0:
-                del polynomial_sum[term]
-
-        return BivariatePolynomial(polynomial_sum)
+        # Accumulate into a copy of the larger polynomial without altering the original polynomials
+        if len(other.coefficients) > len(self.coefficients):
+            polynomial_sum = other.copy()
+            polynomial_sum._accumulate(self)
+        else:
+            polynomial_sum = self.copy()
+            polynomial_sum._accumulate(other)
+        return polynomial_sum
 
     __rad__ = __add__
 
+    def __neg__(self):
+        """
+        Negates the polynomial.
+        :return: A new BivariatePolynomial object with every coefficient negated
+        """
+        return BivariatePolynomial._from_reduced({term: -coefficient for term, coefficient in
+                                                  self.coefficients.items()}, self.deg)
+
     def __mul__(self, other):
         """
         Multiplies the polynomial by a scalar or another polynomial.
         :param other: The scalar or polynomial to multiply by
         :return: A new BivariatePolynomial object representing the product
         """
-        polynomial_product = {}
         if isinstance(other, (int, float)):
-            for term, coefficient in self.coefficients.items():
-                polynomial_product[term] = coefficient * other
+            if other == 0:
+                return BivariatePolynomial._from_reduced({})
+            return BivariatePolynomial._from_reduced({term: coefficient * other for term, coefficient in
+                                                      self.coefficients.items()}, self.deg)
         elif isinstance(other, BivariatePolynomial):
-            for (x1, y1), coefficient1 in self.coefficients.items():
-                for (x2, y2), coefficient2 in other.coefficients.items():
-                    new_term = (x1 + x2, y1 + y2)
-                    polynomial_product[new_term] = polynomial_product.get(new_term, 0) + coefficient1 * coefficient2
+            product = BivariatePolynomial._from_reduced({})
+            product.fma(self, other)
+            return product
         else:
-            raise TypeError("Unsupported type for multiplication: {type(other)}")
-        return BivariatePolynomial(polynomial_product)
+            raise TypeError(f"Unsupported type for multiplication: {type(other)}")
 
     __rmul__ = __mul__
 
@@ -211,7 +326,61 @@ class BivariatePolynomial:
         :param other: The polynomial to subtract
         :return: A new BivariatePolynomial object representing the difference
         """
-        return self + (-1 * other)
+        difference = self.copy()
+        difference._accumulate(other, -1)
+        return difference
+
+    def fma(self, factor1, factor2, scale=1):
+        """
+        Fused multiply-add: adds scale * factor1 * factor2 to the polynomial in place, without building the
+        product as a separate polynomial.
+
+        Exponent pairs (i, j) are packed into single integers i * 2^32 + j while accumulating, so the
+        exponents of a product term are found with one integer addition. Large dense factors are
+        multiplied on rows of coefficients instead.
+        :param factor1: The first polynomial factor
+        :param factor2: The second polynomial factor
+        :param scale: A scalar multiplying the product
+        :return: This polynomial
+        """
+        if _is_dense(factor1) and _is_dense(factor2):
+            self._accumulate(BivariatePolynomial._from_reduced(_dense_product(factor1, factor2, scale)))
+            return self
+        if len(factor1.coefficients) < len(factor2.coefficients):
+            factor1, factor2 = factor2, factor1
+        packed1 = [((x_power << _PACK_SHIFT) | y_power, coefficient * scale)
+                   for (x_power, y_power), coefficient in factor1.coefficients.items()]
+        packed2 = [((x_power << _PACK_SHIFT) | y_power, coefficient)
+                   for (x_power, y_power), coefficient in factor2.coefficients.items()]
+        accumulator = {(x_power << _PACK_SHIFT) | y_power: coefficient
+                       for (x_power, y_power), coefficient in self.coefficients.items()}
+        get = accumulator.get
+        for key2, coefficient2 in packed2:
+            for key1, coefficient1 in packed1:
+                key = key1 + key2
+                accumulator[key] = get(key, 0) + coefficient1 * coefficient2
+        self.coefficients = {(key >> _PACK_SHIFT, key & _PACK_MASK): coefficient
+                             for key, coefficient in accumulator.items() if coefficient != 0}
+        self.calculate_degree()
+        return self
+
+    def __pow__(self, exponent):
+        """
+        Raises the polynomial to a nonnegative integer power by repeated squaring.
+        :param exponent: The exponent
+        :return: A new BivariatePolynomial object representing the power
+        """
+        if not isinstance(exponent, int) or exponent < 0:
+            raise ValueError("Polynomials can only be raised to nonnegative integer powers.")
+        result = BivariatePolynomial._from_reduced({(0, 0): 1}, 0)
+        base = self
+        while exponent:
+            if exponent & 1:
+                result = result * base
+            exponent >>= 1
+            if exponent:
+                base = base * base
+        return result
 
     def calculate_degree(self) -> None:
         """
@@ -266,3 +435,16 @@ class BivariatePolynomial:
         :return: [dP/dx, dP/dy]
         """
         return [self.derivative(0), self.derivative(1)]
+
+
+def polynomial_key(polynomial):
+    """
+    Returns a hashable key identifying a polynomial by its coefficients.
+
+    Coefficients are told apart by type as well as value, so a polynomial with `Fraction` coefficients
+    never shares a key with an equal float polynomial.
+    :param polynomial: A BivariatePolynomial object
+    :return: A frozenset of its (monomial, coefficient, coefficient type) items
+    """
+    return frozenset((monomial, coefficient, type(coefficient))
+                     for monomial, coefficient in polynomial.coefficients.items())
@@ -0,0 +1,237 @@
+"""
+Parsing of polynomial strings in x and y, and a JSON format for BivariatePolynomial, without sympy.
+
+A polynomial string is an expression over the variables x and y, built from numbers, +, -, *, /,
+powers written ^ or ** with a nonnegative integer exponent, and parentheses, for example
+"3x^2*y - (x + 1)**2 / 2". A factor directly followed by a variable or an opening parenthesis is
+multiplied by it, so "2xy" is 2 * x * y. Only constants may divide; the quotient of two integers is an
+exact Fraction, or an int when it is whole.
+
+The JSON format of a polynomial is one of
+    - a list of [x_power, y_power, coefficient] terms, as written by `polynomial_to_json`; a Fraction
+      coefficient is written as a "p/q" string,
+    - a graded list of coefficients [c00, c10, c01, c20, c11, c02, ...], as taken by BivariatePolynomial,
+    - a polynomial string.
+"""
+import re
+from fractions import Fraction
+
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+
+# Whitespace between tokens is skipped by finditer; any other character starts an error token
+_TOKEN = re.compile(r"(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|(?P<symbol>\*\*|[-+*/^()xy])|(?P<error>\S)")
+_END = ("end", None, None)
+_VARIABLES = {"x": (1, 0), "y": (0, 1)}
+
+
+def _tokenize(text):
+    """
+    Split a polynomial string into (kind, value, position) tokens, followed by an end token.
+    :raises ValueError: If the string holds a character that is not part of a polynomial.
+    """
+    tokens = []
+    for token in _TOKEN.finditer(text):
+        kind, value = token.lastgroup, token.group()
+        if kind == "number":
+            tokens.append(("number", int(value) if value.isdigit() else float(value), token.start()))
+        elif kind == "symbol":
+            tokens.append((value, value, token.start()))
+        else:
+            raise ValueError(f"Unexpected character {value!r} at position {token.start()} in {text!r}")
+    tokens.append(_END)
+    return tokens
+
+
+def _multiply(coefficients1, coefficients2):
+    """ The product of two coefficient dictionaries, with a shortcut for monomial factors. """
+    if len(coefficients1) > len(coefficients2):
+        coefficients1, coefficients2 = coefficients2, coefficients1
+    if len(coefficients1) == 1:
+        ((x_power, y_power), coefficient1), = coefficients1.items()
+        return {(x_power + x_power2, y_power + y_power2): coefficient1 * coefficient2
+                for (x_power2, y_power2), coefficient2 in coefficients2.items()}
+    if not coefficients1:
+        return {}
+    product = BivariatePolynomial._from_reduced({})
+    product.fma(BivariatePolynomial._from_reduced(coefficients1), BivariatePolynomial._from_reduced(coefficients2))
+    return product.coefficients
+
+
+def _quotient(numerator, denominator):
+    """ Divide two numbers, exactly when both are integers. """
+    if isinstance(numerator, int) and isinstance(denominator, int):
+        quotient = Fraction(numerator, denominator)
+        return quotient.numerator if quotient.denominator == 1 else quotient
+    return numerator / denominator
+
+
+class _Parser:
+    """
+    A recursive-descent parser building coefficient dictionaries {(i, j): c} directly.
+
+    expression := term (("+" | "-") term)*
+    term       := factor (("*" | "/") factor | factor starting with x, y or "(")*
+    factor     := ("+" | "-") factor | atom (("^" | "**") integer)?
+    atom       := number | "x" | "y" | "(" expression ")"
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.index = 0
+
+    def error(self, message):
+        kind, _, position = self.tokens[self.index]
+        where = "at the end" if kind == "end" else f"at position {position}"
+        return ValueError(f"{message} {where} of {self.text!r}")
+
+    def take(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def parse(self):
+        if self.tokens[0] is _END:
+            raise ValueError("Cannot parse an empty polynomial string.")
+        coefficients = self.expression()
+        if self.tokens[self.index][0] != "end":
+            raise self.error("Unexpected token")
+        return coefficients
+
+    def expression(self):
+        coefficients = self.term()
+        while self.tokens[self.index][0] in ("+", "-"):
+            sign = -1 if self.take()[0] == "-" else 1
+            get = coefficients.get
+            for monomial, coefficient in self.term().items():
+                coefficients[monomial] = get(monomial, 0) + sign * coefficient
+        return coefficients
+
+    def term(self):
+        coefficients = self.factor()
+        while True:
+            kind = self.tokens[self.index][0]
+            if kind == "*":
+                self.index += 1
+                coefficients = _multiply(coefficients, self.factor())
+            elif kind in ("x", "y", "("):
+                coefficients = _multiply(coefficients, self.factor())
+            elif kind == "/":
+                self.index += 1
+                divisor = self.factor()
+                if divisor.keys() - {(0, 0)}:
+                    raise self.error("Only constants can divide a polynomial, before the token")
+                denominator = divisor.get((0, 0), 0)
+                if denominator == 0:
+                    raise self.error("Division by zero before the token")
+                coefficients = {monomial: _quotient(coefficient, denominator)
+                                for monomial, coefficient in coefficients.items()}
+            else:
+                return coefficients
+
+    def factor(self):
+        kind = self.tokens[self.index][0]
+        if kind == "-":
+            self.index += 1
+            return {monomial: -coefficient for monomial, coefficient in self.factor().items()}
+        if kind == "+":
+            self.index += 1
+            return self.factor()
+        coefficients = self.atom()
+        if self.tokens[self.index][0] in ("^", "**"):
+            self.index += 1
+            kind, exponent, _ = self.tokens[self.index]
+            if kind != "number" or not isinstance(exponent, int):
+                raise self.error("Expected a nonnegative integer exponent")
+            self.index += 1
+            power = {(0, 0): 1}
+            while exponent:
+                if exponent & 1:
+                    power = _multiply(power, coefficients)
+                exponent >>= 1
+                if exponent:
+                    coefficients = _multiply(coefficients, coefficients)
+            coefficients = power
+        return coefficients
+
+    def atom(self):
+        kind, value, _ = self.tokens[self.index]
+        if kind == "number":
+            self.index += 1
+            return {(0, 0): value}
+        if kind in _VARIABLES:
+            self.index += 1
+            return {_VARIABLES[kind]: 1}
+        if kind == "(":
+            self.index += 1
+            coefficients = self.expression()
+            if self.tokens[self.index][0] != ")":
+                raise self.error("Expected ')'")
+            self.index += 1
+            return coefficients
+        raise self.error("Expected a number, a variable or '('")
+
+
+def parse_polynomial(text):
+    """
+    Parse a polynomial string in x and y, see the module docstring for the syntax.
+    :param text: The polynomial string, for example "x^2 + y^2 - 1"
+    :return: A BivariatePolynomial object
+    :raises ValueError: If the string is not a polynomial in x and y
+    """
+    return BivariatePolynomial(_Parser(text).parse())
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _coefficient_from_json(value):
+    """ Read a JSON term coefficient: a number, or a "p/q" string for an exact Fraction. """
+    if _is_number(value):
+        return value
+    if isinstance(value, str):
+        try:
+            return Fraction(value)
+        except ValueError:
+            pass
+    raise ValueError(f"A polynomial coefficient is a number or a 'p/q' string, not {value!r}.")
+
+
+def _coefficient_to_json(value):
+    """ Write a coefficient for JSON, a Fraction as a "p/q" string. """
+    return f"{value.numerator}/{value.denominator}" if isinstance(value, Fraction) else value
+
+
+def polynomial_from_json(data):
+    """
+    Build a polynomial from its JSON form, see the module docstring.
+    :param data: A list of [x_power, y_power, coefficient] terms, a graded list of coefficients or a
+                 polynomial string, as decoded by `json.loads`
+    :return: A BivariatePolynomial object
+    :raises ValueError: If the data is none of the accepted forms
+    """
+    if isinstance(data, str):
+        return parse_polynomial(data)
+    if not isinstance(data, list):
+        raise ValueError(f"A polynomial is a list of terms, a list of coefficients or a string, not {data!r}.")
+    if all(_is_number(coefficient) for coefficient in data):
+        return BivariatePolynomial(list(data))
+    coefficients = {}
+    for term in data:
+        if not (isinstance(term, list) and len(term) == 3
+                and all(isinstance(power, int) and not isinstance(power, bool) and power >= 0 for power in term[:2])):
+            raise ValueError(f"A polynomial term is [x_power, y_power, coefficient], not {term!r}.")
+        x_power, y_power, coefficient = term[0], term[1], _coefficient_from_json(term[2])
+        coefficients[(x_power, y_power)] = coefficients.get((x_power, y_power), 0) + coefficient
+    return BivariatePolynomial(coefficients)
+
+
+def polynomial_to_json(polynomial):
+    """
+    Write a polynomial in the JSON term format.
+    :param polynomial: A BivariatePolynomial object with int, float or Fraction coefficients
+    :return: The list of its [x_power, y_power, coefficient] terms, in increasing order of the powers
+    """
+    return [[x_power, y_power, _coefficient_to_json(coefficient)]
+            for (x_power, y_power), coefficient in sorted(polynomial.coefficients.items())]
@@ -0,0 +1,40 @@
+"""
+Conversions between BivariatePolynomial and sympy polynomials.
+
+sympy is imported on first use only, so the numeric core never pays for it.
+"""
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+
+
+def _sympy():
+    """ Import sympy on first use. """
+    import sympy
+    return sympy
+
+
+def sympy_to_bivariate_polynomial(sympy_poly):
+    """
+    Converts a sympy polynomial to a BivariatePolynomial object.
+    :param sympy_poly: The sympy polynomial to convert
+    :return: A BivariatePolynomial object representing the sympy polynomial
+    """
+    coefficients = {}
+    for term in sympy_poly.as_dict().items():
+        monomial, coefficient = term
+        x_power, y_power = monomial[0], monomial[1]
+        coefficients[(x_power, y_power)] = coefficient
+    return BivariatePolynomial(coefficients)
+
+
+def bivariate_polynomial_to_sympy(bivariate_poly):
+    """
+    Converts a BivariatePolynomial object to a sympy polynomial.
+    :param bivariate_poly: The BivariatePolynomial object to convert
+    :return: A sympy polynomial in x, y and z representing the BivariatePolynomial object
+    """
+    sympy = _sympy()
+    x, y, z = sympy.symbols('x y z')
+    sympy_poly = 0
+    for (x_power, y_power), coefficient in bivariate_poly.coefficients.items():
+        sympy_poly += coefficient * x ** x_power * y ** y_power
+    return sympy.Poly(sympy_poly, x, y, z)
@@ -0,0 +1,125 @@
+"""
+Bulk loading of polynomial systems from text and JSON files.
+
+A file of systems is read in one pass. A .json file holds a JSON list of systems; any other file holds
+one system per line, either a JSON system or polynomial strings separated by semicolons, and blank lines
+and lines starting with # are skipped. A JSON system is a list of polynomials in any of the forms taken by
+`polynomial_from_json`, or an object whose "functions" entry is such a list, like a subdivision service
+request.
+
+All polynomials pass through a `PolynomialPool`, so identical polynomials, within a system or across
+systems, are the same object. Caches keyed by polynomial, such as the compiled polynomials of the
+kernels, are then shared by every system using it.
+"""
+import json
+
+from polynomial_library.bivariate_polynomials import polynomial_key
+from polynomial_library.polynomial_parser import parse_polynomial, polynomial_from_json
+
+
+class PolynomialPool:
+    """
+    Interns polynomials, so that equal polynomials are represented by one shared object.
+
+    The shared polynomials must not be modified in place, with += or -= for instance.
+
+    Attributes:
+        polynomials (dict): The distinct polynomials, by `polynomial_key`, the key of the compiled polynomials.
+        strings (dict): The polynomial of every string parsed so far.
+        requests (int): The number of polynomials requested from the pool.
+    """
+
+    def __init__(self):
+        self.polynomials = {}
+        self.strings = {}
+        self.requests = 0
+
+    def __len__(self):
+        return len(self.polynomials)
+
+    def intern(self, polynomial):
+        """
+        Return the pooled polynomial equal to the given one, adding it to the pool if it is new.
+        :param polynomial: A BivariatePolynomial object
+        :return: The shared BivariatePolynomial object
+        """
+        self.requests += 1
+        return self.polynomials.setdefault(polynomial_key(polynomial), polynomial)
+
+    def parse(self, text):
+        """
+        Parse a polynomial string, parsing every distinct string only once.
+        :param text: The polynomial string
+        :return: The shared BivariatePolynomial object
+        """
+        text = text.strip()
+        polynomial = self.strings.get(text)
+        if polynomial is None:
+            polynomial = self.strings[text] = self.intern(parse_polynomial(text))
+        else:
+            self.requests += 1
+        return polynomial
+
+    def from_json(self, data):
+        """
+        Build a polynomial from its JSON form, see `polynomial_from_json`.
+        :return: The shared BivariatePolynomial object
+        """
+        if isinstance(data, str):
+            return self.parse(data)
+        return self.intern(polynomial_from_json(data))
+
+
+def _json_system(data, pool):
+    if isinstance(data, dict):
+        if "functions" not in data:
+            raise ValueError("A system object needs a 'functions' entry.")
+        data = data["functions"]
+    if not isinstance(data, list):
+        raise ValueError(f"A system is a list of polynomials, not {data!r}.")
+    return [pool.from_json(polynomial) for polynomial in data]
+
+
+def parse_systems(text, pool=None, json_list=False):
+    """
+    Parse the contents of a file of systems, see the module docstring.
+    :param text: The contents of the file
+    :param pool: Optional PolynomialPool to intern the polynomials in, shared between calls
+    :param json_list: Read the contents as a JSON list of systems rather than one system per line
+    :return: The list of systems, each a list of BivariatePolynomial objects
+    :raises ValueError: If a system is malformed, with its line number for line-based files
+    """
+    pool = PolynomialPool() if pool is None else pool
+    if json_list:
+        try:
+            systems = json.loads(text)
+            if not isinstance(systems, list):
+                raise ValueError("A JSON file of systems holds a list of systems.")
+            return [_json_system(system, pool) for system in systems]
+        except ValueError as error:
+            raise ValueError(f"Malformed JSON file of systems: {error}") from error
+    systems = []
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            if line[0] in "[{":
+                systems.append(_json_system(json.loads(line), pool))
+            else:
+                systems.append([pool.parse(polynomial) for polynomial in line.split(";") if polynomial.strip()])
+        except ValueError as error:
+            raise ValueError(f"Line {number}: {error}") from error
+    return systems
+
+
+def load_systems(path, pool=None):
+    """
+    Read a whole file of systems, see the module docstring.
+    :param path: The path of the file, read as a JSON list of systems if it ends with .json
+    :param pool: Optional PolynomialPool to intern the polynomials in, shared between files
+    :return: The list of systems, each a list of BivariatePolynomial objects
+    :raises ValueError: If a system is malformed
+    """
+    with open(path, encoding="utf-8") as file:
+        return parse_systems(file.read(), pool, json_list=str(path).lower().endswith(".json"))
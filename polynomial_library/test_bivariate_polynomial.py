@@ -41,3 +41,54 @@ class TestBivariatePolynomials(unittest.TestCase):
         self.assertEqual(summand_1 + summand_1, BivariatePolynomial([2, 4, 6]))
         self.assertEqual(summand_1 + summand_3, BivariatePolynomial([2, 4, 6, 4]))
 
+
+    def test_in_place_arithmetic(self):
+        polynomial = BivariatePolynomial([1, 2, 3, 4])
+        original = polynomial
+        polynomial += BivariatePolynomial([0, 0, 0, -4, 1])
+        self.assertIs(polynomial, original)
+        self.assertEqual(polynomial.coefficients, {(0, 0): 1, (1, 0): 2, (0, 1): 3, (1, 1): 1})
+        self.assertEqual(polynomial.deg, 2)
+        polynomial -= BivariatePolynomial([0, 0, 0, 0, 1])
+        self.assertEqual(polynomial, BivariatePolynomial([1, 2, 3]))
+        self.assertEqual(polynomial.deg, 1)
+        polynomial -= polynomial
+        self.assertEqual(polynomial.coefficients, {})
+        self.assertEqual(polynomial.deg, -1)
+
+    def test_sum_does_not_alter_summands(self):
+        summand_1 = BivariatePolynomial([1, 2, 3])
+        summand_2 = BivariatePolynomial([1, 2, 3, 4, 5, 6])
+        summand_1 + summand_2
+        summand_1 - summand_2
+        self.assertEqual(summand_1, BivariatePolynomial([1, 2, 3]))
+        self.assertEqual(summand_2, BivariatePolynomial([1, 2, 3, 4, 5, 6]))
+
+    def test_fused_multiply_add(self):
+        x_plus_y = BivariatePolynomial([0, 1, 1])
+        x_minus_y = BivariatePolynomial([0, 1, -1])
+        # x^2 - y^2 - (x + y)^2 = -2xy - 2y^2
+        result = x_plus_y * x_minus_y
+        result.fma(x_plus_y, x_plus_y, -1)
+        self.assertEqual(result.coefficients, {(1, 1): -2, (0, 2): -2})
+        self.assertEqual(result.deg, 2)
+
+    def test_power(self):
+        x_plus_y = BivariatePolynomial([0, 1, 1])
+        self.assertEqual((x_plus_y ** 3).coefficients, {(3, 0): 1, (2, 1): 3, (1, 2): 3, (0, 3): 1})
+        self.assertEqual(x_plus_y ** 0, BivariatePolynomial([1]))
+        with self.assertRaises(ValueError):
+            x_plus_y ** -1
+
+    def test_dense_product_matches_sparse_product(self):
+        degree = 17
+        dense_1 = BivariatePolynomial({(i, j): i - 2 * j + 1 for i in range(degree + 1) for j in range(degree + 1 - i)})
+        dense_2 = BivariatePolynomial({(i, j): 3 * i + j - 7 for i in range(degree + 1) for j in range(degree + 1 - i)})
+        sparse_2 = dict(dense_2.coefficients)
+        expected = {}
+        for (x1, y1), coefficient1 in dense_1.coefficients.items():
+            for (x2, y2), coefficient2 in sparse_2.items():
+                term = (x1 + x2, y1 + y2)
+                expected[term] = expected.get(term, 0) + coefficient1 * coefficient2
+        expected = {term: coefficient for term, coefficient in expected.items() if coefficient != 0}
+        self.assertEqual((dense_1 * dense_2).coefficients, expected)
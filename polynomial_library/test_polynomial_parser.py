@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+import unittest
+from fractions import Fraction
+
+from polynomial_library.bivariate_polynomials import BivariatePolynomial, polynomial_key
+from polynomial_library.polynomial_parser import parse_polynomial, polynomial_from_json, polynomial_to_json
+from polynomial_library.system_loader import PolynomialPool, load_systems, parse_systems
+
+
+class TestPolynomialParser(unittest.TestCase):
+
+    def test_expanded_polynomial(self):
+        self.assertEqual(parse_polynomial("3*x^2*y - 2.5*y**3 + 7").coefficients,
+                         {(2, 1): 3, (0, 3): -2.5, (0, 0): 7})
+
+    def test_products_and_powers_are_expanded(self):
+        x, y = BivariatePolynomial({(1, 0): 1}), BivariatePolynomial({(0, 1): 1})
+        expected = (x + y) ** 3 - BivariatePolynomial({(0, 0): 2}) * x * (y - x)
+        self.assertEqual(parse_polynomial("(x + y)^3 - 2x(y - x)"), expected)
+
+    def test_implicit_multiplication_and_unary_signs(self):
+        self.assertEqual(parse_polynomial("-2xy^2 + -x + +1").coefficients, {(1, 2): -2, (1, 0): -1, (0, 0): 1})
+        # A unary minus applies to the power, as in the usual notation
+        self.assertEqual(parse_polynomial("-x^2").coefficients, {(2, 0): -1})
+
+    def test_division_by_constants(self):
+        self.assertEqual(parse_polynomial("x/3 + 4y/2").coefficients, {(1, 0): Fraction(1, 3), (0, 1): 2})
+        self.assertEqual(parse_polynomial("x / 0.5").coefficients, {(1, 0): 2.0})
+
+    def test_cancellation_and_zero(self):
+        self.assertEqual(parse_polynomial("x*y - y*x + 0"), BivariatePolynomial({}))
+        self.assertEqual(parse_polynomial("(x + 1)^0").coefficients, {(0, 0): 1})
+
+    def test_scientific_notation(self):
+        self.assertEqual(parse_polynomial("1e-3x + .5").coefficients, {(1, 0): 1e-3, (0, 0): 0.5})
+
+    def test_malformed_strings(self):
+        for text in ["", "x +", "x + z", "(x + y", "x^-1", "x^1.5", "x / y", "x / (1 - 1)", "x y )", "2 3"]:
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                parse_polynomial(text)
+
+
+class TestPolynomialJSON(unittest.TestCase):
+
+    def test_round_trip(self):
+        polynomial = parse_polynomial("x^3 - 2.5xy + 1")
+        data = polynomial_to_json(polynomial)
+        self.assertEqual(data, [[0, 0, 1], [1, 1, -2.5], [3, 0, 1]])
+        self.assertEqual(polynomial_from_json(data), polynomial)
+
+    def test_fraction_round_trip(self):
+        polynomial = parse_polynomial("x^2/2 + y^2 - 1/3")
+        data = polynomial_to_json(polynomial)
+        self.assertEqual(data, [[0, 0, "-1/3"], [0, 2, 1], [2, 0, "1/2"]])
+        self.assertEqual(json.loads(json.dumps(data)), data)
+        decoded = polynomial_from_json(data)
+        self.assertEqual(decoded, polynomial)
+        self.assertIsInstance(decoded.coefficients[(2, 0)], Fraction)
+
+    def test_graded_list_and_string_forms(self):
+        self.assertEqual(polynomial_from_json([1, 2, 3, 4]), BivariatePolynomial([1, 2, 3, 4]))
+        self.assertEqual(polynomial_from_json("1 + 2x + 3y + 4x^2"), BivariatePolynomial([1, 2, 3, 4]))
+        self.assertEqual(polynomial_from_json([]), BivariatePolynomial({}))
+
+    def test_malformed_data(self):
+        for data in [{"x": 1}, [[1, 0]], [[-1, 0, 1]], [[1, 0, "one"]], [[True, 0, 1]], [1, [0, 0, 1]]]:
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                polynomial_from_json(data)
+
+
+class TestSystemLoader(unittest.TestCase):
+
+    def test_identical_polynomials_are_shared(self):
+        systems = parse_systems("# circle and lines\n"
+                                "x^2 + y^2 - 1; x - y\n"
+                                "\n"
+                                "x^2+y^2-1; x + y;\n"
+                                '["x - y", [[0, 2, 1], [2, 0, 1], [0, 0, -1]]]\n'
+                                '{"functions": [[0, 1, 0, 1]]}\n')
+        self.assertEqual(len(systems), 4)
+        circle, difference = systems[0]
+        self.assertIs(systems[1][0], circle)
+        self.assertIs(systems[2][0], difference)
+        self.assertIs(systems[2][1], circle)
+        self.assertEqual(len(systems[1]), 2)
+        self.assertEqual(systems[3][0].coefficients, {(1, 0): 1, (2, 0): 1})
+
+    def test_pool_tells_coefficient_types_apart(self):
+        pool = PolynomialPool()
+        integer = pool.parse("x + 1")
+        self.assertIsNot(pool.parse("x + 1.0"), integer)
+        self.assertIs(pool.from_json([[0, 0, 1], [1, 0, 1]]), integer)
+        self.assertEqual((len(pool), pool.requests), (2, 3))
+        self.assertIs(pool.polynomials[polynomial_key(parse_polynomial("1 + x"))], integer)
+
+    def test_load_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            lines_path = os.path.join(directory, "systems.txt")
+            json_path = os.path.join(directory, "systems.json")
+            with open(lines_path, "w") as file:
+                file.write("x^2 - y; y - 1\n")
+            with open(json_path, "w") as file:
+                file.write('[["x^2 - y", "y - 1"], {"functions": ["y - 1"]}]')
+            pool = PolynomialPool()
+            lines_systems = load_systems(lines_path, pool)
+            json_systems = load_systems(json_path, pool)
+        self.assertEqual(json_systems, [lines_systems[0], [lines_systems[0][1]]])
+        self.assertIs(json_systems[1][0], lines_systems[0][1])
+
+    def test_errors_name_the_line(self):
+        with self.assertRaisesRegex(ValueError, "Line 2"):
+            parse_systems("x; y\nx +; y\n")
+        with self.assertRaises(ValueError):
+            parse_systems('{"functions": ["x"]}', json_list=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import math
+import unittest
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+from polynomial_library.weyl_inner_product import (batch_weyl_norms, cross_product_weyl_norm, system_weyl_norms,
+                                                   weyl_inner_product, weyl_norm, weyl_weights)
+
+
+class TestWeylInnerProduct(unittest.TestCase):
+
+    def test_weights_are_inverse_multinomials(self):
+        weights = weyl_weights(4)
+        self.assertEqual(weights[2 * 5 + 1], 1 / 12)  # x^2 y z: 4! / (2! 1! 1!) = 12
+        self.assertEqual(weights[4 * 5 + 0], 1.0)
+        self.assertEqual(weights[3 * 5 + 2], 0)
+
+    def test_power_of_linear_form(self):
+        # The Weyl norm is multiplicative on powers of linear forms: ||(x + y)^2|| = ||x + y||^2 = 2
+        square = BivariatePolynomial({(2, 0): 1, (1, 1): 2, (0, 2): 1})
+        self.assertAlmostEqual(weyl_norm(square), 2.0)
+
+    def test_inner_product_uses_both_polynomials(self):
+        f = BivariatePolynomial({(2, 0): 2, (1, 1): 3, (0, 0): 1})
+        g = BivariatePolynomial({(2, 0): 5, (1, 1): -1, (0, 1): 7})
+        self.assertAlmostEqual(weyl_inner_product(f, g), 2 * 5 - 3 / 2)
+        self.assertEqual(weyl_inner_product(f, g), weyl_inner_product(g, f))
+
+    def test_lower_degree_polynomial_is_homogenized_to_common_degree(self):
+        line = BivariatePolynomial({(1, 0): 1})
+        self.assertEqual(weyl_inner_product(line, line), 1.0)
+        self.assertEqual(weyl_inner_product(line, line, degree=3), 1 / 3)
+        with self.assertRaises(ValueError):
+            weyl_inner_product(line, line, degree=0)
+
+    def test_batch_matches_single_systems(self):
+        circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        line = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.1})
+        cubic = BivariatePolynomial({(3, 0): 1, (0, 1): -1, (1, 0): -0.3})
+        systems = [[circle, line], [line, cubic], [circle, line, cubic]]
+        for batch, system in zip(batch_weyl_norms(systems), systems):
+            single = system_weyl_norms(system)
+            self.assertEqual(batch.norms, single.norms)
+            self.assertEqual(batch.cross_norms, single.cross_norms)
+        self.assertEqual(system_weyl_norms([circle, line]).cross_norms[(0, 1)], cross_product_weyl_norm(circle, line))
+
+    def test_condition_estimate(self):
+        line = BivariatePolynomial({(1, 0): 1, (0, 1): -1})
+        parallel = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.5})
+        crossing = BivariatePolynomial({(1, 0): 1, (0, 1): 1})
+        self.assertEqual(system_weyl_norms([line, parallel]).condition_estimate(), math.inf)
+        self.assertLess(system_weyl_norms([line, crossing]).condition_estimate(), math.inf)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
-from bivariate_polynomials import BivariatePolynomial
-from sympy import *
+from functools import lru_cache
+from polynomial_library.bivariate_polynomials import BivariatePolynomial, polynomial_key
 import math
 
 
@@ -14,86 +14,191 @@ def cross_product_polynomial_gradients(polynomial1: BivariatePolynomial,
     gradient1 = polynomial1.gradient()
     gradient2 = polynomial2.gradient()
 
-    cross_product = gradient1[0] * gradient2[1] - gradient1[1] * gradient2[0]
-    return cross_product
+    cross_product = gradient1[0] * gradient2[1]
+    return cross_product.fma(gradient1[1], gradient2[0], -1)
 
 
-def sympy_to_bivariate_polynomial(sympy_poly):
+@lru_cache(maxsize=None)
+def weyl_weights(degree):
     """
-    Converts a sympy polynomial to a BivariatePolynomial object.
-    :param sympy_poly: The sympy polynomial to convert
-    :return: A BivariatePolynomial object representing the sympy polynomial
-    """
-    coefficients = {}
-    for term in sympy_poly.as_dict().items():
-        monomial, coefficient = term
-        x_power, y_power = monomial[0], monomial[1]
-        coefficients[(x_power, y_power)] = coefficient
-    return BivariatePolynomial(coefficients)
-
+    Returns the Weyl weights of the monomials of a given degree.
 
-def bivariate_polynomial_to_sympy(bivariate_poly):
-    """
-    Converts a BivariatePolynomial object to a sympy polynomial.
-    :param bivariate_poly: The BivariatePolynomial object to convert
-    :return: A sympy polynomial representing the BivariatePolynomial object
+    A polynomial is homogenized to x^i * y^j * z^(degree - i - j), and the weight of that monomial is the
+    inverse of the multinomial coefficient degree! / (i! j! (degree - i - j)!).
+    :param degree: The degree of the homogenization
+    :return: A tuple with the weight of x^i * y^j at index i * (degree + 1) + j, and 0 when i + j > degree
     """
-    sympy_poly = 0
-    for (x_power, y_power), coefficient in bivariate_poly.coefficients.items():
-        sympy_poly += coefficient * symbols('x') ** x_power * symbols('y') ** y_power
-    return Poly(sympy_poly, symbols('x'), symbols('y'), symbols('z'))
+    n = degree + 1
+    weights = [0.0] * (n * n)
+    for i in range(n):
+        for j in range(n - i):
+            multinomial = math.factorial(degree) // (math.factorial(i) * math.factorial(j) *
+                                                     math.factorial(degree - i - j))
+            weights[i * n + j] = 1 / multinomial
+    return tuple(weights)
 
 
-def weyl_inner_product(poly1, poly2):
+def weyl_inner_product(poly1, poly2, degree=None):
     """
     Computes the Weyl inner product of two bivariate polynomials.
+
+    Both polynomials are homogenized to the same degree, and the products of their matching coefficients
+    are summed with the weights of `weyl_weights`.
     :param poly1: The first bivariate polynomial
     :param poly2: The second bivariate polynomial
+    :param degree: The degree of the homogenization; the larger degree of the two polynomials by default
     :return: The Weyl inner product of the two polynomials
     """
-    degree = poly1.total_degree()
+    if degree is None:
+        degree = max(poly1.deg, poly2.deg)
+    if poly1.deg > degree or poly2.deg > degree:
+        raise ValueError(f"Cannot homogenize polynomials of degree {max(poly1.deg, poly2.deg)} to degree {degree}")
+    if degree < 0:
+        return 0.0
+    weights = weyl_weights(degree)
+    n = degree + 1
+    if len(poly2.coefficients) < len(poly1.coefficients):
+        poly1, poly2 = poly2, poly1
+    other_coefficients = poly2.coefficients
+    weyl_inner_product_value = 0.0
+    for (x_power, y_power), coefficient in poly1.coefficients.items():
+        other_coefficient = other_coefficients.get((x_power, y_power))
+        if other_coefficient is not None:
+            weyl_inner_product_value += weights[x_power * n + y_power] * coefficient * other_coefficient
+    return weyl_inner_product_value
 
-    homogenized_poly1 = poly1.homogenize(symbols('z'))
-    homogenized_poly2 = poly2.homogenize(symbols('z'))
 
-    weyl_inner_product_value = 0
-    for term in homogenized_poly1.terms():
-        exponents, coefficient = term[0], term[1]
-        monomial_coeff = ((math.factorial(exponents[0]) * math.factorial(exponents[1]) * math.factorial(exponents[2]))
-                          / math.factorial(degree))
-        weyl_inner_product_value += monomial_coeff * coefficient ** 2
+def weyl_norm(polynomial, degree=None):
+    """
+    Computes the Weyl norm of a bivariate polynomial.
+    :param polynomial: The bivariate polynomial
+    :param degree: The degree of the homogenization; the degree of the polynomial by default
+    :return: The square root of the Weyl inner product of the polynomial with itself
+    """
+    return math.sqrt(weyl_inner_product(polynomial, polynomial, degree))
 
-    return weyl_inner_product_value
+
+def gradient_weyl_norm(polynomial):
+    """
+    Computes the Weyl norm of the gradient of a bivariate polynomial, with both partial derivatives
+    homogenized to the degree of the polynomial minus one.
+    :param polynomial: The bivariate polynomial
+    :return: The square root of the sum of the squared Weyl norms of the partial derivatives
+    """
+    degree = max(polynomial.deg - 1, 0)
+    dx, dy = polynomial.gradient()
+    return math.sqrt(weyl_inner_product(dx, dx, degree) + weyl_inner_product(dy, dy, degree))
 
 
-u, v, x, y, z = symbols('u v x y z')
-f = Poly(2 * x ** 2 + 3 * x * y ** 5 + 4 * y ** 2, x, y, z)
-g = Poly(5 * x ** 3 + 2 * x ** 2 * y + 3 * y ** 2, x, y, z)
+def cross_product_weyl_norm(polynomial1, polynomial2):
+    """
+    Computes the Weyl norm of the cross product of the gradients of two bivariate polynomials.
+    :param polynomial1: The first bivariate polynomial
+    :param polynomial2: The second bivariate polynomial
+    :return: The Weyl norm of cross_product_polynomial_gradients(polynomial1, polynomial2)
+    """
+    return weyl_norm(cross_product_polynomial_gradients(polynomial1, polynomial2))
 
-print(f, g)
 
-bivar_f = sympy_to_bivariate_polynomial(f)
-bivar_g = sympy_to_bivariate_polynomial(g)
+class SystemWeylNorms:
+    """
+    The Weyl norms of a polynomial system.
+
+    Attributes:
+        norms (list[float]): The Weyl norm of each polynomial.
+        gradient_norms (list[float]): The Weyl norm of the gradient of each polynomial.
+        cross_norms (dict[tuple[int, int], float]): The Weyl norm of the gradient cross product of each
+                                                   pair (i, j) of polynomials with i < j.
+        degrees (list[int]): The degree of each polynomial.
+    """
 
-print(bivar_f.gradient(), bivar_g.gradient())
+    def __init__(self, norms, gradient_norms, cross_norms, degrees):
+        self.norms = norms
+        self.gradient_norms = gradient_norms
+        self.cross_norms = cross_norms
+        self.degrees = degrees
+
+    def condition_estimate(self):
+        """
+        Estimates how ill-conditioned the system is, as a coarse measure of subdivision cost.
+
+        Every polynomial contributes degree * ||f|| / ||grad f||, and every pair contributes
+        deg f * deg g * ||f|| * ||g|| / ||grad f x grad g||, all in Weyl norms. Small gradients and nearly
+        parallel gradients relative to the size of the polynomials make the estimate grow.
+        :return: The largest contribution; math.inf if a gradient or a cross product vanishes identically
+        """
+        estimate = 0.0
+        for norm, gradient_norm, degree in zip(self.norms, self.gradient_norms, self.degrees):
+            if degree > 0:
+                estimate = max(estimate, _ratio(degree * norm, gradient_norm))
+        for (i, j), cross_norm in self.cross_norms.items():
+            if self.degrees[i] > 0 and self.degrees[j] > 0:
+                estimate = max(estimate, _ratio(self.degrees[i] * self.degrees[j] * self.norms[i] * self.norms[j],
+                                                cross_norm))
+        return estimate
+
+
+def _ratio(numerator, denominator):
+    return numerator / denominator if denominator > 0 else math.inf
+
+
+def batch_weyl_norms(systems):
+    """
+    Computes the Weyl norms of many polynomial systems.
+
+    Norms and cross products are computed once for every distinct polynomial and pair of polynomials,
+    however many systems share them.
+    :param systems: An iterable of lists of bivariate polynomials
+    :return: A list with a SystemWeylNorms for each system
+    """
+    norm_cache = {}
+    cross_cache = {}
+    results = []
+    for function_list in systems:
+        keys = [polynomial_key(function) for function in function_list]
+        for key, function in zip(keys, function_list):
+            if key not in norm_cache:
+                norm_cache[key] = (weyl_norm(function), gradient_weyl_norm(function))
+        cross_norms = {}
+        for i in range(len(function_list)):
+            for j in range(i + 1, len(function_list)):
+                pair = (keys[i], keys[j])
+                if pair not in cross_cache:
+                    cross_cache[pair] = cross_product_weyl_norm(function_list[i], function_list[j])
+                cross_norms[(i, j)] = cross_cache[pair]
+        results.append(SystemWeylNorms([norm_cache[key][0] for key in keys],
+                                       [norm_cache[key][1] for key in keys],
+                                       cross_norms,
+                                       [function.deg for function in function_list]))
+    return results
+
+
+def system_weyl_norms(function_list):
+    """
+    Computes the Weyl norms of one polynomial system.
+    :param function_list: A list of bivariate polynomials
+    :return: A SystemWeylNorms
+    """
+    return batch_weyl_norms([function_list])[0]
 
-cross_p = cross_product_polynomial_gradients(bivar_f, bivar_g)
 
-print(cross_p)
+def main():
+    f = BivariatePolynomial({(2, 0): 2, (1, 5): 3, (0, 2): 4})
+    g = BivariatePolynomial({(3, 0): 5, (2, 1): 2, (0, 2): 3})
 
-sympy_cross_p = bivariate_polynomial_to_sympy(cross_p)
+    print(f, g)
+    print(f.gradient(), g.gradient())
 
-homogenized_f = f.homogenize(z)
-homogenized_g = g.homogenize(z)
-homogenized_cross_p = sympy_cross_p.homogenize(z)
+    cross_p = cross_product_polynomial_gradients(f, g)
+    print(cross_p)
 
-pprint(homogenized_cross_p.as_expr())
+    # Print all three Weyl inner products with labels
+    print(f"Weyl Inner Product of f: {weyl_inner_product(f, f)}")
+    print(f"Weyl Inner Product of g: {weyl_inner_product(g, g)}")
+    print(f"Weyl Inner Product of cross_p: {weyl_inner_product(cross_p, cross_p)}")
+    print(f"Weyl Inner Product of f and g: {weyl_inner_product(f, g)}")
+    print(f"Condition estimate of (f, g): {system_weyl_norms([f, g]).condition_estimate()}")
 
-weyl_p = weyl_inner_product(homogenized_cross_p, homogenized_cross_p)
-weyl_f = weyl_inner_product(homogenized_f, homogenized_f)
-weyl_g = weyl_inner_product(homogenized_g, homogenized_g)
 
-# Print all three Weyl inner products with labels
-print(f"Weyl Inner Product of f: {weyl_f}")
-print(f"Weyl Inner Product of g: {weyl_g}")
-print(f"Weyl Inner Product of cross_p: {weyl_p}")
+if __name__ == '__main__':
+    main()
@@ -1,89 +1,451 @@
 import math
+import time
+from collections import deque
 
 from polynomial_library.bivariate_polynomials import *
 from interval_arithmetic_library.interval_arithmetic import Interval
 from interval_arithmetic_library.box_arithmetic import Box
 from simultaneous_approximation_predicates import *
 from simultaneous_approximation_tools import *
-# from piecewise_edges import *
+from simultaneous_approximation_frontier import frontier_subdivision
+from simultaneous_approximation_ordering import FunctionOrdering
+from simultaneous_approximation_preconditioning import preconditioned_subdivision
+from simultaneous_approximation_splitting import box_splitter
+from piecewise_edges import *
 
-def subdivision_without_c1_cross(function_list, initial_box):
-    subdivision_queue = [initial_box]
-    c0_boxes, c1_boxes = [], []
+C0_BOX = "c0"
+C1_BOX = "c1"
+SUBDIVIDE = "subdivide"
+ENGINES = ("objects", "frontier")
 
-    while subdivision_queue:
-        current_box = subdivision_queue.pop(0)
-        if c0_predicate(function_list, current_box):
-            c0_boxes.append(current_box)
-            current_box.C0_predicate = True
-        elif c0_c1_predicate(function_list, current_box):
-            c1_boxes.append(current_box)
-            current_box.C0_predicate = False
-            current_box.C1_predicate = True
-        elif c1_predicate(function_list, current_box):
-            c1_boxes.append(current_box)
-            current_box.C0_predicate = False
-            current_box.C1_predicate = True
-            # current_box.C1Prime = True
+
+def classify_box_without_c1_cross(function_list, current_box, arithmetic=None, function_ordering=None,
+                                  vertex_cache=None):
+    """
+    Classify a single box with the predicates of `subdivision_without_c1_cross`.
+
+    The predicate flags of the box are updated when it is classified.
+
+    Args:
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        current_box (PVBox): The box to classify.
+        arithmetic (ArithmeticPolicy): Optional arithmetic for the predicates; float by default.
+        function_ordering (FunctionOrdering): Optional learned order in which to test the functions.
+        vertex_cache (VertexCache): Optional sample signs shared between boxes, to screen the C0 predicate.
+
+    Returns:
+        str: C0_BOX, C1_BOX or SUBDIVIDE.
+    """
+    if function_ordering is not None:
+        return _classify_in_order_without_c1_cross(function_list, current_box, arithmetic, function_ordering,
+                                                   vertex_cache)
+    if c0_predicate(function_list, current_box, arithmetic, vertex_cache):
+        current_box.C0_predicate = True
+        return C0_BOX
+    elif c0_c1_predicate(function_list, current_box, arithmetic, vertex_cache):
+        current_box.C0_predicate = False
+        current_box.C1_predicate = True
+        return C1_BOX
+    elif c1_predicate(function_list, current_box, arithmetic):
+        current_box.C0_predicate = False
+        current_box.C1_predicate = True
+        # current_box.C1Prime = True
+        return C1_BOX
+    return SUBDIVIDE
+
+
+def _classify_in_order_without_c1_cross(function_list, current_box, arithmetic, function_ordering,
+                                        vertex_cache=None):
+    """
+    Classify a box like `classify_box_without_c1_cross`, testing one function at a time in the order of
+    `function_ordering` and stopping as soon as the outcome is known.
+    """
+    order = function_ordering.order(current_box)
+    c1_results = {}
+
+    def c1_holds(i):
+        if i not in c1_results:
+            function_ordering.evaluations += 1
+            c1_results[i] = c1_predicate([function_list[i]], current_box, arithmetic)
+        return c1_results[i]
+
+    # C0 predicate: stop at the first function that may have a curve in the box
+    without_curve = []
+    with_curve = None
+    for position, i in enumerate(order):
+        function_ordering.evaluations += 1
+        if c0_predicate([function_list[i]], current_box, arithmetic, vertex_cache):
+            without_curve.append(i)
         else:
-            subdivision_queue.extend(current_box.subdivide())
-    return c0_boxes, c1_boxes
+            with_curve = i
+            break
+    if with_curve is None:
+        function_ordering.record(current_box, ())
+        current_box.C0_predicate = True
+        return C0_BOX
 
+    # C0-C1 predicate: fails once two functions have no curve, so test the least likely curves first
+    for i in reversed(order[position + 1:]):
+        if len(without_curve) > 1:
+            break
+        function_ordering.evaluations += 1
+        if c0_predicate([function_list[i]], current_box, arithmetic, vertex_cache):
+            without_curve.append(i)
+    if len(without_curve) > 1:
+        c0_c1 = False
+    else:
+        c0_c1 = len(without_curve) == 0 or c1_holds(without_curve[0])
 
-def subdivision_with_c1_cross(function_list, initial_box):
-    subdivision_queue = [initial_box]
-    c0_boxes, c1_boxes = [], []
+    if not c0_c1:
+        # C1 predicate: stop at the first function whose gradient may vanish
+        for i in order:
+            if not c1_holds(i):
+                function_ordering.record(current_box, (with_curve, i))
+                return SUBDIVIDE
+    function_ordering.record(current_box, (with_curve,))
+    current_box.C0_predicate = False
+    current_box.C1_predicate = True
+    return C1_BOX
 
-    while subdivision_queue:
-        current_box = subdivision_queue.pop(0)
 
+def _curves_in_order(function_list, current_box, arithmetic, function_ordering, vertex_cache=None):
+    """
+    Find the functions that may have a curve in a box, testing them in the order of `function_ordering`.
+
+    Returns:
+        list[int]: The indices of the functions failing the C0 predicate, or None as soon as the box has to
+        be subdivided: a third curve is found, or the gradient of a curve may vanish in the box.
+    """
+    not_c0_functions = []
+    result = not_c0_functions
+    for i in function_ordering.order(current_box):
+        function_ordering.evaluations += 1
+        if c0_predicate([function_list[i]], current_box, arithmetic, vertex_cache):
+            continue
+        not_c0_functions.append(i)
+        if len(not_c0_functions) > 2:
+            result = None
+            break
+        function_ordering.evaluations += 1
+        if not c1_predicate([function_list[i]], current_box, arithmetic):
+            result = None
+            break
+    function_ordering.record(current_box, not_c0_functions)
+    return result
+
+
+def classify_box_with_c1_cross(function_list, current_box, neighborhood_factor=6.5, c1_cross_cache=None,
+                               arithmetic=None, function_ordering=None, vertex_cache=None):
+    """
+    Classify a single box with the predicates of `subdivision_with_c1_cross`.
+
+    The predicate flags of the box are updated when it is classified.
+
+    Args:
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        current_box (PVBox): The box to classify.
+        neighborhood_factor (float): How many box widths the C1-cross neighborhood extends on each side.
+        c1_cross_cache (C1CrossCache): Optional memo of C1-cross certificates for this system.
+        arithmetic (ArithmeticPolicy): Optional arithmetic for the predicates; float by default.
+        function_ordering (FunctionOrdering): Optional learned order in which to test the functions.
+        vertex_cache (VertexCache): Optional sample signs shared between boxes, to screen the C0 predicate.
+
+    Returns:
+        str: C0_BOX, C1_BOX or SUBDIVIDE.
+    """
+    if function_ordering is None:
         not_c0_functions = set()
         not_c1_functions = set()
         for i, function in enumerate(function_list):
-            if not c0_predicate([function], current_box):
+            # The gradient only matters for the functions whose curve may cross the box
+            if not c0_predicate([function], current_box, arithmetic, vertex_cache):
                 not_c0_functions.add(i)
-            if not c1_predicate([function], current_box):
-                not_c1_functions.add(i)
+                if not c1_predicate([function], current_box, arithmetic):
+                    not_c1_functions.add(i)
 
-        # Box has more than 2 curves
-        if len(not_c0_functions) > 2:
-            subdivision_queue.extend(current_box.subdivide())
-            continue
+        # Box has more than 2 curves, or a curve whose gradient may vanish
+        if len(not_c0_functions) > 2 or not_c0_functions & not_c1_functions:
+            return SUBDIVIDE
+    else:
+        not_c0_functions = _curves_in_order(function_list, current_box, arithmetic, function_ordering,
+                                            vertex_cache)
+        if not_c0_functions is None:
+            return SUBDIVIDE
 
-        # Box has exactly 2 curves
-        if len(not_c0_functions) == 2:
-            if not_c0_functions & not_c1_functions:
-                subdivision_queue.extend(current_box.subdivide())
-                continue
-
-            both_curves = [function_list[i] for i in not_c0_functions]
-            w = 6.5
+    # Box has exactly 2 curves
+    if len(not_c0_functions) == 2:
+        function_pair = tuple(sorted(not_c0_functions))
+        both_curves = [function_list[i] for i in function_pair]
+        if c1_cross_cache is not None:
+            c1_cross = c1_cross_cache.c1_cross_predicate(function_pair, *both_curves, current_box)
+        else:
+            w = neighborhood_factor
             extended_x_interval = Interval(current_box.x_interval.lower_bound - w*current_box.width(),
                                            current_box.x_interval.upper_bound + w*current_box.width())
             extended_y_interval = Interval(current_box.y_interval.lower_bound - w*current_box.width(),
                                            current_box.y_interval.upper_bound + w*current_box.width())
             two_neighborhood_current_box = PVBox(extended_x_interval, extended_y_interval)
-            if c1_cross_predicate(*both_curves, two_neighborhood_current_box):
-                c1_boxes.append(current_box)
-                current_box.C0_predicate = False
-                current_box.C1_predicate = True
-                current_box.C1Prime = True
-            else:
-                subdivision_queue.extend(current_box.subdivide())
-            continue
+            c1_cross = c1_cross_predicate(*both_curves, two_neighborhood_current_box, arithmetic)
+        if c1_cross:
+            current_box.C0_predicate = False
+            current_box.C1_predicate = True
+            current_box.C1Prime = True
+            return C1_BOX
+        return SUBDIVIDE
 
-        # Box has exactly 1 curve
-        if len(not_c0_functions) == 1:
-            if not_c0_functions & not_c1_functions:
-                subdivision_queue.extend(current_box.subdivide())
-            else:
-                c1_boxes.append(current_box)
-                current_box.C0_predicate = False
-                current_box.C1_predicate = True
-            continue
+    # Box has exactly 1 curve
+    if len(not_c0_functions) == 1:
+        current_box.C0_predicate = False
+        current_box.C1_predicate = True
+        return C1_BOX
 
-        # Box has no curves
-        c0_boxes.append(current_box)
-        current_box.C0_predicate = True
+    # Box has no curves
+    current_box.C0_predicate = True
+    return C0_BOX
+
+
+class SubdivisionBudget:
+    """
+    Limits on the work a subdivision run may do.
+
+    A box the predicates cannot decide is only subdivided if its children are at least `min_width`
+    wide, it is less than `max_depth` levels below the initial box, and the run has created fewer
+    than `max_boxes` boxes in total. Once `time_limit` seconds have passed, no further box is
+    examined. Boxes stopped by any limit are reported as undecided.
+
+    Every limit is optional; None means unlimited.
+    """
+
+    def __init__(self, min_width=None, max_depth=None, max_boxes=None, time_limit=None):
+        self.min_width = min_width
+        self.max_depth = max_depth
+        self.max_boxes = max_boxes
+        self.time_limit = time_limit
+        self.box_count = 0
+        self.deadline = None
+
+    def start(self, box_count):
+        """
+        Reset the counters at the beginning of a run.
+
+        :param box_count: The number of boxes the run starts from.
+        """
+        self.box_count = box_count
+        self.deadline = None if self.time_limit is None else time.monotonic() + self.time_limit
+
+    def expired(self):
+        """ Check whether the wall-clock deadline of the run has passed. """
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def allows_subdivision(self, box):
+        """
+        Check whether the budget leaves room to subdivide a box into four children.
+
+        :param box: The box to subdivide.
+        :return: True if the box may be subdivided, False otherwise.
+        """
+        if self.min_width is not None and box.width() / 2 < self.min_width:
+            return False
+        if self.max_depth is not None and box.depth >= self.max_depth:
+            return False
+        if self.max_boxes is not None and self.box_count + 4 > self.max_boxes:
+            return False
+        return True
+
+
+def run_subdivision(boxes, classify, budget=None, split=None):
+    """
+    Classify boxes breadth first, subdividing every box the classifier cannot decide.
+
+    Args:
+        boxes (list[PVBox]): The boxes to start from.
+        classify (Callable[[PVBox], str]): Returns C0_BOX, C1_BOX or SUBDIVIDE for a box.
+        budget (SubdivisionBudget): Optional limits on the run.
+        split (Callable[[PVBox], list[PVBox]]): Splits an undecided box, see `box_splitter`; into four
+                                                quadrants by default.
+
+    Returns:
+        tuple[list[PVBox], list[PVBox], list[PVBox]]: The c0 boxes, the c1 boxes and the boxes left
+        undecided by the budget.
+    """
+    subdivision_queue = deque(boxes)
+    c0_boxes, c1_boxes, undecided_boxes = [], [], []
+    if budget is not None:
+        budget.start(len(subdivision_queue))
+
+    while subdivision_queue:
+        if budget is not None and budget.expired():
+            undecided_boxes.extend(subdivision_queue)
+            break
+        current_box = subdivision_queue.popleft()
+        classification = classify(current_box)
+        if classification == C0_BOX:
+            c0_boxes.append(current_box)
+        elif classification == C1_BOX:
+            c1_boxes.append(current_box)
+        elif budget is None:
+            subdivision_queue.extend(split(current_box) if split is not None else current_box.subdivide())
+        elif budget.allows_subdivision(current_box):
+            children = split(current_box) if split is not None else current_box.subdivide()
+            subdivision_queue.extend(children)
+            budget.box_count += len(children)
+        else:
+            undecided_boxes.append(current_box)
+        release_enclosures(current_box)
+    return c0_boxes, c1_boxes, undecided_boxes
+
+
+def _function_ordering(function_list, function_ordering):
+    """ Turn the `function_ordering` argument of a driver into a FunctionOrdering or None. """
+    if function_ordering is True:
+        return FunctionOrdering(function_list)
+    return function_ordering or None
+
+
+def _vertex_cache(arithmetic, vertex_cache):
+    """ Turn the `vertex_cache` argument of a driver into a VertexCache or None. """
+    if vertex_cache is True:
+        return VertexCache(arithmetic)
+    return vertex_cache or None
+
+
+def _check_engine(engine):
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown subdivision engine: {engine!r}; choose from {ENGINES}.")
+
+
+def _check_frontier_options(arithmetic, function_ordering, split):
+    """ Reject the driver options the frontier engine does not support. """
+    if arithmetic is not None:
+        raise ValueError("The frontier engine supports float arithmetic only.")
+    if function_ordering:
+        raise ValueError("The frontier engine tests every function and does not use a function ordering.")
+    if split != "quadtree":
+        raise ValueError("The frontier engine supports quadtree splits only.")
+
+
+def subdivision_without_c1_cross(function_list, initial_box, budget=None, arithmetic="float",
+                                 function_ordering=None, vertex_cache=False, split="quadtree", engine="objects",
+                                 precondition=False):
+    """
+    Subdivide the initial box until every box is classified as C0 or C1.
+
+    Args:
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        initial_box (PVBox): The domain.
+        budget (SubdivisionBudget): Optional limits on the run.
+        arithmetic (str or ArithmeticPolicy): "float", "adaptive" or "exact", see `ArithmeticPolicy`.
+        function_ordering (FunctionOrdering or bool): Test the functions in a learned order, see
+                                                      `FunctionOrdering`. True uses a new ordering; pass an
+                                                      instance to read its counters after the run.
+        vertex_cache (VertexCache or bool): Screen the C0 predicate with the signs of the functions at box
+                                            corners and midpoints, see `VertexCache`. True uses a new cache;
+                                            pass an instance to read its counters after the run.
+                                            Off by default: the cache holds a sign per function and
+                                            sample point, up to `VertexCache.max_entries`.
+        split (str): "quadtree" splits undecided boxes into four quadrants; "binary" cuts them in two
+                     across one axis, chosen from their aspect ratio and the gradients of the functions,
+                     see `split_axis`.
+        engine (str): "objects" classifies one box at a time, see `run_subdivision`; "frontier" classifies a
+                      whole level at a time with batch kernels and returns the same boxes, see
+                      `frontier_subdivision`. The frontier engine supports float arithmetic and quadtree
+                      splits only, without function ordering or C1-cross memoization, and does not update
+                      the counters of a VertexCache instance.
+        precondition (bool): Map the initial box onto [-1, 1]^2 and the functions with it, run there and map
+                             the boxes back, see `preconditioned_subdivision`. The returned boxes carry no
+                             parent or children links.
+
+    Returns:
+        tuple: The c0 boxes and the c1 boxes. If a budget is given, the boxes it left undecided are
+        returned as a third list.
+    """
+    arithmetic = arithmetic_policy(arithmetic)
+    if precondition:
+        return preconditioned_subdivision(subdivision_without_c1_cross, function_list, initial_box, budget,
+                                          exact=arithmetic is not None, arithmetic=arithmetic,
+                                          function_ordering=function_ordering, vertex_cache=vertex_cache,
+                                          split=split, engine=engine)
+    if engine == "frontier":
+        _check_frontier_options(arithmetic, function_ordering, split)
+        c0_boxes, c1_boxes, undecided_boxes = frontier_subdivision(
+            function_list, initial_box, with_c1_cross=False, budget=budget, screen=bool(vertex_cache))
+    else:
+        _check_engine(engine)
+        function_ordering = _function_ordering(function_list, function_ordering)
+        vertex_cache = _vertex_cache(arithmetic, vertex_cache)
+        c0_boxes, c1_boxes, undecided_boxes = run_subdivision(
+            [initial_box],
+            lambda box: classify_box_without_c1_cross(function_list, box, arithmetic, function_ordering,
+                                                      vertex_cache),
+            budget, box_splitter(function_list, split, arithmetic))
+    if budget is None:
+        return c0_boxes, c1_boxes
+    return c0_boxes, c1_boxes, undecided_boxes
+
+
+def subdivision_with_c1_cross(function_list, initial_box, neighborhood_factor=6.5, budget=None,
+                              memoize_c1_cross=False, arithmetic="float", function_ordering=None,
+                              vertex_cache=False, split="quadtree", engine="objects", precondition=False):
+    """
+    Subdivide the initial box until every box is classified as C0 or C1, allowing two curves in a
+    C1 box when the C1-cross test holds on its neighborhood.
+
+    Args:
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        initial_box (PVBox): The domain.
+        neighborhood_factor (float): How many box widths the C1-cross neighborhood extends on each side.
+        budget (SubdivisionBudget): Optional limits on the run.
+        memoize_c1_cross (bool): Reuse C1-cross certificates proven on enlarged neighborhoods of
+                                 parent cells, see `C1CrossCache`.
+        arithmetic (str or ArithmeticPolicy): "float", "adaptive" or "exact", see `ArithmeticPolicy`.
+        function_ordering (FunctionOrdering or bool): Test the functions in a learned order, see
+                                                      `FunctionOrdering`. True uses a new ordering; pass an
+                                                      instance to read its counters after the run.
+        vertex_cache (VertexCache or bool): Screen the C0 predicate with the signs of the functions at box
+                                            corners and midpoints, see `VertexCache`. True uses a new cache;
+                                            pass an instance to read its counters after the run.
+                                            Off by default: the cache holds a sign per function and
+                                            sample point, up to `VertexCache.max_entries`.
+        split (str): "quadtree" splits undecided boxes into four quadrants; "binary" cuts them in two
+                     across one axis, chosen from their aspect ratio and the gradients of the functions,
+                     see `split_axis`.
+        engine (str): "objects" classifies one box at a time, see `run_subdivision`; "frontier" classifies a
+                      whole level at a time with batch kernels and returns the same boxes, see
+                      `frontier_subdivision`. The frontier engine supports float arithmetic and quadtree
+                      splits only, without function ordering or C1-cross memoization, and does not update
+                      the counters of a VertexCache instance.
+        precondition (bool): Map the initial box onto [-1, 1]^2 and the functions with it, run there and map
+                             the boxes back, see `preconditioned_subdivision`. The returned boxes carry no
+                             parent or children links.
 
-    return c0_boxes, c1_boxes
+    Returns:
+        tuple: The c0 boxes and the c1 boxes. If a budget is given, the boxes it left undecided are
+        returned as a third list.
+    """
+    arithmetic = arithmetic_policy(arithmetic)
+    if precondition:
+        return preconditioned_subdivision(subdivision_with_c1_cross, function_list, initial_box, budget,
+                                          exact=arithmetic is not None, neighborhood_factor=neighborhood_factor,
+                                          memoize_c1_cross=memoize_c1_cross, arithmetic=arithmetic,
+                                          function_ordering=function_ordering, vertex_cache=vertex_cache,
+                                          split=split, engine=engine)
+    if engine == "frontier":
+        _check_frontier_options(arithmetic, function_ordering, split)
+        if memoize_c1_cross:
+            raise ValueError("The frontier engine does not memoize C1-cross certificates.")
+        c0_boxes, c1_boxes, undecided_boxes = frontier_subdivision(
+            function_list, initial_box, with_c1_cross=True, neighborhood_factor=neighborhood_factor, budget=budget,
+            screen=bool(vertex_cache))
+    else:
+        _check_engine(engine)
+        c1_cross_cache = C1CrossCache(neighborhood_factor, arithmetic) if memoize_c1_cross else None
+        function_ordering = _function_ordering(function_list, function_ordering)
+        vertex_cache = _vertex_cache(arithmetic, vertex_cache)
+        c0_boxes, c1_boxes, undecided_boxes = run_subdivision(
+            [initial_box],
+            lambda box: classify_box_with_c1_cross(function_list, box, neighborhood_factor, c1_cross_cache,
+                                                   arithmetic, function_ordering, vertex_cache),
+            budget, box_splitter(function_list, split, arithmetic))
+    if budget is None:
+        return c0_boxes, c1_boxes
+    return c0_boxes, c1_boxes, undecided_boxes
@@ -0,0 +1,113 @@
+import math
+from collections import deque
+
+# Offsets of the four edge neighbors of a cell: right, top, left, bottom
+_DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+def _dyadic_level(domain_width, box_width):
+    level = round(math.log2(domain_width / box_width))
+    if domain_width / 2 ** level != box_width:
+        raise ValueError("Balancing requires the leaves of a subdivision of the initial box.")
+    return level
+
+
+def quadtree_cell(initial_box, box):
+    """
+    Locate a box of a subdivision in the quadtree of the initial box.
+
+    Parameters:
+        initial_box (Box): The root of the subdivision.
+        box (Box): A box obtained by repeatedly subdividing the initial box.
+
+    Returns:
+        tuple[int, int, int]: The level of the box and its column and row among the 2^level x 2^level
+        cells of that level.
+    """
+    x_level = _dyadic_level(initial_box.x_interval.width(), box.x_interval.width())
+    y_level = _dyadic_level(initial_box.y_interval.width(), box.y_interval.width())
+    if x_level != y_level:
+        raise ValueError("Balancing requires boxes obtained by splitting into four quadrants.")
+    column = round((box.x_interval.lower_bound - initial_box.x_interval.lower_bound) / box.x_interval.width())
+    row = round((box.y_interval.lower_bound - initial_box.y_interval.lower_bound) / box.y_interval.width())
+    return x_level, column, row
+
+
+def _inherit_flags(parent, children):
+    """
+    Pass the predicate flags of a box on to its children.
+
+    A box without curves has sub-boxes without curves, the gradient of a C1 box is nonzero on every
+    sub-box, and the C1-cross neighborhood of a child lies inside the neighborhood of its parent, so
+    all three flags stay valid.
+    """
+    for child in children:
+        child.C0_predicate = getattr(parent, "C0_predicate", False)
+        child.C1_predicate = getattr(parent, "C1_predicate", False)
+        child.C1Prime = getattr(parent, "C1Prime", False)
+
+
+def balance_subdivision(initial_box, result):
+    """
+    Enforce the 2:1 condition on the output of a subdivision driver: boxes sharing a side differ by at
+    most one level.
+
+    Leaves are kept in a dictionary keyed by (level, column, row). The leaf containing a cell is found
+    by shifting the cell indices to coarser levels, and a work queue revisits only boxes next to a
+    split, so the pass runs in O(n * depth) time for n boxes. Boxes split for balancing are marked
+    `balanced` and their children inherit the predicate flags of the split box.
+
+    Parameters:
+        initial_box (Box): The root of the subdivision.
+        result (tuple[list[PVBox], ...]): The c0 boxes, the c1 boxes and optionally the undecided boxes.
+
+    Returns:
+        tuple[list[PVBox], ...]: The balanced lists, in the same shape as `result`. A split box is
+        replaced by its descendants at its position.
+    """
+    cells = {}
+    for box_list in result:
+        for box in box_list:
+            cells[quadtree_cell(initial_box, box)] = box
+
+    def containing_leaf(level, column, row):
+        for coarser_level in range(level, -1, -1):
+            shift = level - coarser_level
+            leaf = cells.get((coarser_level, column >> shift, row >> shift))
+            if leaf is not None:
+                return coarser_level, leaf
+        return None, None
+
+    split_children = {}
+
+    # Finer boxes impose the strongest conditions, so visit them first
+    queue = deque(sorted(cells, reverse=True))
+    while queue:
+        level, column, row = queue.popleft()
+        if (level, column, row) not in cells:
+            continue
+        for column_offset, row_offset in _DIRECTIONS:
+            neighbor_column, neighbor_row = column + column_offset, row + row_offset
+            if not (0 <= neighbor_column < 2 ** level and 0 <= neighbor_row < 2 ** level):
+                continue
+            neighbor_level, neighbor = containing_leaf(level, neighbor_column, neighbor_row)
+            while neighbor is not None and neighbor_level < level - 1:
+                shift = level - neighbor_level
+                del cells[(neighbor_level, neighbor_column >> shift, neighbor_row >> shift)]
+                children = neighbor.subdivide()
+                split_children[id(neighbor)] = children
+                neighbor.balanced = True
+                _inherit_flags(neighbor, children)
+                for child in children:
+                    child_cell = quadtree_cell(initial_box, child)
+                    cells[child_cell] = child
+                    queue.append(child_cell)
+                neighbor_level, neighbor = containing_leaf(level, neighbor_column, neighbor_row)
+
+    def final_leaves(box):
+        children = split_children.get(id(box))
+        if children is None:
+            return [box]
+        return [leaf for child in children for leaf in final_leaves(child)]
+
+    return tuple([leaf for box in box_list for leaf in final_leaves(box)] for box_list in result)
@@ -0,0 +1,133 @@
+import math
+import multiprocessing
+
+from polynomial_library.weyl_inner_product import batch_weyl_norms
+from simultaneous_approximation_cache import DRIVERS
+from simultaneous_approximation_serialization import pack_boxes, unpack_boxes
+
+# A job whose condition estimate is infinite is scheduled as if it were this badly conditioned
+MAX_CONDITION_ESTIMATE = 1e12
+
+
+class SubdivisionJob:
+    """
+    One subdivision run of a batch.
+
+    Attributes:
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        initial_box (Box): The domain of the run.
+        options (dict): The driver, as "driver" ("with_c1_cross" by default or "without_c1_cross"), and the
+                        keyword arguments passed on to it, such as "budget" or "arithmetic".
+    """
+
+    def __init__(self, function_list, initial_box, options=None):
+        self.function_list = function_list
+        self.initial_box = initial_box
+        self.options = dict(options or {})
+        driver = self.options.get("driver", "with_c1_cross")
+        if driver not in DRIVERS:
+            raise ValueError(f"Unknown subdivision driver: {driver!r}")
+
+
+def _as_job(job):
+    return job if isinstance(job, SubdivisionJob) else SubdivisionJob(*job)
+
+
+def estimate_job_costs(jobs):
+    """
+    Estimate the relative cost of subdivision jobs, for scheduling.
+
+    The estimate grows with the number of functions and pairs, their degrees, and the logarithm of the
+    Weyl condition estimate of the system, which tracks how deep the subdivision has to go. Weyl norms
+    are computed once per distinct polynomial and pair across the batch.
+
+    Parameters:
+        jobs (list[SubdivisionJob]): The jobs to estimate.
+
+    Returns:
+        list[float]: The estimated cost of each job.
+    """
+    costs = []
+    for job, norms in zip(jobs, batch_weyl_norms(job.function_list for job in jobs)):
+        condition = min(norms.condition_estimate(), MAX_CONDITION_ESTIMATE)
+        # Every enclosure costs about degree^2 operations, and every box tests all functions and pairs
+        work_per_box = sum((degree + 1) ** 2 for degree in norms.degrees) * (1 + len(norms.cross_norms))
+        costs.append(work_per_box * (1 + math.log1p(condition)) ** 2)
+    return costs
+
+
+def run_job(indexed_job):
+    """
+    Run one job and return its result in the compact binary format, in a worker process or in-process.
+
+    Args:
+        indexed_job (tuple[int, SubdivisionJob]): The index of the job in its batch, and the job.
+
+    Returns:
+        tuple[int, int, bytes]: The index, the number of box lists returned by the driver, and the lists
+        packed by `pack_boxes`.
+    """
+    index, job = indexed_job
+    options = dict(job.options)
+    driver = DRIVERS[options.pop("driver", "with_c1_cross")]
+    result = driver(job.function_list, job.initial_box, **options)
+    return index, len(result), pack_boxes(*result)
+
+
+def _decode(result_size, data):
+    return unpack_boxes(data)[:result_size]
+
+
+def run_batch(jobs, processes=None, pool=None):
+    """
+    Run many subdivision jobs across a pool of worker processes, yielding each result as it finishes.
+
+    Jobs are started in order of decreasing estimated cost, so that long jobs do not end up alone at
+    the end of the batch. Each worker keeps its compiled polynomials between jobs, so jobs sharing
+    polynomials share their compiled forms and derivatives. Results travel between processes in the
+    compact binary result format.
+
+    Parameters:
+        jobs (list[SubdivisionJob | tuple]): The jobs, as SubdivisionJob objects or
+                                             (function_list, initial_box, options) tuples.
+        processes (int): The number of worker processes of a new pool; the number of CPUs by default.
+                         With 0 the jobs run one after another in the calling process.
+        pool (multiprocessing.pool.Pool): An existing pool to run the jobs on instead of a new one.
+
+    Yields:
+        tuple[int, tuple[list[PVBox], ...]]: The index of a job in `jobs` and its result, shaped like the
+        return value of the driver. Boxes carry their predicate flags but no parent or children links.
+    """
+    jobs = [_as_job(job) for job in jobs]
+    costs = estimate_job_costs(jobs)
+    order = sorted(range(len(jobs)), key=lambda index: -costs[index])
+    indexed_jobs = [(index, jobs[index]) for index in order]
+
+    if pool is None and processes == 0:
+        for indexed_job in indexed_jobs:
+            index, result_size, data = run_job(indexed_job)
+            yield index, _decode(result_size, data)
+        return
+
+    own_pool = pool is None
+    if own_pool:
+        pool = multiprocessing.Pool(processes)
+    try:
+        for index, result_size, data in pool.imap_unordered(run_job, indexed_jobs):
+            yield index, _decode(result_size, data)
+    finally:
+        if own_pool:
+            pool.terminate()
+            pool.join()
+
+
+def run_batch_ordered(jobs, processes=None, pool=None):
+    """
+    Run many subdivision jobs like `run_batch`, but return all results in the order of the jobs.
+
+    :return: A list with the result of each job.
+    """
+    results = [None] * len(jobs)
+    for index, result in run_batch(jobs, processes, pool):
+        results[index] = result
+    return results
@@ -0,0 +1,229 @@
+import hashlib
+import os
+import tempfile
+
+from simultaneous_approximation import subdivision_with_c1_cross, subdivision_without_c1_cross
+from simultaneous_approximation_serialization import pack_boxes, unpack_boxes
+from simultaneous_approximation_splitting import SPLIT_MODES
+from simultaneous_approximation_tools import ARITHMETIC_MODES
+
+# Part of every cache key. Bump it whenever a change to the predicates, enclosures or drivers can change
+# the boxes a run returns, so that results stored by earlier versions are no longer served.
+SUBDIVISION_ALGORITHM_VERSION = 2
+
+DRIVERS = {
+    "with_c1_cross": subdivision_with_c1_cross,
+    "without_c1_cross": subdivision_without_c1_cross,
+}
+
+
+def _canonical_number(value):
+    """
+    Return a canonical text form of a number, so that equal values such as 1, 1.0 and
+    Fraction(1) produce the same cache key.
+    """
+    try:
+        as_float = float(value)
+    except (TypeError, ValueError, OverflowError):
+        return repr(value)
+    if as_float == value:
+        return as_float.hex()
+    return repr(value)
+
+
+def canonical_polynomial_key(function):
+    """
+    Return a canonical string for the coefficients of a bivariate polynomial.
+
+    Parameters:
+        function (BivariatePolynomial): The polynomial to describe.
+
+    Returns:
+        str: The nonzero terms of the polynomial sorted by monomial, as "i,j:coefficient" items.
+    """
+    terms = sorted((monomial, coefficient) for monomial, coefficient in function.coefficients.items()
+                   if coefficient != 0)
+    return ";".join(f"{x_power},{y_power}:{_canonical_number(coefficient)}"
+                    for (x_power, y_power), coefficient in terms)
+
+
+def subdivision_cache_key(function_list, initial_box, driver="with_c1_cross", neighborhood_factor=6.5,
+                          arithmetic="float", split="quadtree", precondition=False):
+    """
+    Compute the content address of a subdivision run.
+
+    Parameters:
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        initial_box (Box): The domain of the run.
+        driver (str): Either "with_c1_cross" or "without_c1_cross".
+        neighborhood_factor (float): The C1-cross neighborhood factor. Ignored by the driver without the
+                                     C1-cross test.
+        arithmetic (str): The arithmetic mode of the run, one of ARITHMETIC_MODES.
+        split (str): The split mode of the run, one of SPLIT_MODES.
+        precondition (bool): Whether the run maps the domain onto [-1, 1]^2, see `preconditioned_subdivision`.
+
+    Returns:
+        str: A hexadecimal SHA-256 digest identifying the run and `SUBDIVISION_ALGORITHM_VERSION`.
+    """
+    if driver not in DRIVERS:
+        raise ValueError(f"Unknown subdivision driver: {driver!r}")
+    if driver == "without_c1_cross":
+        neighborhood_factor = None
+    parts = [
+        f"version={SUBDIVISION_ALGORITHM_VERSION}",
+        "driver=" + driver,
+        "arithmetic=" + arithmetic,
+        "neighborhood=" + ("none" if neighborhood_factor is None else _canonical_number(neighborhood_factor)),
+        "box=" + ",".join(_canonical_number(bound) for bound in (initial_box.x_interval.lower_bound,
+                                                                 initial_box.x_interval.upper_bound,
+                                                                 initial_box.y_interval.lower_bound,
+                                                                 initial_box.y_interval.upper_bound)),
+    ]
+    if split != "quadtree":
+        if split not in SPLIT_MODES:
+            raise ValueError(f"Unknown split mode: {split!r}")
+        parts.append("split=" + split)
+    if precondition:
+        parts.append("precondition")
+    parts.extend("f=" + canonical_polynomial_key(function) for function in function_list)
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class SubdivisionCache:
+    """
+    A size-bounded, least-recently-used cache of subdivision results on local disk.
+
+    Each entry is one file named by its content address and holding the result in the compact
+    binary format. The modification time of an entry is refreshed on every hit, and the least
+    recently used entries are removed once the total size exceeds `max_bytes`.
+    """
+
+    SUFFIX = ".sapv"
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._total_bytes = sum(size for _, _, size in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def _entries(self):
+        """ Yield (mtime, path, size) for every entry of the cache. """
+        with os.scandir(self.directory) as iterator:
+            for entry in iterator:
+                if entry.is_file() and entry.name.endswith(self.SUFFIX):
+                    stat = entry.stat()
+                    yield stat.st_mtime_ns, entry.path, stat.st_size
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def __len__(self):
+        return sum(1 for _ in self._entries())
+
+    def get(self, key):
+        """
+        Look up a stored result.
+
+        :param key: The content address of the run.
+        :return: The encoded result, or None if the key is not cached.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """
+        Store an encoded result and evict least recently used entries if the cache is too large.
+
+        :param key: The content address of the run.
+        :param data: The encoded result.
+        """
+        path = self._path(key)
+        try:
+            self._total_bytes -= os.path.getsize(path)
+        except FileNotFoundError:
+            pass
+        # Write to a temporary file first so that concurrent readers never see a partial entry
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(data)
+        os.replace(temporary_path, path)
+        self._total_bytes += len(data)
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        self._total_bytes = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._total_bytes -= size
+
+    def clear(self):
+        """ Remove every entry of the cache. """
+        for _, path, _ in list(self._entries()):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._total_bytes = 0
+
+
+def cached_subdivision(function_list, initial_box, cache, driver="with_c1_cross", neighborhood_factor=6.5,
+                       arithmetic="float", split="quadtree", precondition=False):
+    """
+    Run a subdivision driver, returning the stored result instead if the same run was cached before.
+
+    Results are returned as fresh `PVBox` objects with their predicate flags restored. Boxes restored
+    from the cache carry no parent or children links.
+
+    Parameters:
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        initial_box (Box): The domain of the run.
+        cache (SubdivisionCache): The cache to consult and fill.
+        driver (str): Either "with_c1_cross" or "without_c1_cross".
+        neighborhood_factor (float): The C1-cross neighborhood factor.
+        arithmetic (str): The arithmetic mode of the run, one of ARITHMETIC_MODES.
+        split (str): The split mode of the run, one of SPLIT_MODES.
+        precondition (bool): Run on the domain mapped onto [-1, 1]^2, see `preconditioned_subdivision`.
+
+    Returns:
+        tuple[list[PVBox], list[PVBox]]: The c0 boxes and the c1 boxes.
+    """
+    if arithmetic not in ARITHMETIC_MODES:
+        raise ValueError(f"Unknown arithmetic mode: {arithmetic!r}")
+    key = subdivision_cache_key(function_list, initial_box, driver, neighborhood_factor, arithmetic, split,
+                                precondition)
+    data = cache.get(key)
+    if data is None:
+        if driver == "with_c1_cross":
+            c0_boxes, c1_boxes = subdivision_with_c1_cross(function_list, initial_box, neighborhood_factor,
+                                                           arithmetic=arithmetic, split=split,
+                                                           precondition=precondition)
+        else:
+            c0_boxes, c1_boxes = subdivision_without_c1_cross(function_list, initial_box, arithmetic=arithmetic,
+                                                              split=split, precondition=precondition)
+        data = pack_boxes(c0_boxes, c1_boxes)
+        cache.put(key, data)
+    c0_boxes, c1_boxes, _ = unpack_boxes(data)
+    return c0_boxes, c1_boxes
@@ -0,0 +1,293 @@
+from fractions import Fraction
+
+from simultaneous_approximation_kernels import _univariate_enclosure
+
+HORIZONTAL = "horizontal"
+VERTICAL = "vertical"
+
+
+def _trim(polynomial):
+    """ Drop zero leading coefficients; coefficients are stored from the constant term up. """
+    while polynomial and polynomial[-1] == 0:
+        polynomial.pop()
+    return polynomial
+
+
+def _derivative(polynomial):
+    return [k * polynomial[k] for k in range(1, len(polynomial))]
+
+
+def _evaluate(polynomial, t):
+    value = 0
+    for coefficient in reversed(polynomial):
+        value = value * t + coefficient
+    return value
+
+
+def _multiply(polynomial1, polynomial2):
+    product = [Fraction(0)] * (len(polynomial1) + len(polynomial2) - 1)
+    for i, coefficient1 in enumerate(polynomial1):
+        for j, coefficient2 in enumerate(polynomial2):
+            product[i + j] += coefficient1 * coefficient2
+    return product
+
+
+def _subtract(polynomial1, polynomial2):
+    difference = [Fraction(0)] * max(len(polynomial1), len(polynomial2))
+    for i, coefficient in enumerate(polynomial1):
+        difference[i] += coefficient
+    for i, coefficient in enumerate(polynomial2):
+        difference[i] -= coefficient
+    return _trim(difference)
+
+
+def _divide(dividend, divisor):
+    """ Divide two polynomials with nonzero divisor, returning the quotient and the remainder. """
+    remainder = list(dividend)
+    quotient = [Fraction(0)] * max(len(dividend) - len(divisor) + 1, 1)
+    while len(remainder) >= len(divisor):
+        factor = remainder[-1] / divisor[-1]
+        shift = len(remainder) - len(divisor)
+        quotient[shift] = factor
+        for k, coefficient in enumerate(divisor):
+            remainder[shift + k] -= factor * coefficient
+        remainder.pop()
+        _trim(remainder)
+    return _trim(quotient), remainder
+
+
+def _gcd(polynomial1, polynomial2):
+    """ The monic greatest common divisor of two polynomials, not both zero. """
+    while polynomial2:
+        polynomial1, polynomial2 = polynomial2, _divide(polynomial1, polynomial2)[1]
+    leading = polynomial1[-1]
+    return [coefficient / leading for coefficient in polynomial1]
+
+
+def odd_multiplicity_part(polynomial):
+    """
+    Compute the product of the distinct factors of odd multiplicity of a univariate polynomial, with
+    Yun's square-free factorization.
+
+    The result has a simple root at every root where the polynomial changes sign, and no other roots.
+
+    :param polynomial: The nonzero exact coefficients, from the constant term up.
+    :return: The coefficients of the product, from the constant term up.
+    """
+    derivative = _derivative(polynomial)
+    if not derivative:
+        return [Fraction(1)]
+    common = _gcd(polynomial, derivative)
+    b = _divide(polynomial, common)[0]
+    d = _subtract(_divide(derivative, common)[0], _derivative(b))
+    result = [Fraction(1)]
+    multiplicity = 1
+    while len(b) > 1:
+        factor = _gcd(b, d)
+        if multiplicity % 2 == 1:
+            result = _multiply(result, factor)
+        b = _divide(b, factor)[0]
+        d = _subtract(_divide(d, factor)[0], _derivative(b))
+        multiplicity += 1
+    return result
+
+
+def sturm_sequence(polynomial):
+    """
+    Compute the Sturm sequence of a univariate polynomial.
+
+    :param polynomial: The exact coefficients, from the constant term up.
+    :return: A list of polynomials, starting with the polynomial and its derivative.
+    """
+    sequence = [polynomial, _derivative(polynomial)]
+    while sequence[-1]:
+        remainder = _divide(sequence[-2], sequence[-1])[1]
+        sequence.append([-coefficient for coefficient in remainder])
+    sequence.pop()
+    return sequence
+
+
+def _sign_variations(sequence, t):
+    variations = 0
+    previous = 0
+    for polynomial in sequence:
+        value = _evaluate(polynomial, t)
+        if value != 0:
+            if previous * value < 0:
+                variations += 1
+            previous = value
+    return variations
+
+
+class UnivariateRestriction:
+    """
+    A polynomial of a system restricted to an axis-parallel line, as a univariate polynomial in the
+    free coordinate, with exact rational coefficients.
+
+    Crossings are the roots where the restriction changes sign. They are counted exactly with the
+    Sturm sequence of the odd-multiplicity part of the restriction, so tangencies and other roots of
+    even multiplicity are not crossings. A segment whose exact interval enclosure excludes zero is
+    discarded before any Sturm sequence is built.
+    """
+
+    def __init__(self, coefficients):
+        self.coefficients = _trim(list(coefficients))
+        self._sturm = None
+
+    def evaluate(self, t):
+        """
+        Evaluate the restriction exactly.
+
+        :param t: The free coordinate.
+        :return: The value, as a Fraction.
+        """
+        return _evaluate(self.coefficients, Fraction(t))
+
+    @property
+    def sturm(self):
+        """ The Sturm sequence of the odd-multiplicity part, built on first use. """
+        if self._sturm is None:
+            self._sturm = sturm_sequence(odd_multiplicity_part(self.coefficients)) if self.coefficients else []
+        return self._sturm
+
+    def _excludes_zero(self, lower, upper):
+        degree = len(self.coefficients) - 1
+        enclosure_lower, enclosure_upper = _univariate_enclosure(list(self.coefficients), degree, lower, upper)
+        return not enclosure_lower <= 0 <= enclosure_upper
+
+    def count_crossings(self, lower, upper):
+        """
+        Count the crossings strictly between two points of the line where the restriction is nonzero.
+
+        :param lower: The lower end of the segment.
+        :param upper: The upper end of the segment.
+        :return: The number of distinct roots of odd multiplicity in (lower, upper).
+        """
+        lower, upper = Fraction(lower), Fraction(upper)
+        if len(self.coefficients) < 2 or self._excludes_zero(lower, upper):
+            return 0
+        if len(self.sturm) < 2:
+            return 0
+        return _sign_variations(self.sturm, lower) - _sign_variations(self.sturm, upper)
+
+    def crossings(self, lower, upper):
+        """
+        Locate the crossings strictly between two points of the line where the restriction is nonzero.
+
+        Every crossing is isolated exactly by bisection on Sturm counts, and then located in floating
+        point by bisection on the sign of the odd-multiplicity part.
+
+        :param lower: The lower end of the segment.
+        :param upper: The upper end of the segment.
+        :return: The sorted float coordinates of the crossings.
+        """
+        if self.count_crossings(lower, upper) == 0:
+            return []
+        sequence = self.sturm
+        squarefree = sequence[0]
+        stack = [(Fraction(lower), Fraction(upper))]
+        roots = []
+        while stack:
+            a, b = stack.pop()
+            count = _sign_variations(sequence, a) - _sign_variations(sequence, b)
+            if count == 0:
+                continue
+            if count == 1:
+                roots.append(self._locate(squarefree, a, b))
+                continue
+            middle = (a + b) / 2
+            while _evaluate(squarefree, middle) == 0:
+                middle = (a + middle) / 2
+            stack.append((a, middle))
+            stack.append((middle, b))
+        return sorted(roots)
+
+    @staticmethod
+    def _locate(squarefree, lower, upper):
+        """ Narrow down the single sign change of a polynomial between two points. """
+        lower_sign = _evaluate(squarefree, lower) > 0
+        float_coefficients = [float(coefficient) for coefficient in squarefree]
+        lower, upper = float(lower), float(upper)
+        while True:
+            middle = (lower + upper) / 2
+            if not lower < middle < upper:
+                return middle
+            if (_evaluate(float_coefficients, middle) > 0) == lower_sign:
+                lower = middle
+            else:
+                upper = middle
+
+
+def restrict(function, direction, coordinate):
+    """
+    Restrict a bivariate polynomial to an axis-parallel line.
+
+    :param function: A BivariatePolynomial.
+    :param direction: HORIZONTAL for the line y = coordinate, VERTICAL for the line x = coordinate.
+    :param coordinate: The fixed coordinate of the line.
+    :return: A UnivariateRestriction in x for a horizontal line, in y for a vertical line.
+    """
+    fixed = Fraction(coordinate)
+    coefficients = [Fraction(0)] * (max(function.deg, 0) + 1)
+    for (x_power, y_power), coefficient in function.coefficients.items():
+        if direction == HORIZONTAL:
+            coefficients[x_power] += Fraction(coefficient) * fixed ** y_power
+        else:
+            coefficients[y_power] += Fraction(coefficient) * fixed ** x_power
+    return UnivariateRestriction(coefficients)
+
+
+class EdgeRestrictions:
+    """
+    The restrictions of the functions of a system to the lines carrying box edges, built once per line
+    and shared by all boxes with an edge on that line.
+
+    Attributes:
+        restrictions (int): The restrictions built.
+        hits (int): The restrictions found in the cache.
+    """
+
+    def __init__(self, function_list):
+        self.function_list = function_list
+        self._restrictions = {}
+        self.restrictions = 0
+        self.hits = 0
+
+    def restriction(self, index, direction, coordinate):
+        """
+        Return the restriction of a function of the system to a line.
+
+        :param index: The index of the function in the system.
+        :param direction: HORIZONTAL or VERTICAL.
+        :param coordinate: The fixed coordinate of the line.
+        :return: A UnivariateRestriction.
+        """
+        key = (index, direction, coordinate)
+        restriction = self._restrictions.get(key)
+        if restriction is None:
+            restriction = restrict(self.function_list[index], direction, coordinate)
+            self._restrictions[key] = restriction
+            self.restrictions += 1
+        else:
+            self.hits += 1
+        return restriction
+
+    def segment_crossings(self, index, point1, point2):
+        """
+        Locate the crossings of the curve of a function with an axis-parallel segment, strictly between
+        its end points, which must not lie on the curve.
+
+        :param index: The index of the function in the system.
+        :param point1: The first end point (x, y).
+        :param point2: The second end point (x, y).
+        :return: The crossing points, ordered from point1 to point2.
+        """
+        if point1[1] == point2[1]:
+            restriction = self.restriction(index, HORIZONTAL, point1[1])
+            coordinates = restriction.crossings(min(point1[0], point2[0]), max(point1[0], point2[0]))
+            points = [(x, point1[1]) for x in coordinates]
+        else:
+            restriction = self.restriction(index, VERTICAL, point1[0])
+            coordinates = restriction.crossings(min(point1[1], point2[1]), max(point1[1], point2[1]))
+            points = [(point1[0], y) for y in coordinates]
+        return points if point1 <= point2 else points[::-1]
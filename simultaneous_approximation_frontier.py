@@ -0,0 +1,183 @@
+"""
+A level-synchronous engine for the subdivision drivers.
+
+The object-based engine, `run_subdivision`, takes one `PVBox` at a time from a queue, classifies it and
+queues its children. This engine holds a whole depth level of the quadtree as four arrays of bounds. It
+classifies the level with one call of a batch kernel per function and predicate, see the batch kernels in
+`simultaneous_approximation_kernels`, and builds the next level from the boxes left undecided in one more
+call. With the Numba backend, the Python-level work of a run therefore grows with its depth and the size
+of the system rather than with its number of boxes; only the returned leaves are built as `PVBox`
+objects.
+
+The batch kernels repeat the decisions of the predicates box by box, and a level lists the children of
+its boxes in the order in which the breadth-first queue meets them, so both engines return the same
+boxes, with the same flags, in the same order.
+"""
+from fractions import Fraction
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from simultaneous_approximation_kernels import (LEVEL_C0, LEVEL_C1, LEVEL_C1_CROSS, LEVEL_UNDECIDED, batch_array,
+                                                batch_kernels, compiled_polynomial)
+from simultaneous_approximation_tools import PVBox
+
+
+def _family(compiled):
+    """ The coefficients and degrees of a compiled polynomial and its partial derivatives, for the batch kernels. """
+    members = (compiled, compiled.dx, compiled.dy)
+    return tuple(member.coefficients for member in members), tuple(member.degree for member in members)
+
+
+def _gradient_family(compiled):
+    """ The families of both partial derivatives of a compiled polynomial, joined. """
+    dx_coefficients, dx_degrees = _family(compiled.dx)
+    dy_coefficients, dy_degrees = _family(compiled.dy)
+    return dx_coefficients + dy_coefficients, dx_degrees + dy_degrees
+
+
+def _as_list(array):
+    """ Turn a batch array into a list of Python numbers. """
+    return array.tolist() if hasattr(array, "tolist") else array
+
+
+class Level:
+    """
+    The boxes of one depth level, as arrays of bounds.
+
+    Attributes:
+        x_lower, x_upper, y_lower, y_upper: The bounds of the boxes, one entry per box.
+        depth (int): The depth of the boxes below the initial box.
+    """
+
+    def __init__(self, x_lower, x_upper, y_lower, y_upper, depth):
+        self.x_lower = x_lower
+        self.x_upper = x_upper
+        self.y_lower = y_lower
+        self.y_upper = y_upper
+        self.depth = depth
+
+    def __len__(self):
+        return len(self.x_lower)
+
+    @classmethod
+    def from_box(cls, box, backend):
+        """ A level holding a single box. """
+        bounds = []
+        for value in (box.x_interval.lower_bound, box.x_interval.upper_bound,
+                      box.y_interval.lower_bound, box.y_interval.upper_bound):
+            array = batch_array(backend, 1)
+            array[0] = value
+            bounds.append(array)
+        return cls(*bounds, box.depth)
+
+    def bounds(self):
+        return self.x_lower, self.x_upper, self.y_lower, self.y_upper
+
+    def boxes(self, status, selected):
+        """
+        Build the boxes of the level whose status is among the selected ones, with their predicate flags.
+
+        :return: A list of (status, PVBox) pairs, in level order.
+        """
+        boxes = []
+        for box_status, x_lower, x_upper, y_lower, y_upper in zip(_as_list(status), *map(_as_list, self.bounds())):
+            if box_status not in selected:
+                continue
+            box = PVBox(Interval(x_lower, x_upper), Interval(y_lower, y_upper))
+            box.depth = self.depth
+            if box_status == LEVEL_C0:
+                box.C0_predicate = True
+            elif box_status != LEVEL_UNDECIDED:
+                box.C1_predicate = True
+                box.C1Prime = box_status == LEVEL_C1_CROSS
+            boxes.append((box_status, box))
+        return boxes
+
+
+def frontier_subdivision(function_list, initial_box, with_c1_cross=True, neighborhood_factor=6.5, budget=None,
+                         screen=True):
+    """
+    Subdivide the initial box level by level, classifying every level with the batch kernels.
+
+    The boxes are classified like `classify_box_with_c1_cross`, or like `classify_box_without_c1_cross`, in
+    float arithmetic. The returned boxes carry no parent or children links.
+
+    Args:
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        initial_box (PVBox): The domain.
+        with_c1_cross (bool): Allow two curves in a C1 box when the C1-cross test holds on its neighborhood.
+        neighborhood_factor (float): How many box widths the C1-cross neighborhood extends on each side.
+        budget (SubdivisionBudget): Optional limits on the run. The time limit is checked once per level.
+        screen (bool): Screen the C0 predicate with the signs at box corners and midpoints, like a
+                       `VertexCache`.
+
+    Returns:
+        tuple[list[PVBox], list[PVBox], list[PVBox]]: The c0 boxes, the c1 boxes and the boxes left
+        undecided by the budget.
+    """
+    # Boxes with Fraction bounds are evaluated exactly with the pure-Python kernels, as by the predicates
+    backend = "python" if isinstance(initial_box.x_interval.lower_bound, Fraction) else None
+    compiled_functions = [compiled_polynomial(function, backend) for function in function_list]
+    batch = batch_kernels(backend)
+    backend = batch.backend
+    families = [_family(compiled) for compiled in compiled_functions]
+    gradient_families = [_gradient_family(compiled) for compiled in compiled_functions]
+    n = len(function_list)
+
+    min_width = -float("inf") if budget is None or budget.min_width is None else budget.min_width
+    c0_boxes, c1_boxes, undecided_boxes = [], [], []
+    level = Level.from_box(initial_box, backend)
+    if budget is not None:
+        budget.start(1)
+
+    while len(level):
+        m = len(level)
+        status = batch_array(backend, m, "int")
+        if budget is not None and budget.expired():
+            status = [LEVEL_UNDECIDED] * m
+            undecided_boxes.extend(box for _, box in level.boxes(status, (LEVEL_UNDECIDED,)))
+            break
+
+        c0 = batch_array(backend, m, "bool", rows=n)
+        for i, (family, degrees) in enumerate(families):
+            batch.batch_c0_predicate(family, degrees, screen, *level.bounds(), c0[i])
+        c1 = batch_array(backend, m, "bool", rows=n)
+        needed = batch_array(backend, m, "bool")
+        for i, (family, degrees) in enumerate(gradient_families):
+            batch.batch_c1_needed(c0, i, with_c1_cross, needed)
+            batch.batch_c1_predicate(family, degrees, *level.bounds(), needed, c1[i])
+
+        if with_c1_cross:
+            first = batch_array(backend, m, "int")
+            second = batch_array(backend, m, "int")
+            batch.batch_classify_with_c1_cross(c0, c1, status, first, second)
+            for i in range(n):
+                for j in range(i + 1, n):
+                    family = gradient_families[i][0] + gradient_families[j][0]
+                    degrees = gradient_families[i][1] + gradient_families[j][1]
+                    batch.batch_c1_cross_predicate(family, degrees, neighborhood_factor, *level.bounds(),
+                                                   status, first, second, i, j)
+        else:
+            batch.batch_classify_without_c1_cross(c0, c1, status)
+
+        if budget is not None and budget.max_depth is not None and level.depth >= budget.max_depth:
+            box_allowance = 0
+        elif budget is not None and budget.max_boxes is not None:
+            box_allowance = budget.max_boxes - budget.box_count
+        else:
+            box_allowance = -1
+        count = batch.batch_split_allowance(status, *level.bounds(), min_width, box_allowance)
+
+        for box_status, box in level.boxes(status, (LEVEL_C0, LEVEL_C1, LEVEL_C1_CROSS, LEVEL_UNDECIDED)):
+            if box_status == LEVEL_C0:
+                c0_boxes.append(box)
+            elif box_status == LEVEL_UNDECIDED:
+                undecided_boxes.append(box)
+            else:
+                c1_boxes.append(box)
+
+        children = [batch_array(backend, 4 * count) for _ in range(4)]
+        batch.batch_quadrants(status, *level.bounds(), *children)
+        if budget is not None:
+            budget.box_count += 4 * count
+        level = Level(*children, level.depth + 1)
+    return c0_boxes, c1_boxes, undecided_boxes
@@ -0,0 +1,167 @@
+from bisect import bisect_left
+from collections import defaultdict
+
+SIDES = ("right_side", "top_side", "left_side", "bottom_side")
+
+
+class _EdgeLine:
+    """ The edges of boxes lying on one axis-parallel line, sorted by their lower end. """
+
+    __slots__ = ("lower_ends", "edges")
+
+    def __init__(self):
+        self.lower_ends = []
+        self.edges = []
+
+    def add(self, lower, upper, box):
+        self.edges.append((lower, upper, box))
+
+    def sort(self):
+        self.edges.sort(key=lambda edge: edge[0])
+        self.lower_ends = [edge[0] for edge in self.edges]
+
+    def overlapping(self, lower, upper):
+        """ Return the edges overlapping the open segment (lower, upper), in increasing order. """
+        index = bisect_left(self.lower_ends, upper)
+        result = []
+        while index > 0:
+            index -= 1
+            edge = self.edges[index]
+            if edge[1] <= lower:
+                break
+            result.append(edge)
+        result.reverse()
+        return result
+
+
+class LeafIndex:
+    """
+    An adjacency index over the leaves of a subdivision.
+
+    Every box edge is stored on the axis-parallel line it lies on, so the neighbors across a side
+    of a box are found by a binary search on that line instead of a scan over all boxes. The index
+    only relies on the boxes being disjoint and axis aligned, so boxes of any shape and size are
+    supported. Building it takes O(n log n) time for n boxes.
+    """
+
+    def __init__(self, boxes):
+        self.boxes = list(boxes)
+        # Edges keyed by the coordinate of their line, grouped by which side of its box they are
+        self._left_edges = defaultdict(_EdgeLine)
+        self._right_edges = defaultdict(_EdgeLine)
+        self._bottom_edges = defaultdict(_EdgeLine)
+        self._top_edges = defaultdict(_EdgeLine)
+        for box in self.boxes:
+            x_lower, x_upper = box.x_interval.lower_bound, box.x_interval.upper_bound
+            y_lower, y_upper = box.y_interval.lower_bound, box.y_interval.upper_bound
+            self._left_edges[x_lower].add(y_lower, y_upper, box)
+            self._right_edges[x_upper].add(y_lower, y_upper, box)
+            self._bottom_edges[y_lower].add(x_lower, x_upper, box)
+            self._top_edges[y_upper].add(x_lower, x_upper, box)
+        for lines in (self._left_edges, self._right_edges, self._bottom_edges, self._top_edges):
+            for line in lines.values():
+                line.sort()
+
+    def _facing_edges(self, box, side):
+        """ Return the edges of other boxes facing the given side of a box. """
+        x_lower, x_upper = box.x_interval.lower_bound, box.x_interval.upper_bound
+        y_lower, y_upper = box.y_interval.lower_bound, box.y_interval.upper_bound
+        if side == "right_side":
+            line, lower, upper = self._left_edges.get(x_upper), y_lower, y_upper
+        elif side == "top_side":
+            line, lower, upper = self._bottom_edges.get(y_upper), x_lower, x_upper
+        elif side == "left_side":
+            line, lower, upper = self._right_edges.get(x_lower), y_lower, y_upper
+        elif side == "bottom_side":
+            line, lower, upper = self._top_edges.get(y_lower), x_lower, x_upper
+        else:
+            raise ValueError(f"Unknown side: {side!r}")
+        if line is None:
+            return []
+        return line.overlapping(lower, upper)
+
+    def neighbors_on_side(self, box, side):
+        """
+        Find the boxes sharing a segment of positive length with one side of a box.
+
+        :param box: A box of the index.
+        :param side: One of "right_side", "top_side", "left_side" or "bottom_side".
+        :return: The neighboring boxes, ordered by increasing coordinate along the side.
+        """
+        return [neighbor for _, _, neighbor in self._facing_edges(box, side)]
+
+    def find_neighbors(self, box):
+        """
+        Find all boxes of the index sharing a side with a box, as `Box.is_neighbor` defines it.
+
+        :param box: A box of the index.
+        :return: A list of the neighboring boxes.
+        """
+        return [neighbor for side in SIDES for neighbor in self.neighbors_on_side(box, side)]
+
+    def adjacent_pairs(self):
+        """
+        List every pair of boxes of the index sharing a segment of positive length, once.
+
+        The edges facing each other across a line are both sorted along it, so they are matched by a
+        single merge per line rather than a search per box.
+
+        :return: A list of (box, neighbor) pairs, the neighbor to the right of or above the box.
+        """
+        pairs = []
+        for facing, opposite in ((self._right_edges, self._left_edges), (self._top_edges, self._bottom_edges)):
+            for coordinate, line in facing.items():
+                opposite_line = opposite.get(coordinate)
+                if opposite_line is None:
+                    continue
+                edges, opposite_edges = line.edges, opposite_line.edges
+                i = j = 0
+                while i < len(edges) and j < len(opposite_edges):
+                    lower, upper, box = edges[i]
+                    opposite_lower, opposite_upper, neighbor = opposite_edges[j]
+                    if max(lower, opposite_lower) < min(upper, opposite_upper):
+                        pairs.append((box, neighbor))
+                    # Move past the edge that ends first; the other may overlap the next one
+                    if upper <= opposite_upper:
+                        i += 1
+                    else:
+                        j += 1
+        return pairs
+
+    def side_coordinates(self, box, side):
+        """
+        List the box corners lying on one side of a box, including the corners of smaller neighbors.
+
+        :param box: A box of the index.
+        :param side: One of "right_side", "top_side", "left_side" or "bottom_side".
+        :return: The sorted coordinates of the corners along the side (y for vertical sides, x for
+                 horizontal sides), starting and ending with the corners of the box itself.
+        """
+        if side in ("right_side", "left_side"):
+            lower, upper = box.y_interval.lower_bound, box.y_interval.upper_bound
+        else:
+            lower, upper = box.x_interval.lower_bound, box.x_interval.upper_bound
+        coordinates = {lower, upper}
+        for edge_lower, edge_upper, _ in self._facing_edges(box, side):
+            if lower < edge_lower:
+                coordinates.add(edge_lower)
+            if edge_upper < upper:
+                coordinates.add(edge_upper)
+        return sorted(coordinates)
+
+    def boundary_vertices(self, box):
+        """
+        List the vertices on the boundary of a box in counter-clockwise order, starting from the
+        bottom-left corner. Corners of smaller neighbors lying on the sides of the box are included.
+
+        :param box: A box of the index.
+        :return: A list of (x, y) points; the first point is not repeated at the end.
+        """
+        x_lower, x_upper = box.x_interval.lower_bound, box.x_interval.upper_bound
+        y_lower, y_upper = box.y_interval.lower_bound, box.y_interval.upper_bound
+        bottom = [(x, y_lower) for x in self.side_coordinates(box, "bottom_side")]
+        right = [(x_upper, y) for y in self.side_coordinates(box, "right_side")]
+        top = [(x, y_upper) for x in reversed(self.side_coordinates(box, "top_side"))]
+        left = [(x_lower, y) for y in reversed(self.side_coordinates(box, "left_side"))]
+        # Consecutive sides share their corner point
+        return bottom[:-1] + right[:-1] + top[:-1] + left[:-1]
@@ -0,0 +1,635 @@
+"""
+Screening kernels for the C0 and C1 predicates.
+
+The kernels work on dense coefficient arrays: the coefficient of x^i * y^j of a polynomial of degree d
+is stored at index i * (d + 1) + j. Each kernel is written once in plain Python. When Numba is
+importable, the same source is also compiled with `numba.njit`, so both backends perform the same
+floating-point operations in the same order and return identical results. The pure-Python backend
+works with any number type, including `fractions.Fraction`.
+"""
+
+from interval_arithmetic_library.interval_arithmetic import product_bounds, square_bounds
+from polynomial_library.bivariate_polynomials import polynomial_key
+
+try:
+    import numba
+    import numpy
+except ImportError:
+    numba = None
+    numpy = None
+
+KERNEL_BACKENDS = ("python", "numba") if numba is not None else ("python",)
+DEFAULT_BACKEND = KERNEL_BACKENDS[-1]
+
+
+def _taylor_shift(coefficients, degree, x_shift, y_shift):
+    """ Return the dense coefficients of p(x + x_shift, y + y_shift). """
+    n = degree + 1
+    shifted = coefficients.copy()
+    # Shift in x, one column of equal y powers at a time
+    for j in range(n):
+        for k in range(n - 1):
+            for i in range(n - 2, k - 1, -1):
+                shifted[i * n + j] += x_shift * shifted[(i + 1) * n + j]
+    # Shift in y, one row of equal x powers at a time
+    for i in range(n):
+        for k in range(n - 1):
+            for j in range(n - 2, k - 1, -1):
+                shifted[i * n + j] += y_shift * shifted[i * n + j + 1]
+    return shifted
+
+
+def polynomial_enclosure(coefficients, degree, x_lower, x_upper, y_lower, y_upper):
+    """
+    Enclose a polynomial over a box with its Taylor form at the midpoint.
+
+    Every term t * (x - m_x)^a * (y - m_y)^b of the expansion at the midpoint ranges over
+    t * [0, r_x^a r_y^b] when a and b are both even, and over t * [-r_x^a r_y^b, r_x^a r_y^b] otherwise,
+    where r_x and r_y are the half widths of the box.
+
+    :return: The lower and upper bound of the enclosure.
+    """
+    if degree < 0:
+        zero = x_lower - x_lower
+        return zero, zero
+    n = degree + 1
+    x_midpoint = (x_lower + x_upper) / 2
+    y_midpoint = (y_lower + y_upper) / 2
+    x_radius = x_upper - x_midpoint
+    y_radius = y_upper - y_midpoint
+    taylor = _taylor_shift(coefficients, degree, x_midpoint, y_midpoint)
+
+    lower = taylor[0]
+    upper = taylor[0]
+    for a in range(n):
+        for b in range(n - a):
+            if a == 0 and b == 0:
+                continue
+            coefficient = taylor[a * n + b]
+            if coefficient == 0:
+                continue
+            term = coefficient * (x_radius ** a * y_radius ** b)
+            if a % 2 == 0 and b % 2 == 0:
+                if term > 0:
+                    upper += term
+                else:
+                    lower += term
+            else:
+                if term < 0:
+                    term = -term
+                lower -= term
+                upper += term
+    return lower, upper
+
+
+def polynomial_value(coefficients, degree, x, y):
+    """
+    Evaluate a polynomial at a point with Horner's scheme, in y within every row of equal x powers and
+    then in x.
+
+    :return: The value of the polynomial.
+    """
+    n = degree + 1
+    value = x - x
+    for i in range(degree, -1, -1):
+        row = x - x
+        for j in range(degree - i, -1, -1):
+            row = row * y + coefficients[i * n + j]
+        value = value * x + row
+    return value
+
+
+def _univariate_enclosure(coefficients, degree, lower, upper):
+    """ Enclose a univariate polynomial over an interval with its Taylor form at the midpoint. """
+    midpoint = (lower + upper) / 2
+    radius = upper - midpoint
+    taylor = coefficients.copy()
+    for k in range(degree):
+        for i in range(degree - 1, k - 1, -1):
+            taylor[i] += midpoint * taylor[i + 1]
+    enclosure_lower = taylor[0]
+    enclosure_upper = taylor[0]
+    for a in range(1, degree + 1):
+        term = taylor[a] * radius ** a
+        if a % 2 == 0:
+            if term > 0:
+                enclosure_upper += term
+            else:
+                enclosure_lower += term
+        else:
+            if term < 0:
+                term = -term
+            enclosure_lower -= term
+            enclosure_upper += term
+    return enclosure_lower, enclosure_upper
+
+
+def vertical_edge_enclosure(coefficients, degree, x, y_lower, y_upper):
+    """
+    Enclose a polynomial over the vertical segment {x} x [y_lower, y_upper], from the Taylor form of its
+    univariate restriction.
+
+    :return: The lower and upper bound of the enclosure.
+    """
+    if degree < 0:
+        return x - x, x - x
+    n = degree + 1
+    restricted = [x - x] * n
+    for j in range(n):
+        for i in range(degree - j, -1, -1):
+            restricted[j] = restricted[j] * x + coefficients[i * n + j]
+    return _univariate_enclosure(restricted, degree, y_lower, y_upper)
+
+
+def horizontal_edge_enclosure(coefficients, degree, x_lower, x_upper, y):
+    """
+    Enclose a polynomial over the horizontal segment [x_lower, x_upper] x {y}, from the Taylor form of its
+    univariate restriction.
+
+    :return: The lower and upper bound of the enclosure.
+    """
+    if degree < 0:
+        return y - y, y - y
+    n = degree + 1
+    restricted = [y - y] * n
+    for i in range(n):
+        for j in range(degree - i, -1, -1):
+            restricted[i] = restricted[i] * y + coefficients[i * n + j]
+    return _univariate_enclosure(restricted, degree, x_lower, x_upper)
+
+
+# Batch kernels for the level-synchronous engine, see `simultaneous_approximation_frontier`. They loop over
+# a whole level of boxes held as arrays of bounds, and repeat the decisions of the predicates box by box, so
+# that both engines classify every box identically. A polynomial is passed with its partial derivatives as a
+# tuple of coefficient arrays and a tuple of degrees: (p, p_x, p_y) for a monotone enclosure of p.
+
+LEVEL_C0 = 0
+LEVEL_C1 = 1
+LEVEL_C1_CROSS = 2
+LEVEL_SUBDIVIDE = 3
+LEVEL_PENDING = 4
+LEVEL_UNDECIDED = 5
+
+
+def _enclosure(coefficients, degree, x_lower, x_upper, y_lower, y_upper):
+    """ Enclose a polynomial over a box, a segment or a point, with the kernel the predicates use. """
+    if x_lower == x_upper:
+        if y_lower == y_upper:
+            value = polynomial_value(coefficients, degree, x_lower, y_lower)
+            return value, value
+        return vertical_edge_enclosure(coefficients, degree, x_lower, y_lower, y_upper)
+    if y_lower == y_upper:
+        return horizontal_edge_enclosure(coefficients, degree, x_lower, x_upper, y_lower)
+    return polynomial_enclosure(coefficients, degree, x_lower, x_upper, y_lower, y_upper)
+
+
+def _monotone_enclosure(family, degrees, offset, x_lower, x_upper, y_lower, y_upper):
+    """
+    Enclose the polynomial at `offset` in a family, followed by its partial derivatives, like
+    `monotone_enclosure`: the pieces are combined in the same order, so the bounds are identical.
+    """
+    lower, upper = _enclosure(family[offset], degrees[offset], x_lower, x_upper, y_lower, y_upper)
+    if not lower <= 0 <= upper or degrees[offset] < 2:
+        return lower, upper
+    dx_lower, dx_upper = _enclosure(family[offset + 1], degrees[offset + 1], x_lower, x_upper, y_lower, y_upper)
+    dy_lower, dy_upper = _enclosure(family[offset + 2], degrees[offset + 2], x_lower, x_upper, y_lower, y_upper)
+    x_monotone = not dx_lower <= 0 <= dx_upper
+    y_monotone = not dy_lower <= 0 <= dy_upper
+    if not x_monotone and not y_monotone:
+        return lower, upper
+    coefficients, degree = family[offset], degrees[offset]
+    if x_monotone and y_monotone:
+        piece_lower, piece_upper = _enclosure(coefficients, degree, x_lower, x_lower, y_lower, y_lower)
+        for x, y in ((x_lower, y_upper), (x_upper, y_lower), (x_upper, y_upper)):
+            next_lower, next_upper = _enclosure(coefficients, degree, x, x, y, y)
+            if next_lower < piece_lower:
+                piece_lower = next_lower
+            if next_upper > piece_upper:
+                piece_upper = next_upper
+    elif x_monotone:
+        piece_lower, piece_upper = _enclosure(coefficients, degree, x_lower, x_lower, y_lower, y_upper)
+        next_lower, next_upper = _enclosure(coefficients, degree, x_upper, x_upper, y_lower, y_upper)
+        if next_lower < piece_lower:
+            piece_lower = next_lower
+        if next_upper > piece_upper:
+            piece_upper = next_upper
+    else:
+        piece_lower, piece_upper = _enclosure(coefficients, degree, x_lower, x_upper, y_lower, y_lower)
+        next_lower, next_upper = _enclosure(coefficients, degree, x_lower, x_upper, y_upper, y_upper)
+        if next_lower < piece_lower:
+            piece_lower = next_lower
+        if next_upper > piece_upper:
+            piece_upper = next_upper
+    # As max(lower, piece_lower) and min(upper, piece_upper), which keep the first of equal values
+    return (lower if lower >= piece_lower else piece_lower), (upper if upper <= piece_upper else piece_upper)
+
+
+def _sign(coefficients, degree, x, y):
+    value = polynomial_value(coefficients, degree, x, y)
+    return 1 if value > 0 else -1 if value < 0 else 0
+
+
+def _crosses(coefficients, degree, x_lower, x_upper, y_lower, y_upper):
+    """ Check the corners and the midpoint of a box for a zero or a sign change, like `VertexCache.crosses`. """
+    first = _sign(coefficients, degree, x_lower, y_lower)
+    if first == 0:
+        return True
+    if _sign(coefficients, degree, x_upper, y_lower) != first:
+        return True
+    if _sign(coefficients, degree, x_upper, y_upper) != first:
+        return True
+    if _sign(coefficients, degree, x_lower, y_upper) != first:
+        return True
+    return _sign(coefficients, degree, (x_lower + x_upper) / 2, (y_lower + y_upper) / 2) != first
+
+
+def _squared_norm_contains_zero(dx_lower, dx_upper, dy_lower, dy_upper):
+    dx_square_lower, dx_square_upper = square_bounds(dx_lower, dx_upper)
+    dy_square_lower, dy_square_upper = square_bounds(dy_lower, dy_upper)
+    return dx_square_lower + dy_square_lower <= 0 <= dx_square_upper + dy_square_upper
+
+
+def _cross_product_contains_zero(fx_lower, fx_upper, fy_lower, fy_upper, gx_lower, gx_upper, gy_lower, gy_upper):
+    first_lower, first_upper = product_bounds(fx_lower, fx_upper, gy_lower, gy_upper)
+    second_lower, second_upper = product_bounds(fy_lower, fy_upper, gx_lower, gx_upper)
+    return first_lower - second_upper <= 0 <= first_upper - second_lower
+
+
+def batch_c0_predicate(family, degrees, screen, x_lower, x_upper, y_lower, y_upper, out):
+    """
+    Evaluate the C0 predicate of one polynomial on every box of a level, like `c0_predicate` on a single
+    function, optionally screened by the signs at the corners and midpoint of each box.
+
+    :param family: The coefficients of (p, p_x, p_y).
+    :param degrees: The degrees of (p, p_x, p_y).
+    :param screen: Whether to test the corners and midpoint before enclosing.
+    :param out: Receives True for the boxes the curve of p cannot meet.
+    """
+    for k in range(len(out)):
+        if screen and _crosses(family[0], degrees[0], x_lower[k], x_upper[k], y_lower[k], y_upper[k]):
+            out[k] = False
+            continue
+        lower, upper = _monotone_enclosure(family, degrees, 0, x_lower[k], x_upper[k], y_lower[k], y_upper[k])
+        out[k] = not lower <= 0 <= upper
+
+
+def batch_c1_needed(c0, index, with_c1_cross, out):
+    """
+    Mark the boxes of a level on which the classification reads the C1 predicate of one function.
+
+    :param c0: The C0 predicate of every function, one row per function.
+    :param index: The function.
+    :param with_c1_cross: Whether the boxes are classified like `subdivision_with_c1_cross`.
+    :param out: Receives True for the boxes that need the C1 predicate of the function.
+    """
+    for k in range(len(out)):
+        if with_c1_cross:
+            out[k] = not c0[index][k]
+            continue
+        count = 0
+        for i in range(len(c0)):
+            if c0[i][k]:
+                count += 1
+        # Without the C1-cross test, a single c0 function is tested by c0_c1_predicate, and with more
+        # c0 functions every function is tested by c1_predicate, unless all of them are c0
+        out[k] = count < len(c0) and (count > 1 or (count == 1 and c0[index][k]))
+
+
+def batch_c1_predicate(family, degrees, x_lower, x_upper, y_lower, y_upper, needed, out):
+    """
+    Evaluate the C1 predicate of one polynomial on the needed boxes of a level, like `c1_predicate`.
+
+    :param family: The coefficients of (p_x, p_xx, p_xy, p_y, p_yx, p_yy).
+    :param degrees: Their degrees.
+    :param needed: The boxes on which to evaluate the predicate.
+    :param out: Receives True for the needed boxes on which the gradient of p cannot vanish.
+    """
+    for k in range(len(out)):
+        if not needed[k]:
+            continue
+        xl, xu, yl, yu = x_lower[k], x_upper[k], y_lower[k], y_upper[k]
+        dx_lower, dx_upper = _enclosure(family[0], degrees[0], xl, xu, yl, yu)
+        dy_lower, dy_upper = _enclosure(family[3], degrees[3], xl, xu, yl, yu)
+        holds = True
+        if _squared_norm_contains_zero(dx_lower, dx_upper, dy_lower, dy_upper):
+            dx_lower, dx_upper = _monotone_enclosure(family, degrees, 0, xl, xu, yl, yu)
+            if _squared_norm_contains_zero(dx_lower, dx_upper, dy_lower, dy_upper):
+                dy_lower, dy_upper = _monotone_enclosure(family, degrees, 3, xl, xu, yl, yu)
+                holds = not _squared_norm_contains_zero(dx_lower, dx_upper, dy_lower, dy_upper)
+        out[k] = holds
+
+
+def batch_classify_without_c1_cross(c0, c1, status):
+    """
+    Classify every box of a level like `classify_box_without_c1_cross`, into LEVEL_C0, LEVEL_C1 or
+    LEVEL_SUBDIVIDE.
+    """
+    for k in range(len(status)):
+        count = 0
+        c0_index = -1
+        for i in range(len(c0)):
+            if c0[i][k]:
+                count += 1
+                c0_index = i
+        if count == len(c0) or count == 0 or (count == 1 and c1[c0_index][k]):
+            status[k] = LEVEL_C0 if count == len(c0) else LEVEL_C1
+            continue
+        status[k] = LEVEL_C1
+        for i in range(len(c1)):
+            if not c1[i][k]:
+                status[k] = LEVEL_SUBDIVIDE
+                break
+
+
+def batch_classify_with_c1_cross(c0, c1, status, first, second):
+    """
+    Classify every box of a level like `classify_box_with_c1_cross`, up to the C1-cross test: boxes with
+    two curves become LEVEL_PENDING, and `first` and `second` receive the indices of the two functions.
+    """
+    for k in range(len(status)):
+        count = 0
+        status[k] = LEVEL_C0
+        for i in range(len(c0)):
+            if c0[i][k]:
+                continue
+            count += 1
+            if count == 1:
+                first[k] = i
+            elif count == 2:
+                second[k] = i
+            if count > 2 or not c1[i][k]:
+                status[k] = LEVEL_SUBDIVIDE
+                break
+        if status[k] == LEVEL_SUBDIVIDE:
+            continue
+        if count == 1:
+            status[k] = LEVEL_C1
+        elif count == 2:
+            status[k] = LEVEL_PENDING
+
+
+def batch_c1_cross_predicate(family, degrees, neighborhood_factor, x_lower, x_upper, y_lower, y_upper,
+                             status, first, second, index1, index2):
+    """
+    Decide the pending boxes of a level whose two curves are those of the functions `index1` and `index2`,
+    with the C1-cross predicate on their neighborhoods, like `classify_box_with_c1_cross`.
+
+    :param family: The coefficients of (f_x, f_xx, f_xy, f_y, f_yx, f_yy, g_x, ..., g_yy).
+    :param degrees: Their degrees.
+    :param status: Receives LEVEL_C1_CROSS or LEVEL_SUBDIVIDE for the boxes decided.
+    """
+    for k in range(len(status)):
+        if status[k] != LEVEL_PENDING or first[k] != index1 or second[k] != index2:
+            continue
+        x_width = x_upper[k] - x_lower[k]
+        y_width = y_upper[k] - y_lower[k]
+        margin = neighborhood_factor * (x_width if x_width <= y_width else y_width)
+        xl, xu = x_lower[k] - margin, x_upper[k] + margin
+        yl, yu = y_lower[k] - margin, y_upper[k] + margin
+        fx_lower, fx_upper = _enclosure(family[0], degrees[0], xl, xu, yl, yu)
+        fy_lower, fy_upper = _enclosure(family[3], degrees[3], xl, xu, yl, yu)
+        gx_lower, gx_upper = _enclosure(family[6], degrees[6], xl, xu, yl, yu)
+        gy_lower, gy_upper = _enclosure(family[9], degrees[9], xl, xu, yl, yu)
+        if _cross_product_contains_zero(fx_lower, fx_upper, fy_lower, fy_upper,
+                                        gx_lower, gx_upper, gy_lower, gy_upper):
+            fx_lower, fx_upper = _monotone_enclosure(family, degrees, 0, xl, xu, yl, yu)
+            fy_lower, fy_upper = _monotone_enclosure(family, degrees, 3, xl, xu, yl, yu)
+            gx_lower, gx_upper = _monotone_enclosure(family, degrees, 6, xl, xu, yl, yu)
+            gy_lower, gy_upper = _monotone_enclosure(family, degrees, 9, xl, xu, yl, yu)
+            if _cross_product_contains_zero(fx_lower, fx_upper, fy_lower, fy_upper,
+                                            gx_lower, gx_upper, gy_lower, gy_upper):
+                status[k] = LEVEL_SUBDIVIDE
+                continue
+        status[k] = LEVEL_C1_CROSS
+
+
+def batch_split_allowance(status, x_lower, x_upper, y_lower, y_upper, min_width, box_allowance):
+    """
+    Apply the limits of a `SubdivisionBudget` to the boxes of a level to subdivide, in order, turning the
+    boxes it stops into LEVEL_UNDECIDED.
+
+    :param min_width: The smallest width a child may have.
+    :param box_allowance: How many more boxes may be created, or a negative number for no limit.
+    :return: The number of boxes to subdivide.
+    """
+    count = 0
+    for k in range(len(status)):
+        if status[k] != LEVEL_SUBDIVIDE:
+            continue
+        x_width = x_upper[k] - x_lower[k]
+        y_width = y_upper[k] - y_lower[k]
+        if (x_width if x_width <= y_width else y_width) / 2 < min_width or \
+                (box_allowance >= 0 and 4 * count + 4 > box_allowance):
+            status[k] = LEVEL_UNDECIDED
+        else:
+            count += 1
+    return count
+
+
+def batch_quadrants(status, x_lower, x_upper, y_lower, y_upper,
+                    child_x_lower, child_x_upper, child_y_lower, child_y_upper):
+    """
+    Split every box of a level marked LEVEL_SUBDIVIDE into its quadrants, in the order of `Box.subdivide`:
+    north-east, north-west, south-west, south-east. The children of successive boxes follow each other.
+    """
+    position = 0
+    for k in range(len(status)):
+        if status[k] != LEVEL_SUBDIVIDE:
+            continue
+        x_middle = (x_lower[k] + x_upper[k]) / 2
+        y_middle = (y_lower[k] + y_upper[k]) / 2
+        for x_low, x_high, y_low, y_high in ((x_middle, x_upper[k], y_middle, y_upper[k]),
+                                             (x_lower[k], x_middle, y_middle, y_upper[k]),
+                                             (x_lower[k], x_middle, y_lower[k], y_middle),
+                                             (x_middle, x_upper[k], y_lower[k], y_middle)):
+            child_x_lower[position] = x_low
+            child_x_upper[position] = x_high
+            child_y_lower[position] = y_low
+            child_y_upper[position] = y_high
+            position += 1
+
+
+BATCH_KERNEL_NAMES = ("batch_c0_predicate", "batch_c1_needed", "batch_c1_predicate",
+                      "batch_classify_without_c1_cross", "batch_classify_with_c1_cross",
+                      "batch_c1_cross_predicate", "batch_split_allowance", "batch_quadrants")
+
+
+class KernelSet:
+    """ The kernels of one backend. """
+
+    def __init__(self, backend, polynomial_enclosure, polynomial_value, vertical_edge_enclosure,
+                 horizontal_edge_enclosure):
+        self.backend = backend
+        self.polynomial_enclosure = polynomial_enclosure
+        self.polynomial_value = polynomial_value
+        self.vertical_edge_enclosure = vertical_edge_enclosure
+        self.horizontal_edge_enclosure = horizontal_edge_enclosure
+
+
+class BatchKernelSet:
+    """ The batch kernels of one backend, as attributes named after BATCH_KERNEL_NAMES. """
+
+    def __init__(self, backend, batch_kernels):
+        self.backend = backend
+        for name, kernel in batch_kernels.items():
+            setattr(self, name, kernel)
+
+
+_KERNELS = {"python": KernelSet("python", polynomial_enclosure, polynomial_value, vertical_edge_enclosure,
+                                horizontal_edge_enclosure)}
+_BATCH_KERNELS = {"python": BatchKernelSet("python", {name: globals()[name] for name in BATCH_KERNEL_NAMES})}
+
+if numba is not None:
+    _jit = numba.njit
+    _taylor_shift_jit = _jit(_taylor_shift)
+    _product_bounds_jit = _jit(product_bounds)
+    _square_bounds_jit = _jit(square_bounds)
+    _univariate_enclosure_jit = _jit(_univariate_enclosure)
+    # Rebind the helpers inside jitted copies of the kernels, which refer to them by global name
+    _jit_globals = dict(globals(), _taylor_shift=_taylor_shift_jit, product_bounds=_product_bounds_jit,
+                        square_bounds=_square_bounds_jit, _univariate_enclosure=_univariate_enclosure_jit)
+
+    def _compile(function, **extra_globals):
+        namespace = dict(_jit_globals, **extra_globals)
+        rebound = type(function)(function.__code__, namespace, function.__name__, function.__defaults__)
+        return _jit(rebound)
+
+    _polynomial_enclosure_jit = _compile(polynomial_enclosure)
+    _KERNELS["numba"] = KernelSet(
+        "numba",
+        _polynomial_enclosure_jit,
+        _compile(polynomial_value),
+        _compile(vertical_edge_enclosure),
+        _compile(horizontal_edge_enclosure),
+    )
+
+    # The batch kernels and their helpers refer to each other by global name, so compile them in order
+    _batch_globals = {"polynomial_enclosure": _polynomial_enclosure_jit,
+                      "polynomial_value": _KERNELS["numba"].polynomial_value,
+                      "vertical_edge_enclosure": _KERNELS["numba"].vertical_edge_enclosure,
+                      "horizontal_edge_enclosure": _KERNELS["numba"].horizontal_edge_enclosure}
+    for _name in ("_enclosure", "_monotone_enclosure", "_sign", "_crosses", "_squared_norm_contains_zero",
+                  "_cross_product_contains_zero") + BATCH_KERNEL_NAMES:
+        _batch_globals[_name] = _compile(globals()[_name], **_batch_globals)
+    _BATCH_KERNELS["numba"] = BatchKernelSet("numba", {name: _batch_globals[name] for name in BATCH_KERNEL_NAMES})
+
+
+def kernels(backend=None):
+    """
+    Return the kernels of a backend.
+
+    :param backend: "python", "numba", or None for the fastest available backend.
+    :return: A KernelSet.
+    """
+    backend = DEFAULT_BACKEND if backend is None else backend
+    if backend not in _KERNELS:
+        raise ValueError(f"Kernel backend {backend!r} is not available; choose from {KERNEL_BACKENDS}.")
+    return _KERNELS[backend]
+
+
+def batch_kernels(backend=None):
+    """
+    Return the batch kernels of a backend.
+
+    :param backend: "python", "numba", or None for the fastest available backend.
+    :return: A BatchKernelSet.
+    """
+    backend = DEFAULT_BACKEND if backend is None else backend
+    if backend not in _BATCH_KERNELS:
+        raise ValueError(f"Kernel backend {backend!r} is not available; choose from {KERNEL_BACKENDS}.")
+    return _BATCH_KERNELS[backend]
+
+
+def batch_array(backend, size, kind="float", rows=None):
+    """
+    Allocate an array for the batch kernels of a backend: a NumPy array for Numba, a list otherwise.
+
+    :param backend: "python" or "numba".
+    :param size: The number of entries, one per box of a level.
+    :param kind: "float", "int" or "bool".
+    :param rows: If given, allocate that many rows of `size` entries.
+    :return: The zero-filled array.
+    """
+    if backend == "numba":
+        dtype = {"float": numpy.float64, "int": numpy.int64, "bool": numpy.bool_}[kind]
+        return numpy.zeros(size if rows is None else (rows, size), dtype=dtype)
+    zero = {"float": 0.0, "int": 0, "bool": False}[kind]
+    if rows is None:
+        return [zero] * size
+    return [[zero] * size for _ in range(rows)]
+
+
+def dense_coefficients(function):
+    """
+    Return the dense coefficient list of a bivariate polynomial.
+
+    :param function: A BivariatePolynomial.
+    :return: A list of (deg + 1)^2 coefficients, x^i * y^j at index i * (deg + 1) + j.
+    """
+    n = function.deg + 1
+    coefficients = [0] * (n * n)
+    for (x_power, y_power), coefficient in function.coefficients.items():
+        coefficients[x_power * n + y_power] = coefficient
+    return coefficients
+
+
+class CompiledPolynomial:
+    """
+    A polynomial prepared for the kernels of one backend: its dense coefficients, and lazily the
+    compiled forms of its partial derivatives.
+    """
+
+    __slots__ = ("function", "backend", "degree", "coefficients", "_dx", "_dy")
+
+    def __init__(self, function, backend):
+        # Keep a private copy, since polynomials can be modified in place
+        self.function = function.copy()
+        self.backend = backend
+        self.degree = function.deg
+        coefficients = dense_coefficients(function)
+        if backend == "numba":
+            coefficients = numpy.array(coefficients, dtype=numpy.float64)
+        self.coefficients = coefficients
+        self._dx = None
+        self._dy = None
+
+    @property
+    def dx(self):
+        """ The compiled partial derivative with respect to x. """
+        if self._dx is None:
+            self._dx = compiled_polynomial(self.function.derivative(0), self.backend)
+        return self._dx
+
+    @property
+    def dy(self):
+        """ The compiled partial derivative with respect to y. """
+        if self._dy is None:
+            self._dy = compiled_polynomial(self.function.derivative(1), self.backend)
+        return self._dy
+
+
+COMPILED_CACHE_SIZE = 4096
+_compiled_cache = {}
+
+
+def compiled_polynomial(function, backend=None):
+    """
+    Return the compiled form of a polynomial for a backend.
+
+    Compiled polynomials are cached by their coefficients, so identical polynomials, even from different
+    systems, share one compiled form and its derivatives.
+
+    :param function: A BivariatePolynomial.
+    :param backend: "python", "numba", or None for the fastest available backend.
+    :return: A CompiledPolynomial.
+    """
+    backend = DEFAULT_BACKEND if backend is None else backend
+    key = (backend, polynomial_key(function))
+    compiled = _compiled_cache.get(key)
+    if compiled is None:
+        if len(_compiled_cache) >= COMPILED_CACHE_SIZE:
+            # Drop the oldest entry; dictionaries keep insertion order
+            del _compiled_cache[next(iter(_compiled_cache))]
+        compiled = CompiledPolynomial(function, backend)
+        _compiled_cache[key] = compiled
+    return compiled
@@ -0,0 +1,165 @@
+"""
+Affine preconditioning of a subdivision run.
+
+Far from the origin, or over a large domain, the powers of x and y in a polynomial are large, and so are
+the cancellations between its terms; the interval enclosures of the predicates then grow with the size of
+the coordinates rather than with the variation of the polynomial, and the drivers over-subdivide. A
+preconditioned run maps the initial box affinely onto [-1, 1]^2, substitutes the map into every polynomial,
+scales each polynomial by a power of two so its largest coefficient lies in [1/2, 2), subdivides the
+normalized problem, and maps the boxes back.
+
+The predicates only depend on the zero sets of the functions and the directions of their gradients, which
+an affine map of each axis and a positive scale carry over, so the boxes returned certify the original
+system. The substitution is computed exactly with `fractions.Fraction`; in float arithmetic the
+coefficients of the normalized polynomials are then rounded once each, so the certificates hold for
+polynomials within one rounding of the exact substitution. The corners of the boxes are mapped back in the
+type of the bounds of the initial box, exactly for `Fraction` bounds, and the sides of the initial box are
+reproduced exactly.
+"""
+from fractions import Fraction
+from math import comb
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+from simultaneous_approximation_tools import PVBox
+
+_NORMALIZED = (-1, 1)
+
+
+def _shift(coefficients, axis, center, half_width):
+    """
+    Substitute center + half_width * t for one variable of a polynomial.
+
+    :param coefficients: A dictionary {(i, j): c} of Fraction coefficients.
+    :param axis: 0 to substitute for x, 1 for y.
+    :return: The dictionary of the substituted polynomial, possibly with zero coefficients.
+    """
+    degree = max((monomial[axis] for monomial in coefficients), default=0)
+    center_powers = [Fraction(1)]
+    half_width_powers = [Fraction(1)]
+    for _ in range(degree):
+        center_powers.append(center_powers[-1] * center)
+        half_width_powers.append(half_width_powers[-1] * half_width)
+    shifted = {}
+    for monomial, coefficient in coefficients.items():
+        power, other = monomial[axis], monomial[1 - axis]
+        for k in range(power + 1):
+            term = (k, other) if axis == 0 else (other, k)
+            shifted[term] = shifted.get(term, 0) + (
+                coefficient * comb(power, k) * center_powers[power - k] * half_width_powers[k])
+    return shifted
+
+
+def _power_of_two_scale(coefficients):
+    """ The power of two bringing the largest absolute coefficient into [1/2, 2). """
+    largest = max(map(abs, coefficients.values()), default=0)
+    if largest == 0:
+        return Fraction(1)
+    exponent = largest.numerator.bit_length() - largest.denominator.bit_length()
+    return Fraction(1, 2 ** exponent) if exponent >= 0 else Fraction(2 ** -exponent)
+
+
+class AffinePreconditioner:
+    """
+    The affine map of an initial box onto [-1, 1]^2, and the polynomials it transforms.
+
+    A point (u, v) of [-1, 1]^2 stands for (x_center + x_half_width * u, y_center + y_half_width * v) in
+    the initial box.
+
+    Attributes:
+        initial_box (Box): The domain of the original problem.
+        exact (bool): Keep the normalized coefficients as Fractions instead of rounding them to floats.
+        x_center, y_center, x_half_width, y_half_width (Fraction): The map, exactly.
+    """
+
+    def __init__(self, initial_box, exact=False):
+        self.initial_box = initial_box
+        self.exact = exact
+        x_lower, x_upper = initial_box.x_interval.lower_bound, initial_box.x_interval.upper_bound
+        y_lower, y_upper = initial_box.y_interval.lower_bound, initial_box.y_interval.upper_bound
+        if not (x_lower < x_upper and y_lower < y_upper):
+            raise ValueError("Only a box with a nonempty interior can be mapped onto [-1, 1]^2.")
+        x_lower, x_upper, y_lower, y_upper = map(Fraction, (x_lower, x_upper, y_lower, y_upper))
+        self.x_center, self.x_half_width = (x_lower + x_upper) / 2, (x_upper - x_lower) / 2
+        self.y_center, self.y_half_width = (y_lower + y_upper) / 2, (y_upper - y_lower) / 2
+
+    def normalized_box(self):
+        """ The initial box of the normalized problem, [-1, 1]^2. """
+        return PVBox(Interval(*_NORMALIZED), Interval(*_NORMALIZED))
+
+    def normalize(self, function):
+        """
+        Transform a polynomial into the normalized coordinates, scaled by a power of two.
+
+        :param function: A BivariatePolynomial.
+        :return: The BivariatePolynomial g with g(u, v) = 2^k * function(x, y), where (x, y) is the image
+                 of (u, v) and 2^k brings the largest coefficient of g into [1/2, 2).
+        """
+        coefficients = {monomial: Fraction(coefficient) for monomial, coefficient in function.coefficients.items()}
+        coefficients = _shift(coefficients, 0, self.x_center, self.x_half_width)
+        coefficients = _shift(coefficients, 1, self.y_center, self.y_half_width)
+        scale = _power_of_two_scale(coefficients)
+        convert = (lambda value: value) if self.exact else float
+        return BivariatePolynomial({monomial: convert(coefficient * scale)
+                                    for monomial, coefficient in coefficients.items() if coefficient != 0})
+
+    def _map_bound(self, value, interval, center, half_width):
+        """ Map a normalized coordinate back, reproducing the sides of the initial box exactly. """
+        if value == _NORMALIZED[0]:
+            return interval.lower_bound
+        if value == _NORMALIZED[1]:
+            return interval.upper_bound
+        if isinstance(interval.lower_bound, Fraction):
+            return center + half_width * Fraction(value)
+        return float(center) + float(half_width) * value
+
+    def map_back(self, box):
+        """
+        Map a box of the normalized problem back to the initial box.
+
+        :param box: A PVBox inside [-1, 1]^2.
+        :return: A new PVBox with the same predicate flags and depth, without parent or children links.
+        """
+        x_interval, y_interval = self.initial_box.x_interval, self.initial_box.y_interval
+        mapped = PVBox(
+            Interval(self._map_bound(box.x_interval.lower_bound, x_interval, self.x_center, self.x_half_width),
+                     self._map_bound(box.x_interval.upper_bound, x_interval, self.x_center, self.x_half_width)),
+            Interval(self._map_bound(box.y_interval.lower_bound, y_interval, self.y_center, self.y_half_width),
+                     self._map_bound(box.y_interval.upper_bound, y_interval, self.y_center, self.y_half_width)))
+        mapped.depth = box.depth
+        mapped.C0_predicate = box.C0_predicate
+        mapped.C1_predicate = box.C1_predicate
+        mapped.C1Prime = box.C1Prime
+        return mapped
+
+
+def preconditioned_subdivision(driver, function_list, initial_box, budget=None, exact=False, **options):
+    """
+    Run a subdivision driver on the normalized problem and map its boxes back, see the module docstring.
+
+    A `min_width` of the budget is converted to the normalized coordinates for the run, so that it keeps
+    bounding the widths of quadtree boxes in the original coordinates.
+
+    Args:
+        driver (Callable): `subdivision_with_c1_cross` or `subdivision_without_c1_cross`.
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        initial_box (PVBox): The domain.
+        budget (SubdivisionBudget): Optional limits on the run.
+        exact (bool): Keep the normalized coefficients exact, for exact or adaptive arithmetic.
+        options: The other arguments of the driver.
+
+    Returns:
+        tuple: The c0 boxes and the c1 boxes, and the undecided boxes if a budget is given, as returned by
+        the driver, in the coordinates of the initial box.
+    """
+    preconditioner = AffinePreconditioner(initial_box, exact)
+    normalized_functions = [preconditioner.normalize(function) for function in function_list]
+    min_width = None if budget is None else budget.min_width
+    if min_width is not None:
+        budget.min_width = min_width / float(min(preconditioner.x_half_width, preconditioner.y_half_width))
+    try:
+        result = driver(normalized_functions, preconditioner.normalized_box(), budget=budget, **options)
+    finally:
+        if min_width is not None:
+            budget.min_width = min_width
+    return tuple([preconditioner.map_back(box) for box in boxes] for boxes in result)
@@ -1,30 +1,166 @@
+import math
+from fractions import Fraction
+
 from polynomial_library.bivariate_polynomials import BivariatePolynomial
+from interval_arithmetic_library.interval_arithmetic import Interval, product_bounds, square_bounds
 from simultaneous_approximation_tools import *
+from simultaneous_approximation_kernels import compiled_polynomial, kernels
+
+
+def _compiled(function, box, arithmetic):
+    """
+    Compile a polynomial for the fastest kernels, or for the pure-Python kernel under an ArithmeticPolicy
+    and on boxes with `Fraction` bounds, like `evaluate_bivariate_over_box`.
+    """
+    exact = arithmetic is not None or isinstance(box.x_interval.lower_bound, Fraction)
+    return compiled_polynomial(function, "python" if exact else None)
+
+
+def _enclose(compiled, arithmetic, x_lower, x_upper, y_lower, y_upper):
+    """ Enclose a compiled polynomial over a box given by its bounds, which may be a segment or a point. """
+    if arithmetic is not None:
+        enclosure = arithmetic.evaluate(compiled.function,
+                                        Box(Interval(x_lower, x_upper), Interval(y_lower, y_upper)))
+        return enclosure.lower_bound, enclosure.upper_bound
+    kernel_set = kernels(compiled.backend)
+    if x_lower == x_upper:
+        if y_lower == y_upper:
+            value = kernel_set.polynomial_value(compiled.coefficients, compiled.degree, x_lower, y_lower)
+            return value, value
+        return kernel_set.vertical_edge_enclosure(compiled.coefficients, compiled.degree, x_lower, y_lower, y_upper)
+    if y_lower == y_upper:
+        return kernel_set.horizontal_edge_enclosure(compiled.coefficients, compiled.degree, x_lower, x_upper, y_lower)
+    return kernel_set.polynomial_enclosure(compiled.coefficients, compiled.degree, x_lower, x_upper, y_lower, y_upper)
+
+
+def _box_cache(box):
+    cache = getattr(box, "enclosures", None)
+    if cache is None:
+        cache = box.enclosures = {}
+    return cache
+
+
+def release_enclosures(box):
+    """
+    Drop the enclosures cached on a box by the predicates.
+
+    The subdivision loops call this once a box is decided or split, so classified boxes and the internal
+    boxes their parent links keep alive do not hold on to the cache.
+    """
+    box.__dict__.pop("enclosures", None)
+
+
+def _box_enclosure(compiled, box, arithmetic):
+    """
+    Enclose a compiled polynomial over a box with its Taylor form.
+
+    Enclosures are cached on the box, so the partial derivatives enclosed while refining the C0 predicate
+    are reused by the C1 predicate and by `split_axis`, and the other way around, until the box is decided
+    or split, see `release_enclosures`.
+    """
+    cache = _box_cache(box)
+    key = (compiled, arithmetic)
+    bounds = cache.get(key)
+    if bounds is None:
+        bounds = _enclose(compiled, arithmetic, box.x_interval.lower_bound, box.x_interval.upper_bound,
+                          box.y_interval.lower_bound, box.y_interval.upper_bound)
+        cache[key] = bounds
+    return bounds
+
 
+def monotone_enclosure(compiled, box, arithmetic=None):
+    """
+    Enclose a compiled polynomial over a box, tightening its Taylor form where the polynomial is monotone.
+
+    When the enclosure contains zero, the partial derivatives are enclosed as well. If one of them
+    excludes zero, the polynomial is monotone in that direction, so its range over the box lies between
+    its ranges over the two opposite edges; if both exclude zero, the range lies between its extreme
+    corner values. The edge enclosures are univariate, hence tighter than the enclosure over the whole
+    box, and are intersected with it.
+
+    Args:
+        compiled (CompiledPolynomial): The polynomial, see `compiled_polynomial`.
+        box (Box): The box over which to enclose it.
+        arithmetic (ArithmeticPolicy): Optional arithmetic for the enclosures; float by default.
 
-def c0_predicate(function_list, box):
+    Returns:
+        tuple: The lower and upper bound of the enclosure.
+    """
+    lower, upper = _box_enclosure(compiled, box, arithmetic)
+    # The Taylor form of a polynomial of degree at most one is already its exact range
+    if not lower <= 0 <= upper or compiled.degree < 2:
+        return lower, upper
+    cache = _box_cache(box)
+    key = (compiled, arithmetic, "monotone")
+    bounds = cache.get(key)
+    if bounds is not None:
+        return bounds
+
+    dx_lower, dx_upper = _box_enclosure(compiled.dx, box, arithmetic)
+    dy_lower, dy_upper = _box_enclosure(compiled.dy, box, arithmetic)
+    x_monotone = not dx_lower <= 0 <= dx_upper
+    y_monotone = not dy_lower <= 0 <= dy_upper
+    x_lower, x_upper = box.x_interval.lower_bound, box.x_interval.upper_bound
+    y_lower, y_upper = box.y_interval.lower_bound, box.y_interval.upper_bound
+    if x_monotone and y_monotone:
+        pieces = [_enclose(compiled, arithmetic, x, x, y, y) for x in (x_lower, x_upper) for y in (y_lower, y_upper)]
+    elif x_monotone:
+        pieces = [_enclose(compiled, arithmetic, x, x, y_lower, y_upper) for x in (x_lower, x_upper)]
+    elif y_monotone:
+        pieces = [_enclose(compiled, arithmetic, x_lower, x_upper, y, y) for y in (y_lower, y_upper)]
+    else:
+        pieces = [(lower, upper)]
+    bounds = max(lower, min(piece[0] for piece in pieces)), min(upper, max(piece[1] for piece in pieces))
+    cache[key] = bounds
+    return bounds
+
+
+def _squared_norm_contains_zero(dx_bounds, dy_bounds):
+    """ Check whether the enclosure of f_x^2 + f_y^2 from enclosures of f_x and f_y contains zero. """
+    dx_square_lower, dx_square_upper = square_bounds(*dx_bounds)
+    dy_square_lower, dy_square_upper = square_bounds(*dy_bounds)
+    return dx_square_lower + dy_square_lower <= 0 <= dx_square_upper + dy_square_upper
+
+
+def _cross_product_contains_zero(fx_bounds, fy_bounds, gx_bounds, gy_bounds):
+    """ Check whether the enclosure of f_x * g_y - f_y * g_x from enclosures of the partials contains zero. """
+    first_lower, first_upper = product_bounds(*fx_bounds, *gy_bounds)
+    second_lower, second_upper = product_bounds(*fy_bounds, *gx_bounds)
+    return first_lower - second_upper <= 0 <= first_upper - second_lower
+
+
+def c0_predicate(function_list, box, arithmetic=None, vertex_cache=None):
     """
     Evaluate the C0 predicate for a list of functions within a specified box.
 
     The C0 predicate is true if none of the functions' varieties (zeros) are contained within the box.
-    If any function's variety is contained in the box, the C0 predicate is false.
+    If any function's variety is contained in the box, the C0 predicate is false. The enclosures are
+    tightened where a function is monotone over the box, see `monotone_enclosure`.
 
     Args:
         function_list (list[BivariatePolynomial]): A list of bivariate functions to check.
         box (Box): The box in which to check if the variety of any function is contained.
+        arithmetic (ArithmeticPolicy): Optional arithmetic for the enclosures; float by default.
+        vertex_cache (VertexCache): Optional cache of sample signs; a sign change among the samples of a
+                                    box proves that a curve crosses it without enclosing the function.
 
     Returns:
         bool: True if none of the functions have a variety (contain a zero) within the box;
               False if at least one function's variety is contained in the box.
     """
     for function in function_list:
+        compiled = _compiled(function, box, arithmetic)
         # Check if the variety of the function is contained in the box
-        if evaluate_bivariate_over_box(function, box).contains_zero():
+        if vertex_cache is not None and vertex_cache.crosses(compiled, box):
+            vertex_cache.avoided_enclosures += 1
+            return False
+        lower, upper = monotone_enclosure(compiled, box, arithmetic)
+        if lower <= 0 <= upper:
             return False  # Return early if any function contains a zero
     return True  # C0 is true if no varieties are contained
 
 
-def c1_predicate(function_list, box):
+def c1_predicate(function_list, box, arithmetic=None):
     """
     Check the C1 predicate for a list of bivariate polynomials within a given box.
 
@@ -36,6 +172,7 @@ def c1_predicate(function_list, box):
     Args:
         function_list (list[BivariatePolynomial]): A list of bivariate polynomials to check.
         box (Box): The box in which the C1 predicate is evaluated.
+        arithmetic (ArithmeticPolicy): Optional arithmetic for the enclosures; float by default.
 
     Returns:
         bool: True if the C1 predicate holds (i.e., the gradient is non-zero throughout
@@ -43,36 +180,204 @@ def c1_predicate(function_list, box):
               in the box.
     """
     for function in function_list:
-        # Evaluate the partial derivatives over the box once
-        dx_evaluation = evaluate_bivariate_over_box(function.derivative(0), box)
-        dy_evaluation = evaluate_bivariate_over_box(function.derivative(1), box)
-
-        # Compute the inner product of the partial derivatives
-        inner_product_evaluation = dx_evaluation * dx_evaluation + dy_evaluation * dy_evaluation
-
-        # If the inner product contains zero, return False (C1 predicate fails)
-        if inner_product_evaluation.contains_zero():
-            return False
+        compiled = _compiled(function, box, arithmetic)
+        dx_bounds = _box_enclosure(compiled.dx, box, arithmetic)
+        dy_bounds = _box_enclosure(compiled.dy, box, arithmetic)
+        # If the inner product contains zero, tighten the partial derivatives where they are monotone,
+        # one at a time, before concluding that the C1 predicate fails
+        if _squared_norm_contains_zero(dx_bounds, dy_bounds):
+            dx_bounds = monotone_enclosure(compiled.dx, box, arithmetic)
+            if _squared_norm_contains_zero(dx_bounds, dy_bounds):
+                dy_bounds = monotone_enclosure(compiled.dy, box, arithmetic)
+                if _squared_norm_contains_zero(dx_bounds, dy_bounds):
+                    return False
     return True
 
 
-def c0_c1_predicate(function_list, box):
+def c0_c1_predicate(function_list, box, arithmetic=None, vertex_cache=None):
     c0_functions = []
     for function in function_list:
-        c0_flag = c0_predicate([function], box)
+        c0_flag = c0_predicate([function], box, arithmetic, vertex_cache)
         if c0_flag:
             c0_functions.append(function)
             if len(c0_functions) > 1:
                 return False
     if len(c0_functions) == 1:
-        return c1_predicate(c0_functions, box)
+        return c1_predicate(c0_functions, box, arithmetic)
     return True
 
 
-def c1_cross_predicate(function1, function2, box):
-    dfdx_evaluation = evaluate_bivariate_over_box(function1.derivative(0), box)
-    dfdy_evaluation = evaluate_bivariate_over_box(function1.derivative(1), box)
-    dgdx_evaluation = evaluate_bivariate_over_box(function2.derivative(0), box)
-    dgdy_evaluation = evaluate_bivariate_over_box(function2.derivative(1), box)
-    cross_product_evaluation = dfdx_evaluation * dgdy_evaluation - dfdy_evaluation * dgdx_evaluation
-    return not cross_product_evaluation.contains_zero()
+def c1_cross_predicate(function1, function2, box, arithmetic=None):
+    f, g = _compiled(function1, box, arithmetic), _compiled(function2, box, arithmetic)
+    partials = (f.dx, f.dy, g.dx, g.dy)
+    if not _cross_product_contains_zero(*(_box_enclosure(partial, box, arithmetic) for partial in partials)):
+        return True
+    # Tighten the partial derivatives where they are monotone before concluding that the predicate fails
+    if not _cross_product_contains_zero(*(monotone_enclosure(partial, box, arithmetic) for partial in partials)):
+        return True
+    if arithmetic is None or not arithmetic.escalates(box):
+        return False
+    # The enclosure of the cross product polynomial itself keeps the dependency between the partial
+    # derivatives that the product of their separate enclosures loses. A sign change at the corners or the
+    # midpoint proves that the cross product vanishes on the box, as it does around a tangency, and no
+    # enclosure can certify the box then
+    exact = arithmetic.exact_policy
+    cross_product = _compiled(arithmetic.exact_cross_product(function1, function2), box, exact)
+    if VertexCache(exact).crosses(cross_product, box):
+        return False
+    arithmetic.escalations += 1
+    lower, upper = monotone_enclosure(cross_product, box, exact)
+    certified = not lower <= 0 <= upper
+    arithmetic.certified_escalations += certified
+    return certified
+
+
+class C1CrossCache:
+    """
+    Memoized C1-cross certificates over dyadic neighborhoods.
+
+    Sibling boxes have heavily overlapping C1-cross neighborhoods. Whenever the neighborhood of a box
+    is certified, the test is also run on an enlarged neighborhood of the box's parent cell, snapped to
+    the dyadic grid of the cell's children, which contains the neighborhoods of all four siblings. That
+    result is cached per pair of functions and cell, so a certificate proven once is reused by every box
+    it covers, including boxes further down the tree.
+
+    A cache belongs to one polynomial system and arithmetic; the function pairs are identified by
+    their indices.
+    """
+
+    def __init__(self, neighborhood_factor=6.5, arithmetic=None):
+        self.neighborhood_factor = neighborhood_factor
+        self.arithmetic = arithmetic
+        self.certificates = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _cell_neighborhood(self, cell, width):
+        """
+        Enlarge a cell by a whole number of half cell sides, enough to contain the neighborhood of any
+        box of the given width inside it.
+        """
+        x_step = cell.x_interval.width() / 2
+        y_step = cell.y_interval.width() / 2
+        x_margin = math.ceil(self.neighborhood_factor * width / x_step) * x_step
+        y_margin = math.ceil(self.neighborhood_factor * width / y_step) * y_step
+        return PVBox(Interval(cell.x_interval.lower_bound - x_margin, cell.x_interval.upper_bound + x_margin),
+                     Interval(cell.y_interval.lower_bound - y_margin, cell.y_interval.upper_bound + y_margin))
+
+    @staticmethod
+    def _key(function_pair, cell):
+        return (function_pair, cell.x_interval.lower_bound, cell.x_interval.upper_bound,
+                cell.y_interval.lower_bound, cell.y_interval.upper_bound)
+
+    def c1_cross_predicate(self, function_pair, function1, function2, box):
+        """
+        Check the C1-cross predicate of two functions on the neighborhood of a box.
+
+        Args:
+            function_pair (tuple[int, int]): The indices of the two functions in the system.
+            function1 (BivariatePolynomial): The first function.
+            function2 (BivariatePolynomial): The second function.
+            box (Box): The box whose neighborhood is tested.
+
+        Returns:
+            bool: True if the cross product of the gradients is nonzero on the neighborhood of the box.
+        """
+        # A certificate for an ancestor cell covers the neighborhoods of all of its descendants
+        ancestor = box.parent
+        while ancestor is not None:
+            if self.certificates.get(self._key(function_pair, ancestor)):
+                self.hits += 1
+                return True
+            ancestor = ancestor.parent
+        self.misses += 1
+
+        w = self.neighborhood_factor
+        certified = c1_cross_predicate(function1, function2,
+                                       PVBox(Interval(box.x_interval.lower_bound - w * box.width(),
+                                                      box.x_interval.upper_bound + w * box.width()),
+                                             Interval(box.y_interval.lower_bound - w * box.width(),
+                                                      box.y_interval.upper_bound + w * box.width())),
+                                       self.arithmetic)
+        # Try to extend a certificate to the siblings, unless that already failed for this cell
+        cell = box.parent
+        if certified and cell is not None:
+            key = self._key(function_pair, cell)
+            if key not in self.certificates:
+                self.certificates[key] = c1_cross_predicate(function1, function2,
+                                                            self._cell_neighborhood(cell, box.width()),
+                                                            self.arithmetic)
+        return certified
+
+
+class VertexCache:
+    """
+    Signs of the functions of a system at box corners and midpoints, shared between boxes.
+
+    A function that is positive at one sample point of a box and negative at another, or zero at one,
+    has a curve meeting the box, so the box fails the C0 predicate without any interval work. The
+    samples are the four corners of a box and its midpoint. Corners are shared with neighboring boxes and
+    the midpoint is a corner of all four children, so most samples are found in the cache. The samples
+    of a box are tested lazily, stopping at the first sign change.
+
+    A cache belongs to one arithmetic; the functions are identified by their compiled form.
+
+    Every sample point of every function tested is kept, a few hundred bytes each, so the memory grows with
+    the number of boxes classified times the number of functions. Once `max_entries` signs are held the
+    cache is emptied; the samples reused most are those of a box and its children, which are tested shortly
+    after one another, so little is lost.
+
+    Attributes:
+        max_entries (int): The number of signs held before the cache is emptied.
+        evaluations (int): The point evaluations made.
+        hits (int): The samples found in the cache.
+        avoided_enclosures (int): The C0 enclosures skipped because a sign change decided the predicate.
+    """
+
+    def __init__(self, arithmetic=None, max_entries=1 << 18):
+        self.arithmetic = arithmetic
+        self.max_entries = max_entries
+        self.signs = {}
+        self.evaluations = 0
+        self.hits = 0
+        self.avoided_enclosures = 0
+
+    def sign(self, compiled, x, y):
+        """
+        Return the sign of a compiled polynomial at a point: 1, -1, or 0 when it may vanish there.
+        """
+        key = (compiled, x, y)
+        sign = self.signs.get(key)
+        if sign is not None:
+            self.hits += 1
+            return sign
+        self.evaluations += 1
+        lower, upper = _enclose(compiled, self.arithmetic, x, x, y, y)
+        sign = 1 if lower > 0 else -1 if upper < 0 else 0
+        if len(self.signs) >= self.max_entries:
+            self.signs.clear()
+        self.signs[key] = sign
+        return sign
+
+    def crosses(self, compiled, box):
+        """
+        Check whether the samples of a box prove that the curve of a polynomial meets the box.
+
+        Args:
+            compiled (CompiledPolynomial): The polynomial, see `compiled_polynomial`.
+            box (Box): The box to sample.
+
+        Returns:
+            bool: True if the polynomial vanishes at a sample or takes both signs; False if the samples
+                  do not decide.
+        """
+        x_lower, x_upper = box.x_interval.lower_bound, box.x_interval.upper_bound
+        y_lower, y_upper = box.y_interval.lower_bound, box.y_interval.upper_bound
+        first = self.sign(compiled, x_lower, y_lower)
+        if first == 0:
+            return True
+        for x, y in ((x_upper, y_lower), (x_upper, y_upper), (x_lower, y_upper),
+                     ((x_lower + x_upper) / 2, (y_lower + y_upper) / 2)):
+            if self.sign(compiled, x, y) != first:
+                return True
+        return False
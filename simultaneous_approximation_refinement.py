@@ -0,0 +1,197 @@
+from simultaneous_approximation import (C0_BOX, C1_BOX, classify_box_with_c1_cross,
+                                       classify_box_without_c1_cross, run_subdivision)
+from simultaneous_approximation_predicates import c0_predicate, release_enclosures
+from simultaneous_approximation_tools import arithmetic_policy
+
+
+def box_classifier(function_list, with_c1_cross, neighborhood_factor, arithmetic):
+    """
+    Return the classifier of one box used by a subdivision driver, for `run_subdivision`.
+
+    Args:
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        with_c1_cross (bool): Classify like `subdivision_with_c1_cross` rather than
+                              `subdivision_without_c1_cross`.
+        neighborhood_factor (float): The C1-cross neighborhood factor, used with the C1-cross test only.
+        arithmetic (str or ArithmeticPolicy): The arithmetic mode, see `ArithmeticPolicy`.
+
+    Returns:
+        Callable: A function of a box returning its classification.
+    """
+    arithmetic = arithmetic_policy(arithmetic)
+    if with_c1_cross:
+        return lambda box: classify_box_with_c1_cross(function_list, box, neighborhood_factor,
+                                                      arithmetic=arithmetic)
+    return lambda box: classify_box_without_c1_cross(function_list, box, arithmetic)
+
+
+def _reset_flags(box):
+    box.C0_predicate = False
+    box.C1_predicate = False
+    box.C1Prime = False
+
+
+def changed_functions(previous_function_list, function_list):
+    """
+    List the polynomials whose curves differ between two versions of a system.
+
+    Both the old and the new version of a modified polynomial are returned, since boxes
+    crossed by either curve have to be re-examined. Added and removed polynomials are
+    returned as they are.
+
+    Args:
+        previous_function_list (list[BivariatePolynomial]): The system of the previous run.
+        function_list (list[BivariatePolynomial]): The edited system.
+
+    Returns:
+        list[BivariatePolynomial]: The polynomials whose curves changed.
+    """
+    changed = []
+    for i in range(max(len(previous_function_list), len(function_list))):
+        old_function = previous_function_list[i] if i < len(previous_function_list) else None
+        new_function = function_list[i] if i < len(function_list) else None
+        if old_function == new_function:
+            continue
+        changed.extend(function for function in (old_function, new_function) if function is not None)
+    return changed
+
+
+def update_subdivision(result, previous_function_list, function_list, with_c1_cross=True,
+                       neighborhood_factor=6.5, budget=None, arithmetic="float"):
+    """
+    Update the result of a subdivision driver after polynomials were added, removed or modified.
+
+    Only the leaves of the previous result crossed by a changed curve, i.e. the leaves on which
+    the C0 test of a changed polynomial fails, are classified again against the edited system and
+    subdivided further where needed. All other leaves keep their classification, except that without
+    the C1-cross test the classification of a c1 leaf also depends on how many functions pass the C0
+    test on it, so every kept c1 leaf is classified again as well.
+
+    Args:
+        result (tuple[list[PVBox], ...]): The c0 boxes, the c1 boxes and optionally the undecided
+                                          boxes of the previous run.
+        previous_function_list (list[BivariatePolynomial]): The system of the previous run.
+        function_list (list[BivariatePolynomial]): The edited system.
+        with_c1_cross (bool): Whether the previous run used `subdivision_with_c1_cross`.
+        neighborhood_factor (float): The C1-cross neighborhood factor of the previous run.
+        budget (SubdivisionBudget): Optional limits on the re-classification.
+        arithmetic (str or ArithmeticPolicy): The arithmetic mode of the previous run.
+
+    Returns:
+        tuple: The updated c0 boxes and c1 boxes. If a budget is given, the boxes it left undecided
+        are returned as a third list.
+    """
+    arithmetic = arithmetic_policy(arithmetic)
+    changed = changed_functions(previous_function_list, function_list)
+    classify = box_classifier(function_list, with_c1_cross, neighborhood_factor, arithmetic)
+
+    previous_c0_boxes, previous_c1_boxes = result[0], result[1]
+    c0_boxes, c1_boxes, affected_leaves = [], [], []
+    for leaf_list, kept_boxes in ((previous_c0_boxes, c0_boxes), (previous_c1_boxes, c1_boxes)):
+        for leaf in leaf_list:
+            unaffected = all(c0_predicate([function], leaf, arithmetic) for function in changed)
+            release_enclosures(leaf)
+            if unaffected:
+                if with_c1_cross or kept_boxes is c0_boxes:
+                    kept_boxes.append(leaf)
+                    continue
+                # The C0-C1 test of the driver without C1-cross counts the functions passing C0
+                _reset_flags(leaf)
+                classification = classify(leaf)
+                release_enclosures(leaf)
+                if classification == C0_BOX:
+                    c0_boxes.append(leaf)
+                    continue
+                if classification == C1_BOX:
+                    c1_boxes.append(leaf)
+                    continue
+            _reset_flags(leaf)
+            affected_leaves.append(leaf)
+    # Boxes a budget left undecided in the previous run are always tried again
+    if len(result) > 2:
+        affected_leaves.extend(result[2])
+
+    new_c0_boxes, new_c1_boxes, undecided_boxes = run_subdivision(affected_leaves, classify, budget)
+    c0_boxes.extend(new_c0_boxes)
+    c1_boxes.extend(new_c1_boxes)
+    if budget is None:
+        return c0_boxes, c1_boxes
+    return c0_boxes, c1_boxes, undecided_boxes
+
+
+def _overlaps(box, window):
+    """ Check whether two boxes share a region of positive area. """
+    return (min(box.x_interval.upper_bound, window.x_interval.upper_bound)
+            > max(box.x_interval.lower_bound, window.x_interval.lower_bound)
+            and min(box.y_interval.upper_bound, window.y_interval.upper_bound)
+            > max(box.y_interval.lower_bound, window.y_interval.lower_bound))
+
+
+def _refine_leaf(leaf, is_c0, window, min_width, classify, c0_boxes, c1_boxes):
+    """
+    Subdivide a classified leaf inside the window down to `min_width`.
+
+    Children of a c0 leaf are c0 as well. Children of a c1 leaf are classified again; a child the
+    predicates cannot decide keeps the classification of its parent, which remains valid on every
+    sub-box.
+    """
+    stack = [(leaf, is_c0)]
+    while stack:
+        box, box_is_c0 = stack.pop()
+        if box.width() <= min_width or not _overlaps(box, window):
+            (c0_boxes if box_is_c0 else c1_boxes).append(box)
+            continue
+        children = box.subdivide()
+        for child in reversed(children):
+            if box_is_c0:
+                child.C0_predicate = True
+                stack.append((child, True))
+                continue
+            classification = classify(child)
+            release_enclosures(child)
+            if classification == C0_BOX:
+                stack.append((child, True))
+            elif classification == C1_BOX:
+                stack.append((child, False))
+            else:
+                child.C0_predicate = box.C0_predicate
+                child.C1_predicate = box.C1_predicate
+                child.C1Prime = box.C1Prime
+                stack.append((child, False))
+
+
+def refine(result, window, min_width, function_list, with_c1_cross=True, neighborhood_factor=6.5,
+           arithmetic="float"):
+    """
+    Refine the result of a subdivision driver inside a region of interest.
+
+    Only the stored leaves overlapping the window are subdivided, until their width is at most
+    `min_width`. All other leaves are returned untouched. Boxes a budget left undecided carry no
+    classification to pass on to their children, so they are returned untouched as well.
+
+    Args:
+        result (tuple[list[PVBox], ...]): The c0 boxes, the c1 boxes and optionally the undecided
+                                          boxes of a previous run.
+        window (Box): The region of interest.
+        min_width (float): The width down to which boxes overlapping the window are subdivided.
+        function_list (list[BivariatePolynomial]): The polynomial system of the previous run.
+        with_c1_cross (bool): Whether the previous run used `subdivision_with_c1_cross`.
+        neighborhood_factor (float): The C1-cross neighborhood factor of the previous run.
+        arithmetic (str or ArithmeticPolicy): The arithmetic mode of the previous run.
+
+    Returns:
+        tuple: The refined c0 boxes and c1 boxes, and the undecided boxes as a third list if the
+        previous run returned them.
+    """
+    if min_width <= 0:
+        raise ValueError("The minimum width of a refinement must be positive.")
+    classify = box_classifier(function_list, with_c1_cross, neighborhood_factor, arithmetic)
+
+    previous_c0_boxes, previous_c1_boxes = result[0], result[1]
+    c0_boxes, c1_boxes = [], []
+    for leaf_list, is_c0 in ((previous_c0_boxes, True), (previous_c1_boxes, False)):
+        for leaf in leaf_list:
+            _refine_leaf(leaf, is_c0, window, min_width, classify, c0_boxes, c1_boxes)
+    if len(result) > 2:
+        return c0_boxes, c1_boxes, list(result[2])
+    return c0_boxes, c1_boxes
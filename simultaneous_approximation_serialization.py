@@ -0,0 +1,89 @@
+import struct
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from simultaneous_approximation_tools import PVBox
+
+# Compact binary layout of a classification result:
+#   header: magic (4 bytes), version (uint8), then the number of c0, c1 and undecided boxes (3 x uint64)
+#   records: one per box, x/y bounds as four little-endian doubles followed by a flag byte
+MAGIC = b"SAPV"
+VERSION = 1
+_HEADER = struct.Struct("<4sBQQQ")
+_RECORD = struct.Struct("<ddddB")
+
+_C0_FLAG = 1
+_C1_FLAG = 2
+_C1_PRIME_FLAG = 4
+
+
+def _box_flags(box):
+    flags = 0
+    if getattr(box, "C0_predicate", False):
+        flags |= _C0_FLAG
+    if getattr(box, "C1_predicate", False):
+        flags |= _C1_FLAG
+    if getattr(box, "C1Prime", False):
+        flags |= _C1_PRIME_FLAG
+    return flags
+
+
+def pack_boxes(c0_boxes, c1_boxes, undecided_boxes=()):
+    """
+    Encode the output of a subdivision driver in the compact binary result format.
+
+    Only the bounds and the predicate flags of each box are stored; parent and children
+    links are not part of the format.
+
+    Parameters:
+        c0_boxes (list[Box]): Boxes classified as C0.
+        c1_boxes (list[Box]): Boxes classified as C1.
+        undecided_boxes (list[Box]): Boxes left unresolved, if any.
+
+    Returns:
+        bytes: The encoded result.
+    """
+    chunks = [_HEADER.pack(MAGIC, VERSION, len(c0_boxes), len(c1_boxes), len(undecided_boxes))]
+    for box_list in (c0_boxes, c1_boxes, undecided_boxes):
+        for box in box_list:
+            chunks.append(_RECORD.pack(box.x_interval.lower_bound, box.x_interval.upper_bound,
+                                       box.y_interval.lower_bound, box.y_interval.upper_bound,
+                                       _box_flags(box)))
+    return b"".join(chunks)
+
+
+def unpack_boxes(data):
+    """
+    Decode a result produced by `pack_boxes`.
+
+    Parameters:
+        data (bytes): The encoded result.
+
+    Returns:
+        tuple[list[PVBox], list[PVBox], list[PVBox]]: The c0, c1 and undecided boxes, with
+        their predicate flags restored.
+
+    Raises:
+        ValueError: If the data is not in the compact binary result format.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Data is too short to hold a subdivision result.")
+    magic, version, c0_count, c1_count, undecided_count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Data is not in the compact binary result format.")
+    if len(data) != _HEADER.size + (c0_count + c1_count + undecided_count) * _RECORD.size:
+        raise ValueError("Data length does not match the number of boxes in the header.")
+
+    offset = _HEADER.size
+    result = []
+    for count in (c0_count, c1_count, undecided_count):
+        boxes = []
+        for _ in range(count):
+            x_lower, x_upper, y_lower, y_upper, flags = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            box = PVBox(Interval(x_lower, x_upper), Interval(y_lower, y_upper))
+            box.C0_predicate = bool(flags & _C0_FLAG)
+            box.C1_predicate = bool(flags & _C1_FLAG)
+            box.C1Prime = bool(flags & _C1_PRIME_FLAG)
+            boxes.append(box)
+        result.append(boxes)
+    return tuple(result)
@@ -0,0 +1,306 @@
+"""
+A local asyncio service running subdivision jobs on warm worker processes.
+
+Wire protocol, over a Unix socket or localhost TCP:
+    request:  a 4-byte big-endian length, then a UTF-8 JSON object (see `encode_request`)
+    response: a status byte (0 for success, 1 for an error), an 8-byte big-endian length, then either the
+              result in the compact binary result format or a UTF-8 error message
+
+A connection may carry any number of requests, answered in order.
+"""
+import asyncio
+import json
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from polynomial_library.polynomial_parser import polynomial_from_json, polynomial_to_json
+from simultaneous_approximation import SubdivisionBudget
+from simultaneous_approximation_batch import SubdivisionJob, run_job
+from simultaneous_approximation_cache import DRIVERS, subdivision_cache_key
+from simultaneous_approximation_serialization import unpack_boxes
+from simultaneous_approximation_tools import ARITHMETIC_MODES, PVBox
+
+_REQUEST_LENGTH = struct.Struct(">I")
+_RESPONSE_HEADER = struct.Struct(">BQ")
+STATUS_OK = 0
+STATUS_ERROR = 1
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+STREAM_CHUNK_BYTES = 64 * 1024
+BUDGET_FIELDS = ("min_width", "max_depth", "max_boxes", "time_limit")
+
+
+def encode_request(function_list, initial_box, driver="with_c1_cross", neighborhood_factor=6.5,
+                   arithmetic="float", budget=None):
+    """
+    Encode a subdivision job as a request frame.
+
+    Parameters:
+        function_list (list[BivariatePolynomial]): The polynomial system, with int, float or Fraction coefficients.
+        initial_box (Box): The domain of the run.
+        driver (str): Either "with_c1_cross" or "without_c1_cross".
+        neighborhood_factor (float): The C1-cross neighborhood factor.
+        arithmetic (str): The arithmetic mode, one of ARITHMETIC_MODES.
+        budget (dict): Optional limits, keyed by the names of the SubdivisionBudget arguments.
+
+    Returns:
+        bytes: The framed request.
+    """
+    request = {
+        "functions": [polynomial_to_json(function) for function in function_list],
+        "box": [initial_box.x_interval.lower_bound, initial_box.x_interval.upper_bound,
+                initial_box.y_interval.lower_bound, initial_box.y_interval.upper_bound],
+        "driver": driver,
+        "neighborhood_factor": neighborhood_factor,
+        "arithmetic": arithmetic,
+        "budget": budget,
+    }
+    payload = json.dumps(request).encode("utf-8")
+    return _REQUEST_LENGTH.pack(len(payload)) + payload
+
+
+def decode_request(payload):
+    """
+    Decode the JSON payload of a request frame.
+
+    The functions may be given in any JSON form taken by `polynomial_from_json`, polynomial strings
+    included.
+
+    :param payload: The bytes following the length prefix.
+    :return: A tuple (function_list, initial_box, driver, neighborhood_factor, arithmetic, budget), where
+             budget is a dict of the requested limits or None.
+    :raises ValueError: If the request is malformed.
+    """
+    try:
+        request = json.loads(payload.decode("utf-8"))
+        function_list = [polynomial_from_json(function) for function in request["functions"]]
+        x_lower, x_upper, y_lower, y_upper = request["box"]
+        initial_box = PVBox(Interval(x_lower, x_upper), Interval(y_lower, y_upper))
+        driver = request.get("driver", "with_c1_cross")
+        neighborhood_factor = request.get("neighborhood_factor", 6.5)
+        arithmetic = request.get("arithmetic", "float")
+        budget = request.get("budget")
+    except (UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError, ValueError) as error:
+        raise ValueError(f"Malformed subdivision request: {error}") from error
+    if driver not in DRIVERS:
+        raise ValueError(f"Unknown subdivision driver: {driver!r}")
+    if arithmetic not in ARITHMETIC_MODES:
+        raise ValueError(f"Unknown arithmetic mode: {arithmetic!r}")
+    if budget is not None and (not isinstance(budget, dict) or set(budget) - set(BUDGET_FIELDS)):
+        raise ValueError(f"A budget may only set {', '.join(BUDGET_FIELDS)}.")
+    return function_list, initial_box, driver, neighborhood_factor, arithmetic, budget
+
+
+class SubdivisionService:
+    """
+    Serve subdivision jobs from warm worker processes.
+
+    Identical requests in flight at the same time are run once and answered from the same result. The
+    workers live as long as the service, so each keeps its compiled polynomials between jobs.
+
+    Every job runs under a budget: the limits it requests, capped by `budget_limits`. A limit the
+    request leaves out takes the value of the cap.
+    """
+
+    def __init__(self, max_workers=None, budget_limits=None):
+        self.max_workers = max_workers
+        self.budget_limits = dict(budget_limits or {})
+        unknown = set(self.budget_limits) - set(BUDGET_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown budget limits: {', '.join(sorted(unknown))}")
+        self.executor = None
+        self.server = None
+        self.requests = 0
+        self.coalesced = 0
+        self._in_flight = {}
+
+    def job_budget(self, requested):
+        """
+        Combine the limits a job requests with the limits of the service.
+
+        :param requested: A dict of requested limits, or None.
+        :return: A SubdivisionBudget, or None if neither the job nor the service sets a limit.
+        """
+        requested = requested or {}
+        limits = {}
+        for field in BUDGET_FIELDS:
+            value, cap = requested.get(field), self.budget_limits.get(field)
+            if value is None or cap is None:
+                limits[field] = cap if value is None else value
+            elif field == "min_width":
+                # A larger minimum width is the tighter limit
+                limits[field] = max(value, cap)
+            else:
+                limits[field] = min(value, cap)
+        if all(value is None for value in limits.values()):
+            return None
+        return SubdivisionBudget(**limits)
+
+    async def start(self, path=None, host="127.0.0.1", port=0):
+        """
+        Start the worker processes and listen for connections.
+
+        :param path: The path of a Unix socket to listen on; if None, listen on TCP instead.
+        :param host: The TCP host, localhost by default.
+        :param port: The TCP port; 0 picks a free port, which is then available from `address`.
+        """
+        self.executor = ProcessPoolExecutor(self.max_workers)
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle_connection, path=path)
+        else:
+            self.server = await asyncio.start_server(self._handle_connection, host=host, port=port)
+
+    @property
+    def address(self):
+        """ The socket address the service listens on. """
+        return self.server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        await self.server.serve_forever()
+
+    async def close(self):
+        """ Stop listening and shut the worker processes down. """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    async def run(self, function_list, initial_box, driver="with_c1_cross", neighborhood_factor=6.5,
+                  arithmetic="float", budget=None):
+        """
+        Run a job on the workers, sharing the run with identical jobs already in flight.
+
+        :return: The result in the compact binary result format.
+        """
+        budget = self.job_budget(budget)
+        key = (subdivision_cache_key(function_list, initial_box, driver, neighborhood_factor, arithmetic),
+               None if budget is None else tuple(getattr(budget, field) for field in BUDGET_FIELDS))
+        self.requests += 1
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        options = {"driver": driver, "arithmetic": arithmetic, "budget": budget}
+        if driver == "with_c1_cross":
+            options["neighborhood_factor"] = neighborhood_factor
+        job = SubdivisionJob(function_list, initial_box, options)
+        future = asyncio.ensure_future(self._run_in_worker(job))
+        self._in_flight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    async def _run_in_worker(self, job):
+        loop = asyncio.get_running_loop()
+        _, _, data = await loop.run_in_executor(self.executor, run_job, (0, job))
+        return data
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(_REQUEST_LENGTH.size)
+                except asyncio.IncompleteReadError:
+                    break
+                (length,) = _REQUEST_LENGTH.unpack(header)
+                if length > MAX_REQUEST_BYTES:
+                    await self._send(writer, STATUS_ERROR, b"Request is too large.")
+                    break
+                payload = await reader.readexactly(length)
+                try:
+                    data = await self.run(*decode_request(payload))
+                except Exception as error:
+                    await self._send(writer, STATUS_ERROR, str(error).encode("utf-8"))
+                    continue
+                await self._send(writer, STATUS_OK, data)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _send(writer, status, data):
+        writer.write(_RESPONSE_HEADER.pack(status, len(data)))
+        view = memoryview(data)
+        # Stream large results in chunks, waiting for the client to keep up
+        for offset in range(0, len(view), STREAM_CHUNK_BYTES):
+            writer.write(view[offset:offset + STREAM_CHUNK_BYTES])
+            await writer.drain()
+        await writer.drain()
+
+
+class SubdivisionClient:
+    """ A connection to a SubdivisionService. """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, path=None, host="127.0.0.1", port=None):
+        """
+        Connect to a service.
+
+        :param path: The Unix socket of the service; if None, connect over TCP instead.
+        :return: A SubdivisionClient.
+        """
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def subdivide(self, function_list, initial_box, driver="with_c1_cross", neighborhood_factor=6.5,
+                        arithmetic="float", budget=None):
+        """
+        Run a job on the service. The arguments are those of `encode_request`.
+
+        :return: The c0, c1 and undecided boxes as PVBox objects. Only a budget, requested or imposed by the
+                 service, leaves boxes undecided.
+        :raises RuntimeError: If the service reports an error.
+        """
+        self.writer.write(encode_request(function_list, initial_box, driver, neighborhood_factor, arithmetic,
+                                         budget))
+        await self.writer.drain()
+        status, length = _RESPONSE_HEADER.unpack(await self.reader.readexactly(_RESPONSE_HEADER.size))
+        data = await self.reader.readexactly(length)
+        if status != STATUS_OK:
+            raise RuntimeError(data.decode("utf-8"))
+        return unpack_boxes(data)
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve subdivision jobs on this node.")
+    parser.add_argument("--socket", help="path of a Unix socket to listen on")
+    parser.add_argument("--port", type=int, default=0, help="localhost TCP port, if no socket is given")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--time-limit", type=float, default=None, help="cap on the time limit of every job")
+    parser.add_argument("--max-boxes", type=int, default=None, help="cap on the number of boxes of every job")
+    arguments = parser.parse_args()
+
+    async def serve():
+        limits = {"time_limit": arguments.time_limit, "max_boxes": arguments.max_boxes}
+        service = SubdivisionService(arguments.workers,
+                                     {field: value for field, value in limits.items() if value is not None})
+        await service.start(path=arguments.socket, port=arguments.port)
+        print(f"Serving subdivision jobs on {service.address}", flush=True)
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+Sharded subdivision runs coordinated through a shared directory.
+
+Layout of a run directory:
+    manifest.json        the system, the options and the number of tiles
+    tiles/<n>.json       one job per dyadic tile of the initial box
+    leases/<n>.lease.<g> held by the worker running a tile; a stale lease is taken over by a new generation
+    results/top.sapv     the boxes decided above the tile level, in the compact binary result format
+    results/<n>.sapv     the result of a tile, in the compact binary result format
+
+Any number of workers, on any node sharing the directory, claim tiles until every tile has a result.
+Files are published with an atomic rename, so readers never see partial files.
+"""
+import json
+import multiprocessing
+import os
+import socket
+import tempfile
+import threading
+import time
+from collections import deque
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from simultaneous_approximation import C0_BOX, C1_BOX, SubdivisionBudget
+from simultaneous_approximation_balancing import quadtree_cell
+from simultaneous_approximation_cache import DRIVERS
+from simultaneous_approximation_predicates import release_enclosures
+from simultaneous_approximation_refinement import box_classifier
+from simultaneous_approximation_serialization import pack_boxes, unpack_boxes
+from simultaneous_approximation_service import decode_request, encode_request
+from simultaneous_approximation_tools import PVBox
+
+MANIFEST = "manifest.json"
+TOP_RESULT = "top"
+# Budget limits that depend only on the box, and so give the same result on every tile
+SHARDABLE_BUDGET_FIELDS = ("min_width", "max_depth")
+# Position of each quadrant in the order of Box.subdivide, keyed by (east half, north half)
+_QUADRANT_RANK = {(1, 1): 0, (0, 1): 1, (0, 0): 2, (1, 0): 3}
+
+
+def _write_atomically(path, data):
+    directory = os.path.dirname(path)
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(file_descriptor, "wb") as file:
+        file.write(data)
+    os.replace(temporary_path, path)
+
+
+def _budget(budget_limits):
+    if not budget_limits:
+        return None
+    return SubdivisionBudget(**budget_limits)
+
+
+def _read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST), "rb") as file:
+        manifest = json.loads(file.read().decode("utf-8"))
+    request = decode_request(json.dumps(manifest["request"]).encode("utf-8"))
+    return manifest, request
+
+
+def create_sharded_run(directory, function_list, initial_box, level=2, driver="with_c1_cross",
+                       neighborhood_factor=6.5, arithmetic="float", budget=None):
+    """
+    Prepare a sharded subdivision run in a shared directory.
+
+    The subdivision is run breadth first down to the tile level; every box reaching that level becomes
+    a tile job. Boxes decided above the tile level are stored with the run.
+
+    Parameters:
+        directory (str): The shared run directory; created if needed, and expected to be empty.
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        initial_box (PVBox): The domain of the run.
+        level (int): The depth of the tiles below the initial box; up to 4^level tiles are created.
+        driver (str): Either "with_c1_cross" or "without_c1_cross".
+        neighborhood_factor (float): The C1-cross neighborhood factor.
+        arithmetic (str): The arithmetic mode, one of ARITHMETIC_MODES.
+        budget (dict): Optional "min_width" and "max_depth" limits. Limits on the whole run, such as a box
+                       count or a time limit, cannot be split across tiles.
+
+    Returns:
+        int: The number of tiles.
+    """
+    budget = dict(budget or {})
+    unsupported = set(budget) - set(SHARDABLE_BUDGET_FIELDS)
+    if unsupported:
+        raise ValueError(f"Sharded runs only support the budget limits {', '.join(SHARDABLE_BUDGET_FIELDS)}.")
+    if driver not in DRIVERS:
+        raise ValueError(f"Unknown subdivision driver: {driver!r}")
+    for name in ("tiles", "leases", "results"):
+        os.makedirs(os.path.join(directory, name), exist_ok=True)
+
+    classify = box_classifier(function_list, driver == "with_c1_cross", neighborhood_factor, arithmetic)
+    run_budget = _budget(budget)
+    queue = deque([initial_box])
+    c0_boxes, c1_boxes, undecided_boxes, tiles = [], [], [], []
+    while queue:
+        current_box = queue.popleft()
+        if current_box.depth == level:
+            tiles.append(current_box)
+            continue
+        classification = classify(current_box)
+        if classification == C0_BOX:
+            c0_boxes.append(current_box)
+        elif classification == C1_BOX:
+            c1_boxes.append(current_box)
+        elif run_budget is None or run_budget.allows_subdivision(current_box):
+            queue.extend(current_box.subdivide())
+        else:
+            undecided_boxes.append(current_box)
+        release_enclosures(current_box)
+
+    for tile_number, tile in enumerate(tiles):
+        job = {"box": [tile.x_interval.lower_bound, tile.x_interval.upper_bound,
+                       tile.y_interval.lower_bound, tile.y_interval.upper_bound],
+               "depth": tile.depth}
+        _write_atomically(os.path.join(directory, "tiles", f"{tile_number}.json"), json.dumps(job).encode("utf-8"))
+    _write_atomically(os.path.join(directory, "results", TOP_RESULT + ".sapv"),
+                      pack_boxes(c0_boxes, c1_boxes, undecided_boxes))
+
+    request = encode_request(function_list, initial_box, driver, neighborhood_factor, arithmetic, budget or None)
+    manifest = {"request": json.loads(request[4:].decode("utf-8")), "level": level, "tiles": len(tiles)}
+    # The manifest is written last: a run without one is not ready for workers
+    _write_atomically(os.path.join(directory, MANIFEST), json.dumps(manifest).encode("utf-8"))
+    return len(tiles)
+
+
+class _Lease:
+    """
+    A lease held by one worker on one tile, refreshed in the background while the tile runs.
+
+    The leases of a tile are the files <n>.lease.<generation>, and the worker that created the highest
+    generation holds the tile. A stale lease is taken over by creating the next generation with O_EXCL, so
+    of any number of workers racing for it exactly one succeeds, and no worker removes a lease newer than
+    its own.
+    """
+
+    def __init__(self, directory, tile_number, owner, lease_seconds):
+        self.directory = directory
+        self.prefix = f"{tile_number}.lease."
+        self.owner = owner
+        self.lease_seconds = lease_seconds
+        self.generation = None
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _path(self, generation):
+        return os.path.join(self.directory, f"{self.prefix}{generation}")
+
+    def _generations(self):
+        return [int(name[len(self.prefix):]) for name in os.listdir(self.directory)
+                if name.startswith(self.prefix) and name[len(self.prefix):].isdigit()]
+
+    def acquire(self):
+        """
+        Try to take the lease, taking over a lease whose holder stopped refreshing it.
+
+        :return: True if the lease is now held by this worker.
+        """
+        generations = self._generations()
+        if not generations:
+            return self._claim(0)
+        latest = max(generations)
+        try:
+            age = time.time() - os.path.getmtime(self._path(latest))
+        except FileNotFoundError:
+            age = float("inf")  # Released in the meantime
+        if age < self.lease_seconds:
+            return False
+        return self._claim(latest + 1)
+
+    def _claim(self, generation):
+        """ Create the lease file of a generation, and hold the lease if it is the newest one. """
+        try:
+            file_descriptor = os.open(self._path(generation), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(file_descriptor, "w") as file:
+            file.write(self.owner)
+        generations = self._generations()
+        # A worker that read the generations long ago may recreate an old, removed one; it must yield
+        if max(generations) != generation:
+            os.remove(self._path(generation))
+            return False
+        self.generation = generation
+        for older in generations:
+            if older < generation:
+                try:
+                    os.remove(self._path(older))
+                except FileNotFoundError:
+                    pass
+        self._thread = threading.Thread(target=self._refresh, daemon=True)
+        self._thread.start()
+        return True
+
+    def held(self):
+        """ Check whether the lease is still held, i.e. no other worker took it over. """
+        if self.generation is None or self.lost:
+            return False
+        return os.path.exists(self._path(self.generation)) and max(self._generations()) == self.generation
+
+    def _refresh(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            try:
+                if not self.held():
+                    raise FileNotFoundError(self._path(self.generation))
+                os.utime(self._path(self.generation))
+            except FileNotFoundError:
+                self.lost = True
+                return
+
+    def release(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.generation is not None:
+            try:
+                os.remove(self._path(self.generation))
+            except FileNotFoundError:
+                pass
+
+
+def _result_path(directory, tile_number):
+    return os.path.join(directory, "results", f"{tile_number}.sapv")
+
+
+def run_worker(directory, worker_id=None, lease_seconds=600.0, poll_interval=0.5, wait=True):
+    """
+    Claim and run tiles of a sharded run until every tile has a result.
+
+    Parameters:
+        directory (str): The shared run directory.
+        worker_id (str): A name for this worker, written into its lease files; host and process id by
+                         default.
+        lease_seconds (float): How long a lease stays valid without being refreshed. Leases are refreshed
+                               while their tile runs, so only the leases of dead workers expire.
+        poll_interval (float): How long to sleep before checking again when every remaining tile is leased.
+        wait (bool): Keep waiting while other workers hold the remaining tiles; if False, return as soon as
+                     no tile can be claimed.
+
+    Returns:
+        int: The number of tiles this worker ran.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    manifest, request = _read_manifest(directory)
+    function_list, _, driver, neighborhood_factor, arithmetic, budget_limits = request
+    run_driver = DRIVERS[driver]
+    options = {"arithmetic": arithmetic}
+    if driver == "with_c1_cross":
+        options["neighborhood_factor"] = neighborhood_factor
+
+    completed = 0
+    while True:
+        pending = [tile_number for tile_number in range(manifest["tiles"])
+                   if not os.path.exists(_result_path(directory, tile_number))]
+        if not pending:
+            return completed
+        claimed = False
+        for tile_number in pending:
+            lease = _Lease(os.path.join(directory, "leases"), tile_number, worker_id, lease_seconds)
+            if not lease.acquire():
+                continue
+            try:
+                # Another worker may have finished the tile before the lease was taken
+                if os.path.exists(_result_path(directory, tile_number)):
+                    continue
+                claimed = True
+                with open(os.path.join(directory, "tiles", f"{tile_number}.json"), "rb") as file:
+                    job = json.loads(file.read().decode("utf-8"))
+                x_lower, x_upper, y_lower, y_upper = job["box"]
+                tile = PVBox(Interval(x_lower, x_upper), Interval(y_lower, y_upper))
+                tile.depth = job["depth"]
+                budget = _budget(budget_limits)
+                result = run_driver(function_list, tile, budget=budget, **options)
+                # A worker whose lease was taken over leaves the tile to the new holder
+                if not lease.held():
+                    continue
+                _write_atomically(_result_path(directory, tile_number), pack_boxes(*result))
+                completed += 1
+            finally:
+                lease.release()
+        if not claimed:
+            if not wait:
+                return completed
+            time.sleep(poll_interval)
+
+
+def merge_sharded_run(directory):
+    """
+    Assemble the result of a finished sharded run.
+
+    The boxes are returned in the order a single-node run produces them: breadth first, and within each
+    level in the order of Box.subdivide. This is recovered from the position of every box in the
+    quadtree of the initial box.
+
+    Parameters:
+        directory (str): The shared run directory.
+
+    Returns:
+        tuple: The c0 boxes and the c1 boxes, as PVBox objects with their predicate flags; with a budget,
+        also the undecided boxes, exactly like the drivers.
+
+    Raises:
+        RuntimeError: If a tile has no result yet.
+    """
+    manifest, request = _read_manifest(directory)
+    _, initial_box, _, _, _, budget_limits = request
+    merged = ([], [], [])
+    for name in [TOP_RESULT] + [str(tile_number) for tile_number in range(manifest["tiles"])]:
+        path = os.path.join(directory, "results", name + ".sapv")
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            raise RuntimeError(f"Tile {name} of the sharded run in {directory} has no result yet.") from None
+        for merged_boxes, boxes in zip(merged, unpack_boxes(data)):
+            merged_boxes.extend(boxes)
+
+    def breadth_first_key(box):
+        level, column, row = quadtree_cell(initial_box, box)
+        path = 0
+        for bit in range(level - 1, -1, -1):
+            path = 4 * path + _QUADRANT_RANK[((column >> bit) & 1, (row >> bit) & 1)]
+        return level, path
+
+    for boxes in merged:
+        boxes.sort(key=breadth_first_key)
+    if budget_limits is None:
+        return merged[0], merged[1]
+    return merged
+
+
+def _worker_process(directory, lease_seconds):
+    run_worker(directory, lease_seconds=lease_seconds)
+
+
+def sharded_subdivision(function_list, initial_box, directory, level=2, workers=4, lease_seconds=600.0,
+                        **options):
+    """
+    Run a sharded subdivision with local worker processes and merge the result.
+
+    Workers on other nodes may join the run by calling `run_worker` on the same directory.
+
+    Parameters:
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        initial_box (PVBox): The domain of the run.
+        directory (str): The shared run directory.
+        level (int): The depth of the tiles below the initial box.
+        workers (int): The number of local worker processes.
+        lease_seconds (float): See `run_worker`.
+        options: The options of `create_sharded_run`.
+
+    Returns:
+        tuple: The merged result, see `merge_sharded_run`.
+    """
+    create_sharded_run(directory, function_list, initial_box, level, **options)
+    processes = [multiprocessing.Process(target=_worker_process, args=(directory, lease_seconds))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return merge_sharded_run(directory)
@@ -0,0 +1,72 @@
+from simultaneous_approximation_predicates import _box_enclosure, _compiled, monotone_enclosure
+
+SPLIT_MODES = ("quadtree", "binary")
+
+
+def split_axis(function_list, box, arithmetic=None, max_aspect_ratio=2.0):
+    """
+    Choose the axis across which to cut a box in two.
+
+    A box more than `max_aspect_ratio` times longer in one direction is cut across its long side.
+    Otherwise the box is cut across the axis that contributes most to the width of the enclosures of the
+    functions whose curve may cross it: the larger of |f_x| * width in x and |f_y| * width in y, summed
+    over these functions, where |f_x| and |f_y| bound the partial derivatives over the box. Near a
+    curve that is nearly parallel to one axis, the function varies mostly across the curve, so the box
+    is cut across the curve, and the boxes along the curve stay long.
+
+    Parameters:
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        box (Box): The box to cut.
+        arithmetic (ArithmeticPolicy): Optional arithmetic for the enclosures; float by default.
+        max_aspect_ratio (float): The aspect ratio above which the long side is always cut.
+
+    Returns:
+        str: "x" or "y".
+    """
+    x_width, y_width = box.x_interval.width(), box.y_interval.width()
+    if x_width > max_aspect_ratio * y_width:
+        return "x"
+    if y_width > max_aspect_ratio * x_width:
+        return "y"
+    # The enclosures are cached on the box by the predicates, so this costs little after classification
+    compiled_functions = [_compiled(function, box, arithmetic) for function in function_list]
+    crossing = [compiled for compiled in compiled_functions
+                if compiled.degree > 0 and _contains_zero(monotone_enclosure(compiled, box, arithmetic))]
+    x_score = y_score = 0
+    for compiled in crossing or compiled_functions:
+        if compiled.degree < 1:
+            continue
+        x_score += _magnitude(_box_enclosure(compiled.dx, box, arithmetic)) * x_width
+        y_score += _magnitude(_box_enclosure(compiled.dy, box, arithmetic)) * y_width
+    if x_score == y_score:
+        return "x" if x_width >= y_width else "y"
+    return "x" if x_score > y_score else "y"
+
+
+def _contains_zero(bounds):
+    return bounds[0] <= 0 <= bounds[1]
+
+
+def _magnitude(bounds):
+    return max(abs(bounds[0]), abs(bounds[1]))
+
+
+def box_splitter(function_list, split="quadtree", arithmetic=None, max_aspect_ratio=2.0):
+    """
+    Return the function the drivers use to split an undecided box.
+
+    Parameters:
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        split (str): "quadtree" to cut every box into four quadrants with `Box.subdivide`, or "binary" to
+                     cut it in two across the axis chosen by `split_axis`, with `Box.bisect`.
+        arithmetic (ArithmeticPolicy): Optional arithmetic for the enclosures; float by default.
+        max_aspect_ratio (float): See `split_axis`.
+
+    Returns:
+        Callable[[Box], list[Box]]: Splits a box and returns its children.
+    """
+    if split == "quadtree":
+        return lambda box: box.subdivide()
+    if split == "binary":
+        return lambda box: box.bisect(split_axis(function_list, box, arithmetic, max_aspect_ratio))
+    raise ValueError(f"Unknown split mode: {split!r}; choose from {SPLIT_MODES}.")
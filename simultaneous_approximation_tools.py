@@ -1,6 +1,12 @@
+from fractions import Fraction
+
 from polynomial_library.bivariate_polynomials import *
 from interval_arithmetic_library.box_arithmetic import Box
 from interval_arithmetic_library.interval_arithmetic import Interval
+from polynomial_library.weyl_inner_product import cross_product_polynomial_gradients
+from simultaneous_approximation_kernels import compiled_polynomial, kernels
+
+ARITHMETIC_MODES = ("float", "adaptive", "exact")
 
 
 class PVBox(Box):
@@ -16,6 +22,10 @@ def evaluate_bivariate_over_box(function, box):
     Evaluate a bivariate polynomial function over a box using interval arithmetic.
     This function maps I x J -> K, where I, J, and K are intervals over the reals.
 
+    The polynomial is enclosed by its Taylor form at the midpoint of the box, computed by the
+    `polynomial_enclosure` kernel. Boxes with `Fraction` bounds are evaluated exactly with the
+    pure-Python kernel; all other boxes use the fastest available backend.
+
     Parameters:
         function (Polynomial): The bivariate polynomial function to evaluate.
         box (Box): The box object, with x_interval and y_interval, over which to evaluate the function.
@@ -23,33 +33,117 @@ def evaluate_bivariate_over_box(function, box):
     Returns:
         Interval: The resulting interval of the polynomial evaluation.
     """
+    backend = "python" if isinstance(box.x_interval.lower_bound, Fraction) else None
+    compiled = compiled_polynomial(function, backend)
+    lower, upper = kernels(compiled.backend).polynomial_enclosure(
+        compiled.coefficients, compiled.degree,
+        box.x_interval.lower_bound, box.x_interval.upper_bound,
+        box.y_interval.lower_bound, box.y_interval.upper_bound)
+    # The Taylor form only ever lowers its lower bound and raises its upper bound, so they are ordered
+    return Interval._from_ordered(lower, upper)
 
-    midpoint = box.midpoint()  # Assuming box.midpoint() returns a tuple (mid_x, mid_y)
-    result_interval = Interval(0, 0)
-    max_degree = function.deg  # Assuming function.deg gives the maximum degree of the polynomial
-
-    # Precompute factorials to avoid recalculating inside the loop
-    factorials = {i: math.factorial(i) for i in range(max_degree + 1)}
-
-    for x_order in range(max_degree + 1):
-        for y_order in range(max_degree + 1):
-            if x_order + y_order > 0:
-                # Compute the mixed derivative component
-                derivative_component = function.derivative(0, x_order).derivative(1, y_order)
 
-                # Evaluate the current summand using the interval arithmetic
-                current_summand = (derivative_component.eval(midpoint)
-                                   * (box.x_interval - midpoint[0]) ** x_order
-                                   * (box.y_interval - midpoint[1]) ** y_order
-                                   * (1 / factorials[x_order])
-                                   * (1 / factorials[y_order]))
-
-                result_interval += current_summand
+class ArithmeticPolicy:
+    """
+    Chooses the arithmetic used to enclose polynomials over boxes.
+
+    In "float" mode every enclosure uses float interval arithmetic. In "exact" mode every enclosure is
+    computed with `fractions.Fraction` bounds and coefficients, so no rounding occurs. In "adaptive" mode
+    the enclosures use float arithmetic, and a C1-cross test that fails on a neighborhood at most
+    `exact_width` wide is retried with a tighter certificate: the cross product of the gradients is
+    computed exactly as one polynomial and enclosed over the neighborhood in exact arithmetic, unless its
+    signs at the corners and the midpoint already show that it vanishes there, see `c1_cross_predicate`.
+    Near a tangency the float test, which multiplies separate enclosures of the four partial derivatives,
+    fails on many neighborhoods where the cross product does not vanish, so the retry spares the drivers
+    deep subdivisions around the tangency; everywhere else the fast path is kept.
+
+    Attributes:
+        escalations (int): The C1-cross tests retried with an exact enclosure.
+        certified_escalations (int): The retried tests that the exact enclosure decided.
+    """
 
-    # Add the function value at the midpoint (the zero-order term)
-    result_interval += function.eval(midpoint)
+    def __init__(self, mode="float", exact_width=2 ** -2):
+        if mode not in ARITHMETIC_MODES:
+            raise ValueError(f"Unknown arithmetic mode: {mode!r}")
+        self.mode = mode
+        self.exact_width = exact_width
+        self.escalations = 0
+        self.certified_escalations = 0
+        self.exact_policy = ArithmeticPolicy("exact") if mode == "adaptive" else None
+        self._exact_functions = {}
+        self._cross_products = {}
+
+    def _exact_function(self, function):
+        """ Return a copy of a polynomial with Fraction coefficients, cached by its coefficients. """
+        key = polynomial_key(function)
+        exact_function = self._exact_functions.get(key)
+        if exact_function is None:
+            exact_function = BivariatePolynomial({monomial: Fraction(coefficient)
+                                                  for monomial, coefficient in function.coefficients.items()})
+            self._exact_functions[key] = exact_function
+        return exact_function
+
+    def exact_cross_product(self, function1, function2):
+        """
+        Return the cross product of the gradients of two polynomials with exact Fraction coefficients.
+
+        :param function1: The first bivariate polynomial.
+        :param function2: The second bivariate polynomial.
+        :return: The BivariatePolynomial f_x * g_y - f_y * g_x, cached by the coefficients of the pair.
+        """
+        key = (polynomial_key(function1), polynomial_key(function2))
+        cross_product = self._cross_products.get(key)
+        if cross_product is None:
+            cross_product = self._cross_products[key] = cross_product_polynomial_gradients(
+                self._exact_function(function1), self._exact_function(function2))
+        return cross_product
+
+    def exact_enclosure(self, function, box):
+        """
+        Enclose a polynomial over a box without rounding.
+
+        :param function: The bivariate polynomial to evaluate.
+        :param box: The box over which to evaluate it.
+        :return: An Interval with Fraction bounds.
+        """
+        exact_box = Box(Interval(Fraction(box.x_interval.lower_bound), Fraction(box.x_interval.upper_bound)),
+                        Interval(Fraction(box.y_interval.lower_bound), Fraction(box.y_interval.upper_bound)))
+        return evaluate_bivariate_over_box(self._exact_function(function), exact_box)
+
+    def escalates(self, box):
+        """
+        Check whether a failed C1-cross test on a box is retried with the exact certificate.
+
+        :param box: The neighborhood on which the test failed.
+        :return: True in adaptive mode if the box is at most `exact_width` wide.
+        """
+        return self.mode == "adaptive" and box.width() <= self.exact_width
+
+    def evaluate(self, function, box):
+        """
+        Enclose a polynomial over a box with the arithmetic of this policy.
+
+        :param function: The bivariate polynomial to evaluate.
+        :param box: The box over which to evaluate it.
+        :return: An Interval enclosing the range of the polynomial over the box.
+        """
+        if self.mode == "exact":
+            return self.exact_enclosure(function, box)
+        return evaluate_bivariate_over_box(function, box)
+
+
+def arithmetic_policy(arithmetic):
+    """
+    Turn an arithmetic mode into a policy for the predicates.
 
-    return result_interval
+    :param arithmetic: None, one of ARITHMETIC_MODES, or an ArithmeticPolicy.
+    :return: An ArithmeticPolicy, or None for plain float arithmetic.
+    """
+    if arithmetic is None or isinstance(arithmetic, ArithmeticPolicy):
+        return arithmetic
+    if arithmetic == "float":
+        return None
+    return ArithmeticPolicy(arithmetic)
 
 
 def is_boundary_box(bounding_box, sub_box):
@@ -113,8 +207,8 @@ def detect_sign_change(function, point1, point2):
     Returns:
         bool: True if the function changes sign between point1 and point2, False otherwise.
     """
-    function_value1 = function.eval(point1)
-    function_value2 = function.eval(point2)
+    function_value1 = function.evaluate(point1)
+    function_value2 = function.evaluate(point2)
 
     # Replace zero function values with a positive value (slight perturbation)
     if function_value1 == 0:
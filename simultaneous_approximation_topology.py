@@ -0,0 +1,155 @@
+from piecewise_edges import VertexSigns, box_crossings
+from simultaneous_approximation_edges import EdgeRestrictions
+from simultaneous_approximation_index import LeafIndex
+
+
+class LeafGraph:
+    """
+    The adjacency graph of the leaves of a subdivision, in compressed sparse row form.
+
+    The leaves are numbered by their position in `boxes`. The neighbors of leaf k are
+    `neighbors[offsets[k]:offsets[k + 1]]`, in increasing order; two leaves are neighbors when they share
+    a segment of positive length, as `Box.is_neighbor` defines it. The graph is built from the pairs of
+    facing edges of a `LeafIndex`, in O(n log n) time for n leaves.
+
+    Attributes:
+        boxes (list[Box]): The leaves.
+        index (LeafIndex): The adjacency index the graph was built from.
+        offsets (list[int]): The start of the neighbors of every leaf, followed by the number of entries.
+        neighbors (list[int]): The neighbors of all leaves, one row after the other.
+    """
+
+    def __init__(self, boxes, index=None):
+        self.boxes = list(boxes)
+        self.index = LeafIndex(self.boxes) if index is None else index
+        position = {id(box): k for k, box in enumerate(self.boxes)}
+        rows = [[] for _ in self.boxes]
+        for box, neighbor in self.index.adjacent_pairs():
+            k, l = position[id(box)], position[id(neighbor)]
+            rows[k].append(l)
+            rows[l].append(k)
+        self.offsets = [0]
+        self.neighbors = []
+        for row in rows:
+            row.sort()
+            self.neighbors.extend(row)
+            self.offsets.append(len(self.neighbors))
+
+    def __len__(self):
+        return len(self.boxes)
+
+    @property
+    def edge_count(self):
+        """ The number of pairs of neighboring leaves. """
+        return len(self.neighbors) // 2
+
+    def neighbors_of(self, k):
+        """
+        Return the neighbors of a leaf.
+
+        :param k: The number of the leaf.
+        :return: The numbers of its neighbors, in increasing order.
+        """
+        return self.neighbors[self.offsets[k]:self.offsets[k + 1]]
+
+    def degree(self, k):
+        """ Return the number of neighbors of a leaf. """
+        return self.offsets[k + 1] - self.offsets[k]
+
+
+class DisjointSets:
+    """ Union-find over the integers 0 to size - 1, with union by size and path halving. """
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def add(self):
+        """ Add a new singleton set, and return its element. """
+        self.parent.append(len(self.parent))
+        self.size.append(1)
+        return len(self.parent) - 1
+
+    def find(self, k):
+        """ Return the representative of the set containing k. """
+        parent = self.parent
+        while parent[k] != k:
+            parent[k] = parent[parent[k]]
+            k = parent[k]
+        return k
+
+    def union(self, k, l):
+        """
+        Merge the sets containing k and l.
+
+        :return: True if they were different sets.
+        """
+        k, l = self.find(k), self.find(l)
+        if k == l:
+            return False
+        if self.size[k] < self.size[l]:
+            k, l = l, k
+        self.parent[l] = k
+        self.size[k] += self.size[l]
+        return True
+
+
+def leaf_graph(c0_boxes, c1_boxes):
+    """
+    Build the adjacency graph of the output of a subdivision driver.
+
+    Parameters:
+        c0_boxes (list[Box]): The c0 boxes of the subdivision.
+        c1_boxes (list[Box]): The c1 boxes of the subdivision.
+
+    Returns:
+        LeafGraph: The graph over the c0 boxes followed by the c1 boxes.
+    """
+    return LeafGraph(list(c0_boxes) + list(c1_boxes))
+
+
+def curve_components(function_list, c0_boxes, c1_boxes, graph=None, exact_crossings=True):
+    """
+    Find the connected components of the curve of every function of a system from the output of a
+    subdivision driver, and the c1 boxes each component passes through.
+
+    Inside a c1 box, a curve is made of pieces joining its boundary crossings in pairs, in
+    counter-clockwise order, as in `piecewise_linear_curves`. Neighboring boxes see the same crossings on
+    the segment they share, so the pieces of all boxes are joined with one union-find pass over the
+    crossings. A box met by two branches of a curve belongs to the components of both.
+
+    Parameters:
+        function_list (list[BivariatePolynomial]): The polynomial system.
+        c0_boxes (list[Box]): The c0 boxes of the subdivision.
+        c1_boxes (list[Box]): The c1 boxes of the subdivision.
+        graph (LeafGraph): Optional graph built by `leaf_graph` from the same boxes, to reuse its index.
+        exact_crossings (bool): Find the crossings of every boundary segment exactly, see `box_crossings`.
+
+    Returns:
+        dict[int, list[list[int]]]: For each function index, its components, as the increasing numbers of
+        their c1 boxes in the graph. The components are ordered by their smallest box.
+    """
+    graph = leaf_graph(c0_boxes, c1_boxes) if graph is None else graph
+    vertex_signs = VertexSigns(function_list)
+    edge_restrictions = EdgeRestrictions(function_list) if exact_crossings else None
+    sets = [DisjointSets(0) for _ in function_list]
+    crossing_ids = [{} for _ in function_list]
+    owners = [[] for _ in function_list]
+    for k in range(len(c0_boxes), len(graph)):
+        for i, crossings in box_crossings(graph.index, vertex_signs, graph.boxes[k], edge_restrictions).items():
+            for (key1, _), (key2, _) in zip(crossings[0::2], crossings[1::2]):
+                ids = []
+                for key in (key1, key2):
+                    if key not in crossing_ids[i]:
+                        crossing_ids[i][key] = sets[i].add()
+                    ids.append(crossing_ids[i][key])
+                sets[i].union(*ids)
+                owners[i].append((ids[0], k))
+
+    components = {}
+    for i in range(len(function_list)):
+        groups = {}
+        for crossing_id, k in owners[i]:
+            groups.setdefault(sets[i].find(crossing_id), set()).add(k)
+        components[i] = sorted((sorted(group) for group in groups.values()), key=lambda group: group[0])
+    return components
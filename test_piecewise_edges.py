@@ -0,0 +1,107 @@
+import math
+import unittest
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+from piecewise_edges import VertexSigns, box_crossings, piecewise_linear_curves
+from simultaneous_approximation import subdivision_with_c1_cross
+from simultaneous_approximation_edges import HORIZONTAL, VERTICAL, EdgeRestrictions, restrict
+from simultaneous_approximation_index import LeafIndex
+from simultaneous_approximation_tools import PVBox, find_neighbors
+
+
+def unit_box():
+    return PVBox(Interval(-1, 1), Interval(-1, 1))
+
+
+class TestLeafIndex(unittest.TestCase):
+
+    def test_neighbors_match_pairwise_scan(self):
+        circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        line = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.1})
+        c0_boxes, c1_boxes = subdivision_with_c1_cross([circle, line], unit_box())
+        leaves = c0_boxes + c1_boxes
+        index = LeafIndex(leaves)
+        for box in leaves:
+            self.assertCountEqual(map(id, index.find_neighbors(box)), map(id, find_neighbors(box, leaves)))
+
+    def test_boundary_vertices_include_smaller_neighbors(self):
+        left = PVBox(Interval(0, 2), Interval(0, 2))
+        upper_right = PVBox(Interval(2, 3), Interval(1, 2))
+        lower_right = PVBox(Interval(2, 3), Interval(0, 1))
+        index = LeafIndex([left, upper_right, lower_right])
+        self.assertEqual(index.boundary_vertices(left), [(0, 0), (2, 0), (2, 1), (2, 2), (0, 2)])
+        self.assertEqual(index.side_coordinates(upper_right, "left_side"), [1, 2])
+
+
+class TestPiecewiseLinearCurves(unittest.TestCase):
+
+    def test_circle_and_line(self):
+        circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        line = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.1})
+        c0_boxes, c1_boxes = subdivision_with_c1_cross([circle, line], unit_box())
+        curves = piecewise_linear_curves([circle, line], c0_boxes, c1_boxes)
+
+        # The circle is one closed polyline close to the true curve
+        self.assertEqual(len(curves[0]), 1)
+        circle_polyline = curves[0][0]
+        self.assertEqual(circle_polyline[0], circle_polyline[-1])
+        for x, y in circle_polyline:
+            self.assertAlmostEqual(math.hypot(x, y), math.sqrt(0.5), delta=0.1)
+
+        # The line is one open polyline from one side of the domain to another
+        self.assertEqual(len(curves[1]), 1)
+        line_polyline = curves[1][0]
+        self.assertNotEqual(line_polyline[0], line_polyline[-1])
+        for x, y in line_polyline:
+            self.assertAlmostEqual(x - y + 0.1, 0)
+
+    def test_binary_split_ellipse(self):
+        ellipse = BivariatePolynomial({(2, 0): 1, (0, 2): 16, (0, 0): -4})
+        initial_box = PVBox(Interval(-4, 4), Interval(-0.5, 0.5))
+        c0_boxes, c1_boxes = subdivision_with_c1_cross([ellipse], initial_box, split="binary")
+        # Leaves of different shapes still meet along whole segments of their boundaries
+        self.assertTrue(any(box.x_interval.width() != box.y_interval.width() for box in c1_boxes))
+        curves = piecewise_linear_curves([ellipse], c0_boxes, c1_boxes)
+        self.assertEqual(len(curves[0]), 1)
+        polyline = curves[0][0]
+        self.assertEqual(polyline[0], polyline[-1])
+        for x, y in polyline:
+            self.assertAlmostEqual(x * x + 16 * y * y, 4, delta=0.5)
+
+
+class TestEdgeRestrictions(unittest.TestCase):
+
+    def setUp(self):
+        # y = x^2 - 1/4
+        self.parabola = BivariatePolynomial({(0, 1): 1, (2, 0): -1, (0, 0): 0.25})
+
+    def test_crossings_are_counted_exactly(self):
+        self.assertEqual(restrict(self.parabola, HORIZONTAL, 0).crossings(-1, 1), [-0.5, 0.5])
+        self.assertEqual(restrict(self.parabola, VERTICAL, 1).crossings(0, 1), [0.75])
+        # The parabola touches the line y = -1/4 without crossing it
+        self.assertEqual(restrict(self.parabola, HORIZONTAL, -0.25).count_crossings(-1, 1), 0)
+        cubic = BivariatePolynomial({(3, 0): 1, (0, 1): -1})
+        self.assertEqual(restrict(cubic, HORIZONTAL, 0).count_crossings(-1, 1), 1)
+
+    def test_segment_with_two_crossings(self):
+        box = PVBox(Interval(-1, 1), Interval(0, 1))
+        index = LeafIndex([box])
+        vertex_signs = VertexSigns([self.parabola])
+        by_sign = box_crossings(index, vertex_signs, box)[0]
+        exact = box_crossings(index, vertex_signs, box, EdgeRestrictions([self.parabola]))[0]
+        # The bottom side has the same sign at both ends, yet the parabola crosses it twice
+        self.assertEqual([point for _, point in by_sign], [(1, 0.75), (-1, 0.75)])
+        self.assertEqual([point for _, point in exact], [(-0.5, 0), (0.5, 0), (1, 0.75), (-1, 0.75)])
+        self.assertEqual(len({key for key, _ in exact}), 4)
+
+    def test_restrictions_are_shared_along_lines(self):
+        circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        edge_restrictions = EdgeRestrictions([circle])
+        self.assertEqual(edge_restrictions.segment_crossings(0, (1, 0.1), (0, 0.1)), [(0.7, 0.1)])
+        self.assertEqual(edge_restrictions.segment_crossings(0, (-1, 0.1), (0, 0.1)), [(-0.7, 0.1)])
+        self.assertEqual((edge_restrictions.restrictions, edge_restrictions.hits), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,347 @@
+import os
+import subprocess
+import sys
+import unittest
+from fractions import Fraction
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+from simultaneous_approximation import SubdivisionBudget, subdivision_with_c1_cross, subdivision_without_c1_cross
+from simultaneous_approximation_ordering import FunctionOrdering
+from simultaneous_approximation_preconditioning import AffinePreconditioner
+from simultaneous_approximation_predicates import VertexCache
+from simultaneous_approximation_splitting import box_splitter, split_axis
+from simultaneous_approximation_tools import ArithmeticPolicy, PVBox
+
+
+def unit_box():
+    return PVBox(Interval(-1, 1), Interval(-1, 1))
+
+
+def total_area(boxes):
+    return sum(box.x_interval.width() * box.y_interval.width() for box in boxes)
+
+
+class TestSubdivisionBudget(unittest.TestCase):
+
+    def setUp(self):
+        # x^2 - y^2 has a singular point at the origin, where both drivers would subdivide forever
+        self.node = BivariatePolynomial({(2, 0): 1, (0, 2): -1})
+
+    def test_max_depth(self):
+        c0_boxes, c1_boxes, undecided_boxes = subdivision_with_c1_cross([self.node], unit_box(),
+                                                                        budget=SubdivisionBudget(max_depth=5))
+        self.assertTrue(undecided_boxes)
+        self.assertTrue(all(box.depth == 5 for box in undecided_boxes))
+        self.assertTrue(any(box.contains_point((0, 0)) for box in undecided_boxes))
+        self.assertAlmostEqual(total_area(c0_boxes + c1_boxes + undecided_boxes), 4)
+
+    def test_min_width(self):
+        budget = SubdivisionBudget(min_width=1 / 16)
+        _, _, undecided_boxes = subdivision_with_c1_cross([self.node], unit_box(), budget=budget)
+        self.assertTrue(undecided_boxes)
+        self.assertTrue(all(box.width() >= 1 / 16 for box in undecided_boxes))
+
+    def test_max_boxes(self):
+        budget = SubdivisionBudget(max_boxes=50)
+        c0_boxes, c1_boxes, undecided_boxes = subdivision_with_c1_cross([self.node], unit_box(), budget=budget)
+        self.assertLessEqual(budget.box_count, 50)
+        self.assertAlmostEqual(total_area(c0_boxes + c1_boxes + undecided_boxes), 4)
+
+    def test_time_limit(self):
+        c0_boxes, c1_boxes, undecided_boxes = subdivision_with_c1_cross([self.node], unit_box(),
+                                                                        budget=SubdivisionBudget(time_limit=0))
+        self.assertEqual((c0_boxes, c1_boxes), ([], []))
+        self.assertEqual(undecided_boxes, [unit_box()])
+
+    def test_without_budget_returns_two_lists(self):
+        circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        self.assertEqual(len(subdivision_with_c1_cross([circle], unit_box())), 2)
+
+
+class TestMemoizedC1Cross(unittest.TestCase):
+
+    def test_matches_unmemoized_driver(self):
+        function_list = [BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})]
+        for k in range(4):
+            function_list.append(BivariatePolynomial({(1, 0): 1, (0, 1): -0.3 * (k + 1), (0, 0): 0.37 * k - 0.5}))
+        c0_boxes, c1_boxes = subdivision_with_c1_cross(function_list, unit_box())
+        memoized_c0_boxes, memoized_c1_boxes = subdivision_with_c1_cross(function_list, unit_box(),
+                                                                         memoize_c1_cross=True)
+        self.assertEqual(memoized_c0_boxes, c0_boxes)
+        self.assertEqual(memoized_c1_boxes, c1_boxes)
+        self.assertEqual([box.C1Prime for box in memoized_c1_boxes], [box.C1Prime for box in c1_boxes])
+
+
+class TestArithmeticPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        self.line = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.1})
+
+    def test_escalates(self):
+        policy = ArithmeticPolicy("adaptive", exact_width=0.5)
+        self.assertTrue(policy.escalates(PVBox(Interval(0, 0.5), Interval(0, 0.5))))
+        self.assertFalse(policy.escalates(PVBox(Interval(0, 1), Interval(0, 1))))
+        self.assertFalse(ArithmeticPolicy("exact").escalates(PVBox(Interval(0, 0.5), Interval(0, 0.5))))
+
+    def test_exact_cross_product(self):
+        # f_x * g_y - f_y * g_x = 2x * (-1) - 2y * 1
+        cross_product = ArithmeticPolicy("adaptive").exact_cross_product(self.circle, self.line)
+        self.assertEqual(cross_product.coefficients, {(1, 0): -2, (0, 1): -2})
+        self.assertTrue(all(isinstance(coefficient, Fraction) for coefficient in cross_product.coefficients.values()))
+
+    def test_exact_enclosure_has_no_rounding(self):
+        # 0.1 is not a dyadic rational, so float evaluation rounds while exact evaluation does not
+        policy = ArithmeticPolicy("exact")
+        enclosure = policy.evaluate(self.line, PVBox(Interval(0, 0.5), Interval(0, 0.5)))
+        self.assertEqual(enclosure, Interval(Fraction(0.1) - Fraction(1, 2), Fraction(0.1) + Fraction(1, 2)))
+
+    def test_modes_agree_on_regular_system(self):
+        reference = subdivision_with_c1_cross([self.circle, self.line], unit_box())
+        for mode in ("adaptive", "exact"):
+            self.assertEqual(subdivision_with_c1_cross([self.circle, self.line], unit_box(), arithmetic=mode),
+                             reference)
+
+    def test_adaptive_mode_certifies_tangency_neighborhoods(self):
+        # Two circles touching from inside at (0.9, 0): near the tangency, the C1-cross test from separate
+        # enclosures of the partial derivatives fails on many neighborhoods where the cross product does not vanish
+        outer = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.81})
+        inner = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (1, 0): -0.8, (0, 0): -0.09})
+        policy = ArithmeticPolicy("adaptive")
+        budget = lambda: SubdivisionBudget(min_width=2 ** -10)
+        reference = subdivision_with_c1_cross([outer, inner], unit_box(), budget=budget())
+        result = subdivision_with_c1_cross([outer, inner], unit_box(), budget=budget(), arithmetic=policy)
+        self.assertGreater(policy.certified_escalations, 0)
+        self.assertLess(sum(map(len, result)), sum(map(len, reference)))
+        self.assertLess(len(result[2]), len(reference[2]))
+        self.assertAlmostEqual(total_area(result[0] + result[1] + result[2]), 4)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            ArithmeticPolicy("quad")
+
+
+class TestFunctionOrdering(unittest.TestCase):
+
+    def setUp(self):
+        lines = [BivariatePolynomial({(1, 0): 1, (0, 1): -0.3 * (k + 1), (0, 0): 0.37 * k - 0.5}) for k in range(5)]
+        far_circles = [BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -(4 + k)}) for k in range(4)]
+        self.function_list = far_circles + lines
+
+    @staticmethod
+    def describe(result):
+        return [[(str(box), box.C0_predicate, box.C1_predicate, box.C1Prime) for box in boxes] for boxes in result]
+
+    def test_order_does_not_change_classification(self):
+        for driver in (subdivision_without_c1_cross, subdivision_with_c1_cross):
+            reference = driver(self.function_list, unit_box())
+            for learn in (False, True):
+                ordering = FunctionOrdering(self.function_list, learn=learn)
+                result = driver(self.function_list, unit_box(), function_ordering=ordering)
+                self.assertEqual(self.describe(result), self.describe(reference))
+
+    def test_learned_order_saves_evaluations(self):
+        baseline = FunctionOrdering(self.function_list, learn=False)
+        learned = FunctionOrdering(self.function_list)
+        subdivision_with_c1_cross(self.function_list, unit_box(), function_ordering=baseline)
+        subdivision_with_c1_cross(self.function_list, unit_box(), function_ordering=learned)
+        self.assertLess(learned.evaluations, baseline.evaluations)
+        self.assertGreater(learned.saved_evaluations, 0)
+        # The far circles never carry a curve through the unit box, so they never decide
+        self.assertEqual(learned.decisions[:4], [0, 0, 0, 0])
+
+
+class TestVertexCache(unittest.TestCase):
+
+    def setUp(self):
+        circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        line = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.1})
+        cubic = BivariatePolynomial({(3, 0): 1, (0, 1): -1, (1, 0): -0.3})
+        self.function_list = [circle, line, cubic]
+
+    def test_screen_does_not_change_classification(self):
+        describe = TestFunctionOrdering.describe
+        for driver in (subdivision_without_c1_cross, subdivision_with_c1_cross):
+            for arithmetic in ("float", "exact"):
+                reference = driver(self.function_list, unit_box(), arithmetic=arithmetic, vertex_cache=False)
+                result = driver(self.function_list, unit_box(), arithmetic=arithmetic, vertex_cache=True)
+                self.assertEqual(describe(result), describe(reference))
+
+    def test_samples_are_shared_and_enclosures_avoided(self):
+        vertex_cache = VertexCache()
+        subdivision_with_c1_cross(self.function_list, unit_box(), vertex_cache=vertex_cache)
+        self.assertGreater(vertex_cache.avoided_enclosures, 0)
+        # Most corners and midpoints are shared with neighbors, parents or children
+        self.assertGreater(vertex_cache.hits, vertex_cache.evaluations)
+
+    def test_bounded_cache(self):
+        describe = TestFunctionOrdering.describe
+        reference = subdivision_with_c1_cross(self.function_list, unit_box())
+        vertex_cache = VertexCache(max_entries=8)
+        result = subdivision_with_c1_cross(self.function_list, unit_box(), vertex_cache=vertex_cache)
+        self.assertEqual(describe(result), describe(reference))
+        self.assertLessEqual(len(vertex_cache.signs), 8)
+        self.assertGreater(vertex_cache.evaluations, 8)
+
+
+class TestBinarySplit(unittest.TestCase):
+
+    def setUp(self):
+        self.ellipse = BivariatePolynomial({(2, 0): 1, (0, 2): 16, (0, 0): -4})
+        self.elongated_box = lambda: PVBox(Interval(-4, 4), Interval(-0.5, 0.5))
+
+    def test_axis_follows_aspect_ratio_and_gradient(self):
+        self.assertEqual(split_axis([self.ellipse], self.elongated_box()), "x")
+        self.assertEqual(split_axis([self.ellipse], PVBox(Interval(0, 0.5), Interval(-4, 4))), "y")
+        # Near the flat cubic y = x^3 / 5 - 1/10 the function varies mostly with y
+        cubic = BivariatePolynomial({(0, 1): 1, (3, 0): -0.2, (0, 0): 0.1})
+        self.assertEqual(split_axis([cubic], PVBox(Interval(-0.5, 0.5), Interval(-0.5, 0.5))), "y")
+
+    def test_leaves_tile_the_domain(self):
+        circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        line = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.1})
+        for driver in (subdivision_without_c1_cross, subdivision_with_c1_cross):
+            c0_boxes, c1_boxes = driver([circle, line], unit_box(), split="binary")
+            self.assertAlmostEqual(total_area(c0_boxes + c1_boxes), 4)
+
+    def test_fewer_boxes_on_elongated_domain(self):
+        leaves = {}
+        for split in ("quadtree", "binary"):
+            c0_boxes, c1_boxes = subdivision_with_c1_cross([self.ellipse], self.elongated_box(), split=split)
+            self.assertAlmostEqual(total_area(c0_boxes + c1_boxes), 8)
+            leaves[split] = len(c0_boxes) + len(c1_boxes)
+        self.assertLess(leaves["binary"], leaves["quadtree"])
+
+    def test_enclosures_are_released(self):
+        for split in ("quadtree", "binary"):
+            c0_boxes, c1_boxes = subdivision_with_c1_cross([self.ellipse], self.elongated_box(), split=split)
+            for box in c0_boxes + c1_boxes:
+                while box is not None:
+                    self.assertFalse(hasattr(box, "enclosures"))
+                    box = box.parent
+
+    def test_unknown_split_mode(self):
+        with self.assertRaises(ValueError):
+            box_splitter([self.ellipse], "octree")
+
+
+class TestFrontierEngine(unittest.TestCase):
+
+    def setUp(self):
+        circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        line = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.1})
+        quartic = BivariatePolynomial({(4, 0): 1, (0, 4): 1, (2, 2): -3, (0, 0): -0.2})
+        self.function_list = [circle, line, quartic]
+
+    @staticmethod
+    def describe(result):
+        return [[(box.x_interval.lower_bound, box.x_interval.upper_bound, box.y_interval.lower_bound,
+                  box.y_interval.upper_bound, box.depth, box.C0_predicate, box.C1_predicate, box.C1Prime)
+                 for box in boxes] for boxes in result]
+
+    def test_matches_object_engine(self):
+        for driver in (subdivision_without_c1_cross, subdivision_with_c1_cross):
+            for function_list in (self.function_list[:2], self.function_list):
+                for vertex_cache in (True, False):
+                    reference = driver(function_list, unit_box(), vertex_cache=vertex_cache)
+                    result = driver(function_list, unit_box(), vertex_cache=vertex_cache, engine="frontier")
+                    self.assertEqual(self.describe(result), self.describe(reference))
+
+    def test_matches_object_engine_under_budget(self):
+        for budget in (lambda: SubdivisionBudget(max_depth=3), lambda: SubdivisionBudget(max_boxes=60),
+                       lambda: SubdivisionBudget(min_width=0.1)):
+            reference_budget, frontier_budget = budget(), budget()
+            reference = subdivision_with_c1_cross(self.function_list, unit_box(), budget=reference_budget)
+            result = subdivision_with_c1_cross(self.function_list, unit_box(), budget=frontier_budget,
+                                               engine="frontier")
+            self.assertEqual(self.describe(result), self.describe(reference))
+            self.assertEqual(frontier_budget.box_count, reference_budget.box_count)
+
+    def test_unsupported_options(self):
+        for options in ({"arithmetic": "exact"}, {"split": "binary"}, {"function_ordering": True},
+                        {"memoize_c1_cross": True}):
+            with self.assertRaises(ValueError):
+                subdivision_with_c1_cross(self.function_list, unit_box(), engine="frontier", **options)
+        with self.assertRaises(ValueError):
+            subdivision_without_c1_cross(self.function_list, unit_box(), engine="vectorized")
+
+
+class TestPreconditioning(unittest.TestCase):
+
+    @staticmethod
+    def shifted_system(x_shift, y_shift):
+        # A sextic with two loops and a cubic crossing them, centered at (x_shift, y_shift), with integer
+        # coefficients so that the shifted polynomials are represented exactly
+        x = BivariatePolynomial({(1, 0): 1, (0, 0): -x_shift})
+        y = BivariatePolynomial({(0, 1): 1, (0, 0): -y_shift})
+        sextic = BivariatePolynomial({(0, 0): 8}) * (x * x + y * y) ** 3 - BivariatePolynomial({(0, 0): 8}) * x * x
+        sextic += BivariatePolynomial({(0, 0): 1})
+        cubic = x ** 3 - y + x * y ** 4
+        return [sextic, cubic]
+
+    @staticmethod
+    def describe(result, x_shift=0, y_shift=0):
+        return [[(box.x_interval.lower_bound - x_shift, box.x_interval.upper_bound - x_shift,
+                  box.y_interval.lower_bound - y_shift, box.y_interval.upper_bound - y_shift,
+                  box.depth, box.C0_predicate, box.C1_predicate, box.C1Prime)
+                 for box in boxes] for boxes in result]
+
+    def test_normalized_polynomial(self):
+        ellipse = BivariatePolynomial({(2, 0): 1, (1, 0): -20, (0, 2): 0.25, (0, 1): 0.5, (0, 0): 99.25})
+        preconditioner = AffinePreconditioner(PVBox(Interval(9, 11), Interval(-3, 1)))
+        # (x - 10)^2 + (y + 1)^2 / 4 - 1 with x = 10 + u and y = -1 + 2v, and 4 (u^2 + v^2 - 1) scaled down
+        self.assertEqual(preconditioner.normalize(ellipse * 4).coefficients, {(2, 0): 1.0, (0, 2): 1.0, (0, 0): -1.0})
+        with self.assertRaises(ValueError):
+            AffinePreconditioner(PVBox(Interval(1, 1), Interval(0, 1)))
+
+    def test_off_center_run_matches_centered_run(self):
+        def square(center):
+            return PVBox(Interval(center - 2, center + 2), Interval(center - 2, center + 2))
+
+        budget = lambda: SubdivisionBudget(max_depth=8)
+        centered = subdivision_with_c1_cross(self.shifted_system(0, 0), square(0), budget=budget())
+        for engine in ("objects", "frontier"):
+            shifted = subdivision_with_c1_cross(self.shifted_system(300, 300), square(300), budget=budget(),
+                                                engine=engine, precondition=True)
+            self.assertEqual(self.describe(shifted, 300, 300), self.describe(centered))
+        # Without preconditioning, rounding errors at coordinates near 300 blur the signs at the samples
+        plain = subdivision_with_c1_cross(self.shifted_system(300, 300), square(300), budget=budget(),
+                                          vertex_cache=True)
+        self.assertGreater(sum(map(len, plain)), sum(map(len, shifted)))
+
+    def test_sides_of_the_domain_are_kept(self):
+        box = PVBox(Interval(0.1, 0.7), Interval(-1e3, 3e3))
+        line = BivariatePolynomial({(1, 0): 1000, (0, 1): -1, (0, 0): -400})
+        c0_boxes, c1_boxes = subdivision_with_c1_cross([line], box, precondition=True)
+        leaves = c0_boxes + c1_boxes
+        self.assertEqual(min(leaf.x_interval.lower_bound for leaf in leaves), 0.1)
+        self.assertEqual(max(leaf.x_interval.upper_bound for leaf in leaves), 0.7)
+        self.assertEqual(max(leaf.y_interval.upper_bound for leaf in leaves), 3e3)
+        self.assertAlmostEqual(total_area(leaves), 0.6 * 4e3)
+
+    def test_exact_arithmetic_and_budget(self):
+        box = PVBox(Interval(Fraction(99), Fraction(101)), Interval(Fraction(-1), Fraction(1)))
+        circle = BivariatePolynomial({(2, 0): 1, (1, 0): -200, (0, 2): 1, (0, 0): 9999.5})
+        budget = SubdivisionBudget(min_width=0.2)
+        c0_boxes, c1_boxes, undecided = subdivision_without_c1_cross([circle], box, budget=budget, arithmetic="exact",
+                                                                     precondition=True)
+        leaves = c0_boxes + c1_boxes + undecided
+        self.assertEqual(total_area(leaves), 4)
+        self.assertTrue(all(isinstance(leaf.x_interval.lower_bound, Fraction) for leaf in leaves))
+        self.assertGreaterEqual(min(leaf.width() for leaf in leaves), 0.2)
+        self.assertEqual(budget.min_width, 0.2)
+
+
+class TestImportPath(unittest.TestCase):
+
+    def test_core_does_not_import_sympy(self):
+        # A fresh interpreter, since the test process may already have imported sympy
+        code = "import sys, simultaneous_approximation; print('sympy' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                check=True, capture_output=True, text=True).stdout
+        self.assertEqual(output.strip(), "False")
+
+
+if __name__ == '__main__':
+    unittest.main()
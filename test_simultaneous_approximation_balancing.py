@@ -0,0 +1,53 @@
+import unittest
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from simultaneous_approximation_balancing import balance_subdivision, quadtree_cell
+from simultaneous_approximation_index import LeafIndex
+from simultaneous_approximation_tools import PVBox
+
+
+def corner_refined_subdivision(root, point, depth):
+    """ Subdivide only the box containing a point, `depth` times. """
+    leaves = [root]
+    for _ in range(depth):
+        target = next(box for box in leaves if box.contains_point(point))
+        leaves.remove(target)
+        leaves.extend(target.subdivide())
+    return leaves
+
+
+class TestBalanceSubdivision(unittest.TestCase):
+
+    def test_quadtree_cell(self):
+        root = PVBox(Interval(0, 2), Interval(0, 4))
+        self.assertEqual(quadtree_cell(root, root), (0, 0, 0))
+        self.assertEqual(quadtree_cell(root, PVBox(Interval(1.5, 2), Interval(1, 2))), (2, 3, 1))
+        with self.assertRaises(ValueError):
+            quadtree_cell(root, PVBox(Interval(0, 1), Interval(0, 4)))
+
+    def test_two_to_one_condition(self):
+        root = PVBox(Interval(0, 1), Interval(0, 1))
+        leaves = corner_refined_subdivision(root, (0.4999, 0.4999), 10)
+        c1_leaf = next(box for box in leaves if box.contains_point((0.9, 0.9)))
+        for box in leaves:
+            box.C0_predicate = box is not c1_leaf
+        c1_leaf.C1_predicate = True
+        c1_leaf.C1Prime = True
+        c0_boxes = [box for box in leaves if box is not c1_leaf]
+
+        balanced_c0_boxes, balanced_c1_boxes = balance_subdivision(root, (c0_boxes, [c1_leaf]))
+        balanced_leaves = balanced_c0_boxes + balanced_c1_boxes
+        self.assertGreater(len(balanced_leaves), len(leaves))
+        self.assertAlmostEqual(sum(box.x_interval.width() * box.y_interval.width() for box in balanced_leaves), 1)
+        self.assertTrue(all(box.C0_predicate for box in balanced_c0_boxes))
+        self.assertTrue(all(box.C1_predicate and box.C1Prime for box in balanced_c1_boxes))
+
+        index = LeafIndex(balanced_leaves)
+        for box in balanced_leaves:
+            level = quadtree_cell(root, box)[0]
+            for neighbor in index.find_neighbors(box):
+                self.assertLessEqual(abs(quadtree_cell(root, neighbor)[0] - level), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+from simultaneous_approximation import SubdivisionBudget, subdivision_with_c1_cross, subdivision_without_c1_cross
+from simultaneous_approximation_batch import SubdivisionJob, estimate_job_costs, run_batch, run_batch_ordered
+from simultaneous_approximation_tools import PVBox
+
+
+def unit_box():
+    return PVBox(Interval(-1, 1), Interval(-1, 1))
+
+
+def describe(result):
+    return [[(float(box.x_interval.lower_bound), float(box.x_interval.upper_bound), float(box.y_interval.lower_bound),
+              float(box.y_interval.upper_bound), box.C1Prime) for box in box_list] for box_list in result]
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        self.line = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.1})
+        self.cubic = BivariatePolynomial({(3, 0): 1, (0, 1): -1, (1, 0): -0.3})
+        self.jobs = [
+            ([self.circle, self.line], unit_box(), {}),
+            ([self.circle], unit_box(), {"driver": "without_c1_cross"}),
+            ([self.circle, self.line, self.cubic], unit_box(), {"budget": SubdivisionBudget(max_depth=3)}),
+            ([self.line, self.cubic], PVBox(Interval(-1, 0.5), Interval(-0.75, 1)), {"arithmetic": "adaptive"}),
+        ]
+        self.expected = [
+            subdivision_with_c1_cross([self.circle, self.line], unit_box()),
+            subdivision_without_c1_cross([self.circle], unit_box()),
+            subdivision_with_c1_cross([self.circle, self.line, self.cubic], unit_box(),
+                                      budget=SubdivisionBudget(max_depth=3)),
+            subdivision_with_c1_cross([self.line, self.cubic], PVBox(Interval(-1, 0.5), Interval(-0.75, 1)),
+                                      arithmetic="adaptive"),
+        ]
+
+    def test_in_process_batch_matches_drivers(self):
+        results = run_batch_ordered(self.jobs, processes=0)
+        self.assertEqual([describe(result) for result in results], [describe(result) for result in self.expected])
+
+    def test_pool_batch_matches_drivers(self):
+        results = dict(run_batch(self.jobs, processes=2))
+        self.assertEqual(sorted(results), [0, 1, 2, 3])
+        for index, expected in enumerate(self.expected):
+            self.assertEqual(describe(results[index]), describe(expected))
+
+    def test_costs_favor_larger_systems(self):
+        jobs = [SubdivisionJob([self.line], unit_box()),
+                SubdivisionJob([self.circle, self.line, self.cubic], unit_box())]
+        small, large = estimate_job_costs(jobs)
+        self.assertLess(small, large)
+
+    def test_unknown_driver(self):
+        with self.assertRaises(ValueError):
+            SubdivisionJob([self.line], unit_box(), {"driver": "fastest"})
+
+
+if __name__ == '__main__':
+    unittest.main()
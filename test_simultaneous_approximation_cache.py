@@ -0,0 +1,72 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+import simultaneous_approximation_cache
+from simultaneous_approximation import subdivision_with_c1_cross
+from simultaneous_approximation_cache import SubdivisionCache, cached_subdivision, subdivision_cache_key
+from simultaneous_approximation_serialization import pack_boxes, unpack_boxes
+from simultaneous_approximation_tools import PVBox
+
+
+def unit_box():
+    return PVBox(Interval(-1, 1), Interval(-1, 1))
+
+
+class TestSubdivisionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        self.line = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.1})
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_pack_round_trip(self):
+        c0_boxes, c1_boxes = subdivision_with_c1_cross([self.circle, self.line], unit_box())
+        restored_c0, restored_c1, undecided = unpack_boxes(pack_boxes(c0_boxes, c1_boxes))
+        self.assertEqual(restored_c0, c0_boxes)
+        self.assertEqual(restored_c1, c1_boxes)
+        self.assertEqual(undecided, [])
+        self.assertEqual([box.C1Prime for box in restored_c1], [box.C1Prime for box in c1_boxes])
+
+    def test_key_is_canonical(self):
+        reordered = BivariatePolynomial({(0, 0): -0.5, (0, 2): 1.0, (2, 0): 1})
+        self.assertEqual(subdivision_cache_key([self.circle], unit_box()),
+                         subdivision_cache_key([reordered], unit_box()))
+        self.assertNotEqual(subdivision_cache_key([self.circle], unit_box()),
+                            subdivision_cache_key([self.circle], unit_box(), neighborhood_factor=4))
+        self.assertNotEqual(subdivision_cache_key([self.circle], unit_box()),
+                            subdivision_cache_key([self.circle], unit_box(), driver="without_c1_cross"))
+        self.assertNotEqual(subdivision_cache_key([self.circle], unit_box()),
+                            subdivision_cache_key([self.circle], unit_box(), split="binary"))
+        self.assertNotEqual(subdivision_cache_key([self.circle], unit_box()),
+                            subdivision_cache_key([self.circle], unit_box(), precondition=True))
+
+    def test_key_depends_on_algorithm_version(self):
+        key = subdivision_cache_key([self.circle], unit_box())
+        version = simultaneous_approximation_cache.SUBDIVISION_ALGORITHM_VERSION
+        with mock.patch.object(simultaneous_approximation_cache, "SUBDIVISION_ALGORITHM_VERSION", version + 1):
+            self.assertNotEqual(subdivision_cache_key([self.circle], unit_box()), key)
+        self.assertEqual(subdivision_cache_key([self.circle], unit_box()), key)
+
+    def test_repeat_run_hits_cache(self):
+        cache = SubdivisionCache(self.directory.name)
+        first = cached_subdivision([self.circle, self.line], unit_box(), cache)
+        second = cached_subdivision([self.circle, self.line], unit_box(), cache)
+        self.assertEqual(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_eviction_respects_size_bound(self):
+        cache = SubdivisionCache(self.directory.name, max_bytes=100)
+        cache.put("a", b"x" * 60)
+        cache.put("b", b"y" * 60)
+        self.assertNotIn("a", cache)
+        self.assertIn("b", cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import random
+import unittest
+from fractions import Fraction
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+from simultaneous_approximation_kernels import KERNEL_BACKENDS, compiled_polynomial, kernels
+from simultaneous_approximation_predicates import (_squared_norm_contains_zero, c0_predicate, c1_predicate,
+                                                   monotone_enclosure)
+from simultaneous_approximation_tools import PVBox, evaluate_bivariate_over_box
+
+
+class TestEnclosureKernels(unittest.TestCase):
+
+    def setUp(self):
+        self.circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        self.cubic = BivariatePolynomial({(3, 0): 1, (0, 1): -1, (1, 0): -0.3, (1, 1): 0.7})
+
+    def test_enclosure_contains_sampled_values(self):
+        generator = random.Random(1)
+        for _ in range(50):
+            x_lower, y_lower = generator.uniform(-1, 1), generator.uniform(-1, 1)
+            box = PVBox(Interval(x_lower, x_lower + 0.3), Interval(y_lower, y_lower + 0.2))
+            enclosure = evaluate_bivariate_over_box(self.cubic, box)
+            for _ in range(20):
+                point = (generator.uniform(x_lower, x_lower + 0.3), generator.uniform(y_lower, y_lower + 0.2))
+                value = self.cubic.evaluate(point)
+                self.assertTrue(enclosure.lower_bound - 1e-12 <= value <= enclosure.upper_bound + 1e-12)
+
+    def test_even_powers_are_one_sided(self):
+        # Centered at the origin, x^2 + y^2 - 0.5 ranges over [-0.5, 1.5] on [-1, 1]^2
+        enclosure = evaluate_bivariate_over_box(self.circle, PVBox(Interval(-1, 1), Interval(-1, 1)))
+        self.assertEqual(enclosure, Interval(-0.5, 1.5))
+
+    def test_fraction_boxes_are_exact(self):
+        function = BivariatePolynomial({(1, 1): Fraction(1, 3), (0, 0): Fraction(1, 7)})
+        box = PVBox(Interval(Fraction(0), Fraction(1)), Interval(Fraction(0), Fraction(1)))
+        enclosure = evaluate_bivariate_over_box(function, box)
+        self.assertIsInstance(enclosure.lower_bound, Fraction)
+        self.assertEqual(enclosure, Interval(Fraction(1, 7) - Fraction(1, 6), Fraction(1, 7) + Fraction(1, 3)))
+
+    def test_backends_agree(self):
+        bounds = (-0.25, 0.5, 0.125, 0.75)
+        results = set()
+        for backend in KERNEL_BACKENDS:
+            compiled = compiled_polynomial(self.cubic, backend)
+            lower, upper = kernels(backend).polynomial_enclosure(compiled.coefficients, compiled.degree, *bounds)
+            results.add((float(lower), float(upper)))
+        self.assertEqual(len(results), 1)
+
+    def test_point_and_edge_kernels(self):
+        compiled = compiled_polynomial(self.cubic, "python")
+        kernel_set = kernels("python")
+        self.assertAlmostEqual(kernel_set.polynomial_value(compiled.coefficients, compiled.degree, 0.5, -0.25),
+                               self.cubic.evaluate((0.5, -0.25)))
+        # Restricted to x = 0.5 the cubic is linear in y, so its edge enclosure is exact
+        lower, upper = kernel_set.vertical_edge_enclosure(compiled.coefficients, compiled.degree, 0.5, -1, 1)
+        self.assertAlmostEqual(lower, self.cubic.evaluate((0.5, 1)))
+        self.assertAlmostEqual(upper, self.cubic.evaluate((0.5, -1)))
+        lower, upper = kernel_set.horizontal_edge_enclosure(compiled.coefficients, compiled.degree, 0, 1, 0)
+        self.assertLessEqual(lower, self.cubic.evaluate((0.5, 0)))
+        self.assertGreaterEqual(upper, self.cubic.evaluate((0, 0)))
+
+    def test_monotone_enclosure_is_tighter(self):
+        # x^2 + y^2 - 0.5 increases in both directions on [0.1, 0.8]^2, so its range is given by two corners
+        box = PVBox(Interval(0.1, 0.8), Interval(0.1, 0.8))
+        taylor = evaluate_bivariate_over_box(self.circle, box)
+        lower, upper = monotone_enclosure(compiled_polynomial(self.circle), box)
+        self.assertLess(taylor.lower_bound, lower)
+        self.assertAlmostEqual(lower, -0.48)
+        self.assertAlmostEqual(upper, 0.78)
+        # The Taylor form alone contains zero on this box, the monotone enclosure excludes it
+        box = PVBox(Interval(0.6, 1.0), Interval(0.4, 0.8))
+        self.assertTrue(evaluate_bivariate_over_box(self.circle, box).contains_zero())
+        self.assertTrue(c0_predicate([self.circle], box))
+
+    def test_squared_gradient_is_one_sided(self):
+        # The gradient (2x, 1) of x^2 + y never vanishes, although its x component changes sign
+        parabola = BivariatePolynomial({(2, 0): 1, (0, 1): 1})
+        self.assertTrue(c1_predicate([parabola], PVBox(Interval(-1, 1), Interval(-1, 1))))
+        # The squares of f_x over [-2, 2] and of f_y = 1 add up to at least 1
+        self.assertFalse(_squared_norm_contains_zero((-2, 2), (1, 1)))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            kernels("opencl")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+from simultaneous_approximation import (C0_BOX, SubdivisionBudget, classify_box_with_c1_cross,
+                                       subdivision_with_c1_cross, subdivision_without_c1_cross)
+from simultaneous_approximation_predicates import c0_predicate
+from simultaneous_approximation_refinement import changed_functions, refine, update_subdivision
+from simultaneous_approximation_tools import PVBox
+
+
+def unit_box():
+    return PVBox(Interval(-1, 1), Interval(-1, 1))
+
+
+def total_area(boxes):
+    return sum(box.x_interval.width() * box.y_interval.width() for box in boxes)
+
+
+class TestUpdateSubdivision(unittest.TestCase):
+
+    def setUp(self):
+        self.circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        self.line = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.1})
+        self.moved_line = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): -0.2})
+
+    def test_changed_functions(self):
+        self.assertEqual(changed_functions([self.circle], [self.circle, self.line]), [self.line])
+        self.assertEqual(changed_functions([self.circle, self.line], [self.circle, self.moved_line]),
+                         [self.line, self.moved_line])
+        self.assertEqual(changed_functions([self.circle], [self.circle]), [])
+
+    def test_adding_a_curve_keeps_unaffected_leaves(self):
+        previous = subdivision_with_c1_cross([self.circle], unit_box())
+        c0_boxes, c1_boxes = update_subdivision(previous, [self.circle], [self.circle, self.line])
+
+        self.assertAlmostEqual(total_area(c0_boxes + c1_boxes), 4)
+        kept = [box for box in previous[0] + previous[1] if c0_predicate([self.line], box)]
+        updated_ids = {id(box) for box in c0_boxes + c1_boxes}
+        self.assertTrue(kept)
+        self.assertTrue(all(id(box) in updated_ids for box in kept))
+        for box in c0_boxes:
+            self.assertEqual(classify_box_with_c1_cross([self.circle, self.line], box), C0_BOX)
+
+    def test_modifying_a_curve(self):
+        system = [self.circle, self.line]
+        edited_system = [self.circle, self.moved_line]
+        previous = subdivision_with_c1_cross(system, unit_box())
+        c0_boxes, c1_boxes = update_subdivision(previous, system, edited_system)
+        self.assertAlmostEqual(total_area(c0_boxes + c1_boxes), 4)
+        for box in c0_boxes:
+            self.assertTrue(c0_predicate(edited_system, box))
+
+    def test_enclosures_are_released(self):
+        previous = subdivision_with_c1_cross([self.circle], unit_box())
+        c0_boxes, c1_boxes = update_subdivision(previous, [self.circle], [self.circle, self.line])
+        self.assertFalse([box for box in c0_boxes + c1_boxes if hasattr(box, "enclosures")])
+
+    def test_curve_free_function_without_c1_cross(self):
+        # A function without real zeros passes C0 everywhere, but its critical point inside the box makes
+        # the C0-C1 test of the driver without C1-cross fail where it is the only function passing C0
+        curve_free = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (1, 0): -0.6, (0, 1): -0.2, (0, 0): 1})
+        system = [self.circle, self.line]
+        previous = subdivision_without_c1_cross(system, unit_box())
+        updated = update_subdivision(previous, system, system + [curve_free], with_c1_cross=False)
+        expected = subdivision_without_c1_cross(system + [curve_free], unit_box())
+        self.assertEqual(sorted(map(len, updated)), sorted(map(len, expected)))
+        self.assertAlmostEqual(total_area(updated[0] + updated[1]), 4)
+
+    def test_exact_arithmetic(self):
+        system = [self.circle, self.line]
+        previous = subdivision_with_c1_cross(system, unit_box(), arithmetic="exact")
+        c0_boxes, c1_boxes = update_subdivision(previous, system, [self.circle, self.moved_line],
+                                                arithmetic="exact")
+        self.assertAlmostEqual(total_area(c0_boxes + c1_boxes), 4)
+
+
+class TestRefine(unittest.TestCase):
+
+    def setUp(self):
+        self.circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        self.line = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.1})
+
+    def test_refines_only_inside_window(self):
+        system = [self.circle, self.line]
+        previous = subdivision_with_c1_cross(system, unit_box())
+        window = PVBox(Interval(0, 0.5), Interval(0, 0.5))
+        c0_boxes, c1_boxes = refine(previous, window, 1 / 64, system)
+
+        self.assertAlmostEqual(total_area(c0_boxes + c1_boxes), 4)
+        inside = [box for box in c0_boxes + c1_boxes
+                  if box.x_interval.lower_bound >= 0 and box.x_interval.upper_bound <= 0.5
+                  and box.y_interval.lower_bound >= 0 and box.y_interval.upper_bound <= 0.5]
+        self.assertAlmostEqual(total_area(inside), 0.25)
+        self.assertTrue(all(box.width() <= 1 / 64 for box in inside))
+
+        outside_ids = {id(box) for box in previous[0] + previous[1]
+                       if box.x_interval.lower_bound >= 0.5 or box.y_interval.upper_bound <= 0}
+        refined_ids = {id(box) for box in c0_boxes + c1_boxes}
+        self.assertTrue(outside_ids <= refined_ids)
+        for box in c0_boxes:
+            self.assertTrue(c0_predicate(system, box))
+
+    def test_undecided_boxes_are_kept(self):
+        system = [self.circle, self.line]
+        previous = subdivision_with_c1_cross(system, unit_box(), budget=SubdivisionBudget(max_depth=2))
+        self.assertTrue(previous[2])
+        window = PVBox(Interval(-1, 1), Interval(-1, 1))
+        c0_boxes, c1_boxes, undecided_boxes = refine(previous, window, 1 / 8, system)
+        self.assertEqual(undecided_boxes, previous[2])
+        self.assertAlmostEqual(total_area(c0_boxes + c1_boxes + undecided_boxes), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+from polynomial_library.polynomial_parser import parse_polynomial
+from simultaneous_approximation import SubdivisionBudget, subdivision_with_c1_cross
+from simultaneous_approximation_service import SubdivisionClient, SubdivisionService, decode_request, encode_request
+from simultaneous_approximation_tools import PVBox
+
+
+def unit_box():
+    return PVBox(Interval(-1, 1), Interval(-1, 1))
+
+
+def bounds(boxes):
+    return [(box.x_interval.lower_bound, box.x_interval.upper_bound,
+             box.y_interval.lower_bound, box.y_interval.upper_bound, box.C1Prime) for box in boxes]
+
+
+class TestSubdivisionService(unittest.TestCase):
+
+    def setUp(self):
+        self.circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        self.line = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.1})
+
+    def run_with_service(self, scenario, **service_options):
+        async def main():
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "service.sock")
+                service = SubdivisionService(max_workers=1, **service_options)
+                await service.start(path=path)
+                try:
+                    return await scenario(service, path)
+                finally:
+                    await service.close()
+        return asyncio.run(main())
+
+    def test_identical_requests_are_coalesced(self):
+        async def scenario(service, path):
+            clients = [await SubdivisionClient.connect(path) for _ in range(3)]
+            results = await asyncio.gather(*(client.subdivide([self.circle, self.line], unit_box())
+                                             for client in clients))
+            for client in clients:
+                await client.close()
+            return results, service.coalesced
+
+        results, coalesced = self.run_with_service(scenario)
+        c0_boxes, c1_boxes = subdivision_with_c1_cross([self.circle, self.line], unit_box())
+        for result_c0, result_c1, undecided in results:
+            self.assertEqual(bounds(result_c0), bounds(c0_boxes))
+            self.assertEqual(bounds(result_c1), bounds(c1_boxes))
+            self.assertEqual(undecided, [])
+        self.assertEqual(coalesced, 2)
+
+    def test_service_caps_job_budget(self):
+        async def scenario(service, path):
+            client = await SubdivisionClient.connect(path)
+            result = await client.subdivide([self.circle, self.line], unit_box(), budget={"max_depth": 10})
+            await client.close()
+            return result
+
+        _, _, undecided = self.run_with_service(scenario, budget_limits={"max_depth": 2})
+        _, _, expected = subdivision_with_c1_cross([self.circle, self.line], unit_box(),
+                                                   budget=SubdivisionBudget(max_depth=2))
+        self.assertEqual(bounds(undecided), bounds(expected))
+        self.assertTrue(undecided)
+
+    def test_errors_are_reported(self):
+        async def scenario(service, path):
+            client = await SubdivisionClient.connect(path)
+            try:
+                with self.assertRaises(RuntimeError):
+                    await client.subdivide([self.line], unit_box(), arithmetic="quad")
+                # The connection stays usable after an error
+                return await client.subdivide([self.line], unit_box())
+            finally:
+                await client.close()
+
+        c0_boxes, c1_boxes, _ = self.run_with_service(scenario)
+        self.assertTrue(c1_boxes)
+
+    def test_malformed_request(self):
+        with self.assertRaises(ValueError):
+            decode_request(b'{"box": [0, 1, 0, 1]}')
+        with self.assertRaises(ValueError):
+            decode_request(b'{"functions": ["x +* y"], "box": [0, 1, 0, 1]}')
+
+    def test_request_with_fraction_coefficients(self):
+        function_list = [parse_polynomial("x^2/2 + y^2 - 1/3"), parse_polynomial("x - y/3")]
+        request = encode_request(function_list, unit_box())
+        decoded_functions, initial_box, *_ = decode_request(request[4:])
+        self.assertEqual(decoded_functions, function_list)
+        self.assertEqual(initial_box.x_interval, unit_box().x_interval)
+
+    def test_request_with_polynomial_strings(self):
+        function_list, *_ = decode_request(b'{"functions": ["x^2 + y^2 - 1", [[1, 0, 1], [0, 1, -1]]], '
+                                           b'"box": [-1, 1, -1, 1]}')
+        self.assertEqual(function_list, [BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -1}),
+                                         BivariatePolynomial({(1, 0): 1, (0, 1): -1})])
+
+
+if __name__ == '__main__':
+    unittest.main()
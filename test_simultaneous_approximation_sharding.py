@@ -0,0 +1,136 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+from polynomial_library.polynomial_parser import parse_polynomial
+from simultaneous_approximation import SubdivisionBudget, subdivision_with_c1_cross, subdivision_without_c1_cross
+from simultaneous_approximation_sharding import (_Lease, create_sharded_run, merge_sharded_run, run_worker,
+                                                 sharded_subdivision)
+from simultaneous_approximation_tools import PVBox
+
+
+def unit_box():
+    return PVBox(Interval(-1, 1), Interval(-1, 1))
+
+
+def bounds(boxes):
+    return [(float(box.x_interval.lower_bound), float(box.x_interval.upper_bound),
+             float(box.y_interval.lower_bound), float(box.y_interval.upper_bound),
+             box.C0_predicate, box.C1_predicate, box.C1Prime) for box in boxes]
+
+
+class TestShardedSubdivision(unittest.TestCase):
+
+    def setUp(self):
+        self.circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        self.line = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.1})
+
+    def test_worker_processes_match_single_node(self):
+        with tempfile.TemporaryDirectory() as directory:
+            c0_boxes, c1_boxes = sharded_subdivision([self.circle, self.line], unit_box(), directory,
+                                                     level=2, workers=3)
+        expected_c0, expected_c1 = subdivision_with_c1_cross([self.circle, self.line], unit_box())
+        self.assertEqual(bounds(c0_boxes), bounds(expected_c0))
+        self.assertEqual(bounds(c1_boxes), bounds(expected_c1))
+
+    def test_budget_and_driver_options(self):
+        # A curve-free polynomial whose gradient vanishes at the origin keeps the boxes around it undecided
+        function_list = [BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): 1}), self.line]
+        with tempfile.TemporaryDirectory() as directory:
+            create_sharded_run(directory, function_list, unit_box(), level=2, driver="without_c1_cross",
+                               budget={"max_depth": 4})
+            self.assertGreater(run_worker(directory, wait=False), 0)
+            c0_boxes, c1_boxes, undecided = merge_sharded_run(directory)
+        expected = subdivision_without_c1_cross(function_list, unit_box(), budget=SubdivisionBudget(max_depth=4))
+        self.assertEqual(bounds(c0_boxes), bounds(expected[0]))
+        self.assertEqual(bounds(c1_boxes), bounds(expected[1]))
+        self.assertEqual(bounds(undecided), bounds(expected[2]))
+        self.assertTrue(undecided)
+
+    def test_fraction_coefficients(self):
+        function_list = [parse_polynomial("x^2/2 + y^2 - 1/3"), parse_polynomial("x - y/3")]
+        with tempfile.TemporaryDirectory() as directory:
+            create_sharded_run(directory, function_list, unit_box(), level=1)
+            run_worker(directory, wait=False)
+            c0_boxes, c1_boxes = merge_sharded_run(directory)
+        expected_c0, expected_c1 = subdivision_with_c1_cross(function_list, unit_box())
+        self.assertEqual(bounds(c0_boxes), bounds(expected_c0))
+        self.assertEqual(bounds(c1_boxes), bounds(expected_c1))
+
+    def test_run_wide_budget_is_rejected(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ValueError):
+                create_sharded_run(directory, [self.circle], unit_box(), budget={"max_boxes": 100})
+
+    def test_stale_lease_is_taken_over(self):
+        with tempfile.TemporaryDirectory() as directory:
+            tiles = create_sharded_run(directory, [self.circle], unit_box(), level=1)
+            lease_path = os.path.join(directory, "leases", "0.lease.0")
+            with open(lease_path, "w") as file:
+                file.write("dead worker")
+            # A live lease is left alone, and the run cannot be merged without its tile
+            self.assertEqual(run_worker(directory, lease_seconds=60, wait=False), tiles - 1)
+            with self.assertRaises(RuntimeError):
+                merge_sharded_run(directory)
+            stale = time.time() - 120
+            os.utime(lease_path, (stale, stale))
+            self.assertEqual(run_worker(directory, lease_seconds=60, wait=False), 1)
+            c0_boxes, c1_boxes = merge_sharded_run(directory)
+        expected_c0, expected_c1 = subdivision_with_c1_cross([self.circle], unit_box())
+        self.assertEqual(bounds(c0_boxes), bounds(expected_c0))
+        self.assertEqual(bounds(c1_boxes), bounds(expected_c1))
+
+
+class TestLease(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        stale_lease = os.path.join(self.directory.name, "0.lease.0")
+        with open(stale_lease, "w") as file:
+            file.write("dead worker")
+        stale = time.time() - 120
+        os.utime(stale_lease, (stale, stale))
+
+    def test_workers_racing_for_an_expired_lease(self):
+        leases = [_Lease(self.directory.name, 0, f"worker {k}", 60) for k in range(8)]
+        barrier = threading.Barrier(len(leases))
+        acquired = [None] * len(leases)
+
+        def race(k):
+            barrier.wait()
+            acquired[k] = leases[k].acquire()
+
+        threads = [threading.Thread(target=race, args=(k,)) for k in range(len(leases))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        try:
+            self.assertEqual(acquired.count(True), 1)
+            self.assertEqual(os.listdir(self.directory.name), ["0.lease.1"])
+        finally:
+            for lease in leases:
+                lease.release()
+
+    def test_late_takeover_yields_to_newer_lease(self):
+        first, second = _Lease(self.directory.name, 0, "first", 60), _Lease(self.directory.name, 0, "second", 60)
+        # Both workers saw generation 0 expire; the first took the tile over, the second is too late
+        self.assertTrue(first.acquire())
+        self.assertFalse(second._claim(1))
+        # A worker that saw generation 0 before it was removed must not take the tile from generation 1
+        self.assertFalse(second._claim(0))
+        self.assertTrue(first.held())
+        self.assertFalse(second.acquire())
+        first.release()
+        self.assertTrue(second.acquire())
+        self.assertFalse(first.held())
+        second.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
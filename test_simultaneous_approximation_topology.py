@@ -0,0 +1,67 @@
+import unittest
+
+from interval_arithmetic_library.interval_arithmetic import Interval
+from polynomial_library.bivariate_polynomials import BivariatePolynomial
+from simultaneous_approximation import subdivision_with_c1_cross
+from simultaneous_approximation_tools import PVBox, find_neighbors
+from simultaneous_approximation_topology import DisjointSets, curve_components, leaf_graph
+
+
+def unit_box():
+    return PVBox(Interval(-1, 1), Interval(-1, 1))
+
+
+class TestLeafGraph(unittest.TestCase):
+
+    def test_rows_match_pairwise_scan(self):
+        circle = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (0, 0): -0.5})
+        line = BivariatePolynomial({(1, 0): 1, (0, 1): -1, (0, 0): 0.1})
+        for split in ("quadtree", "binary"):
+            c0_boxes, c1_boxes = subdivision_with_c1_cross([circle, line], unit_box(), split=split)
+            graph = leaf_graph(c0_boxes, c1_boxes)
+            leaves = c0_boxes + c1_boxes
+            self.assertEqual(len(graph.offsets), len(leaves) + 1)
+            for k, box in enumerate(leaves):
+                expected = sorted(leaves.index(neighbor) for neighbor in find_neighbors(box, leaves))
+                self.assertEqual(graph.neighbors_of(k), expected)
+                self.assertEqual(graph.degree(k), len(expected))
+            self.assertEqual(graph.edge_count, sum(graph.degree(k) for k in range(len(graph))) // 2)
+
+    def test_smaller_neighbors_and_corners(self):
+        left = PVBox(Interval(0, 2), Interval(0, 2))
+        upper_right = PVBox(Interval(2, 3), Interval(1, 2))
+        lower_right = PVBox(Interval(2, 3), Interval(0, 1))
+        corner = PVBox(Interval(3, 4), Interval(2, 3))
+        graph = leaf_graph([left, upper_right], [lower_right, corner])
+        self.assertEqual(graph.neighbors, [1, 2, 0, 2, 0, 1])
+        self.assertEqual(graph.offsets, [0, 2, 4, 6, 6])
+
+
+class TestCurveComponents(unittest.TestCase):
+
+    def test_disjoint_sets(self):
+        sets = DisjointSets(4)
+        self.assertTrue(sets.union(0, 1))
+        self.assertTrue(sets.union(2, 1))
+        self.assertFalse(sets.union(0, 2))
+        self.assertEqual(sets.add(), 4)
+        self.assertEqual(len({sets.find(k) for k in range(5)}), 3)
+
+    def test_two_ovals(self):
+        # Two circles of radius 0.3 around (-0.6, 0) and (0.6, 0), as the zero set of one polynomial
+        left = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (1, 0): 1.2, (0, 0): 0.27})
+        right = BivariatePolynomial({(2, 0): 1, (0, 2): 1, (1, 0): -1.2, (0, 0): 0.27})
+        line = BivariatePolynomial({(0, 1): 1, (1, 0): 0.1, (0, 0): -0.7})
+        function_list = [left * right, line]
+        for split in ("quadtree", "binary"):
+            c0_boxes, c1_boxes = subdivision_with_c1_cross(function_list, unit_box(), split=split)
+            components = curve_components(function_list, c0_boxes, c1_boxes)
+            self.assertEqual(len(components[0]), 2)
+            self.assertEqual(len(components[1]), 1)
+            for component in components[0]:
+                x_midpoints = {c1_boxes[k - len(c0_boxes)].x_interval.midpoint() > 0 for k in component}
+                self.assertEqual(len(x_midpoints), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()